@@ -0,0 +1,5 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# Stage-by-stage benchmarks on synthetic corpora; pass --out/--baseline to record/compare
+python3 src/bench.py "$@"
@@ -1,9 +1,6 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
-# Local build with basepath "/"
-python3 src/main.py
-
-# Serve the built site from docs/ on port 8888
-cd docs
-python3 -m http.server 8888
+# Local build with basepath "/", then serve docs/ on port 8888
+# and rebuild changed pages/assets on every edit
+python3 src/main.py --watch --port 8888
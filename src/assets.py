@@ -0,0 +1,167 @@
+# src/assets.py
+import json
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote
+from manifest import file_digest
+from markdown import block_urls
+from output import write_if_changed
+from state import load_state, save_state
+from sync import Copier, is_current, remove_empty_parents
+from urls import URLResolver, is_root_relative
+
+ASSET_STATE_VERSION = 1
+ASSET_MANIFEST_NAME = "asset-manifest.json"  # Public map of asset paths to their fingerprinted names
+HASH_LENGTH = 10
+
+# "index.3f2a9c01de.css" -> "index.css"
+_FINGERPRINT_RE = re.compile(r"\.[0-9a-f]{%d}(?=\.[^./]+$|$)" % HASH_LENGTH)
+
+
+def fingerprint_name(rel: str, digest: str) -> str:
+    # "images/tom.png" -> "images/tom.<first HASH_LENGTH hex digits>.png"
+    head, sep, name = rel.rpartition("/")
+    stem, ext = os.path.splitext(name)
+    return f"{head}{sep}{stem}.{digest[:HASH_LENGTH]}{ext}"
+
+
+def original_name(rel: str) -> str:
+    # Inverse of fingerprint_name: "images/tom.3f2a9c01de.png" -> "images/tom.png" (others unchanged)
+    head, sep, name = rel.rpartition("/")
+    return head + sep + _FINGERPRINT_RE.sub("", name, count=1)
+
+
+class AssetState:
+    """
+    Persistent content hashes of the static files, keyed by their path relative to
+    the static dir, with the size and mtime they were computed for: a file is only read
+    again when its size or mtime changed. Also remembers the fingerprinted files the
+    last run placed, so stale ones can be removed.
+    """
+
+    def __init__(self, path: Optional[str] = None, data: Optional[dict] = None):
+        self.path = path
+        data = data or {}
+        self.hashes: Dict[str, dict] = data.get("hashes", {})
+        self.files: List[str] = data.get("files", [])
+
+    @classmethod
+    def load(cls, path: str) -> "AssetState":
+        return cls(path, load_state(path, ASSET_STATE_VERSION))
+
+    def save(self) -> None:
+        save_state(self.path, ASSET_STATE_VERSION, {"hashes": self.hashes, "files": sorted(self.files)})
+
+    def digest(self, rel: str, path: str) -> Tuple[str, bool]:
+        # (content hash of the file at path, whether it had to be read)
+        st = os.stat(path)
+        entry = self.hashes.get(rel)
+        if entry is not None and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return entry["hash"], False
+        digest = file_digest(path)
+        self.hashes[rel] = {"hash": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        return digest, True
+
+    def mapping(self) -> Dict[str, str]:
+        # Asset path -> fingerprinted path, both relative to the output dir and "/"-separated
+        return {rel: fingerprint_name(rel, e["hash"]) for rel, e in self.hashes.items()}
+
+
+def fingerprint_static(src: str, dst: str, state: AssetState, link: bool = True) -> Dict[str, int]:
+    """
+    Place a name.<hash>.ext copy of every file of src into dst next to the plain one, and
+    write dst/asset-manifest.json mapping each asset path to its fingerprinted name.
+
+    Content hashes come from `state` and are only recomputed for files whose size or
+    mtime changed. Fingerprinted files are hardlinked or copied like sync_static does
+    (an existing file is removed first, never written through, since it may be a
+    hardlink to a source). Fingerprinted files of older contents are removed.
+    Returns counts of hashed, placed, unchanged and removed fingerprinted files.
+    """
+    stats = {"hashed": 0, "placed": 0, "unchanged": 0, "removed": 0}
+    seen = set()
+    todo: List[Tuple[str, str]] = []
+    for root, _dirs, names in os.walk(src):
+        for name in names:
+            s_path = os.path.join(root, name)
+            if not os.path.isfile(s_path):
+                continue
+            rel = os.path.relpath(s_path, src).replace(os.sep, "/")
+            seen.add(rel)
+            digest, hashed = state.digest(rel, s_path)
+            stats["hashed"] += hashed
+            d_path = os.path.join(dst, *fingerprint_name(rel, digest).split("/"))
+            if is_current(s_path, d_path):
+                stats["unchanged"] += 1
+            else:
+                todo.append((s_path, d_path))
+    for rel in [r for r in state.hashes if r not in seen]:
+        del state.hashes[rel]
+
+    copier = Copier(link)
+    for pair in todo:
+        os.makedirs(os.path.dirname(pair[1]), exist_ok=True)
+        copier(pair)
+        stats["placed"] += 1
+        print(f"[hash] {pair[1]}")
+
+    mapping = state.mapping()
+    current = set(mapping.values())
+    for rel in state.files:
+        d_path = os.path.join(dst, *rel.split("/"))
+        if rel not in current and os.path.isfile(d_path):
+            os.remove(d_path)
+            remove_empty_parents(d_path, dst)
+            print(f"[rm  ] {d_path}")
+            stats["removed"] += 1
+    state.files = sorted(current)
+
+    text = json.dumps(mapping, indent=1, sort_keys=True) + "\n"
+    write_if_changed(os.path.join(dst, ASSET_MANIFEST_NAME), text)
+    state.save()
+    return stats
+
+
+def clear_fingerprints(dst: str, state: AssetState) -> int:
+    # Remove the fingerprinted files and asset manifest a previous run placed (fingerprinting turned off)
+    removed = 0
+    for rel in state.files + [ASSET_MANIFEST_NAME]:
+        d_path = os.path.join(dst, *rel.split("/"))
+        if os.path.isfile(d_path):
+            os.remove(d_path)
+            remove_empty_parents(d_path, dst)
+            print(f"[rm  ] {d_path}")
+            removed += 1
+    state.files = []
+    state.save()
+    return removed
+
+
+class FingerprintResolver(URLResolver):
+    """
+    Point root-relative URLs of static assets at their fingerprinted copies:
+    "/images/tom.png" -> "/images/tom.3f2a9c01de.png". Query strings and fragments are
+    kept; URLs that are not assets are left alone. Put it first in a ChainResolver, so
+    it sees URLs as written (before a basepath is added).
+
+    The key does not depend on the asset hashes, so editing one asset does not invalidate
+    every cached fragment and page: context() adds the fingerprints of the assets a
+    markdown block links to, and templates are compared by their resolved text.
+    """
+
+    key = "fingerprint"
+
+    def __init__(self, mapping: Dict[str, str]):
+        self.mapping = mapping
+
+    def __call__(self, url: str) -> str:
+        if not is_root_relative(url):
+            return url
+        end = min((i for i in (url.find("?"), url.find("#")) if i != -1), default=len(url))
+        target = self.mapping.get(unquote(url[1:end]))
+        return url if target is None else "/" + target + url[end:]
+
+    def context(self, block: str) -> str:
+        urls = [u for u in block_urls(block) if self(u) != u]
+        return self.key if not urls else self.key + "=" + ",".join(self(u) for u in urls)
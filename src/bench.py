@@ -0,0 +1,163 @@
+# src/bench.py
+# Benchmark the build pipeline stage by stage on synthetic corpora.
+#
+#   python3 src/bench.py --out bench.json                      # record a report
+#   python3 src/bench.py --baseline bench.json --tolerance 0.2 # compare, exit 1 on regression
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from blocks import BlockType, block_to_block_type, markdown_to_blocks
+from corpus import SHAPES, documents, generate_corpus
+from generate import generate_pages_recursive
+from inline import text_to_textnodes
+from markdown import markdown_to_html_node
+from sync import sync_static
+
+REPORT_VERSION = 1
+
+
+def best_of(fn: Callable[[], None], repeat: int, setup: Callable[[], None] = None) -> float:
+    # Minimum wall time over `repeat` runs (setup runs untimed before each one)
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_documents(docs: List[str], repeat: int) -> Dict[str, float]:
+    # Per-document stages, each over the whole batch of documents
+    paragraphs = [
+        " ".join(block.split("\n"))
+        for doc in docs
+        for block in markdown_to_blocks(doc)
+        if block_to_block_type(block) == BlockType.PARAGRAPH
+    ]
+    trees = [markdown_to_html_node(doc) for doc in docs]
+    return {
+        "markdown_to_blocks": best_of(lambda: [markdown_to_blocks(d) for d in docs], repeat),
+        "text_to_textnodes": best_of(lambda: [text_to_textnodes(p) for p in paragraphs], repeat),
+        "markdown_to_html_node": best_of(lambda: [markdown_to_html_node(d) for d in docs], repeat),
+        "to_html": best_of(lambda: [t.to_html() for t in trees], repeat),
+    }
+
+
+def bench_site(root: str, paths: Dict[str, str], repeat: int) -> Dict[str, float]:
+    # Whole-tree stages on a generated site (output silenced)
+    out = os.path.join(root, "docs")
+    state = os.path.join(root, ".build", "static.json")
+
+    def fresh() -> None:
+        shutil.rmtree(out, ignore_errors=True)
+        shutil.rmtree(os.path.dirname(state), ignore_errors=True)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = {
+            "generate_pages_recursive": best_of(
+                lambda: generate_pages_recursive(paths["content"], paths["template"], out, "/site/"),
+                repeat,
+                fresh,
+            ),
+            "copy_static": best_of(lambda: sync_static(paths["static"], out, state, link=False), repeat, fresh),
+            "copy_static_unchanged": best_of(lambda: sync_static(paths["static"], out, state, link=False), repeat),
+        }
+    return results
+
+
+def run(shapes: List[str], scale: float, repeat: int) -> dict:
+    report = {
+        "version": REPORT_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "scale": scale,
+        "shapes": {},
+    }
+    for shape in shapes:
+        docs = documents(shape, scale)
+        with tempfile.TemporaryDirectory() as root:
+            paths = generate_corpus(root, shape, scale)
+            pages = sum(1 for _r, _d, files in os.walk(paths["content"]) for f in files if f.endswith(".md"))
+            stages = bench_documents(docs, repeat)
+            stages.update(bench_site(root, paths, repeat))
+        report["shapes"][shape] = {
+            "pages": pages,
+            "documents": len(docs),
+            "markdown_bytes": sum(len(d) for d in docs),
+            "stages": {name: {"seconds": secs} for name, secs in stages.items()},
+        }
+        print(f"[bench] {shape}: {pages} pages")
+        for name, secs in stages.items():
+            print(f"[bench]   {name:<26}{secs * 1e3:10.2f} ms")
+    return report
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> List[str]:
+    """
+    Print current/baseline ratios for every stage present in both reports.
+    Returns the "shape/stage" keys that got slower by more than `tolerance` (0.2 = 20%).
+    """
+    regressions = []
+    print(f"[cmp ] {'shape/stage':<36}{'baseline ms':>12}{'current ms':>12}{'ratio':>8}")
+    for shape, data in report["shapes"].items():
+        base_stages = baseline.get("shapes", {}).get(shape, {}).get("stages", {})
+        for name, cur in data["stages"].items():
+            base = base_stages.get(name)
+            if base is None:
+                continue
+            ratio = cur["seconds"] / base["seconds"] if base["seconds"] else float("inf")
+            flag = ""
+            if ratio > 1 + tolerance:
+                regressions.append(f"{shape}/{name}")
+                flag = "  REGRESSION"
+            print(
+                f"[cmp ] {shape + '/' + name:<36}{base['seconds'] * 1e3:>12.2f}"
+                f"{cur['seconds'] * 1e3:>12.2f}{ratio:>8.2f}{flag}"
+            )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the static site pipeline.")
+    parser.add_argument("--shapes", default=",".join(SHAPES), help="comma-separated corpus shapes (%(default)s)")
+    parser.add_argument("--scale", type=float, default=1.0, help="corpus size multiplier (default 1.0)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage; the fastest is kept (default 3)")
+    parser.add_argument("--out", metavar="FILE", help="write the JSON report to FILE")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against a previous JSON report")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown vs baseline (default 0.2)")
+    args = parser.parse_args(argv)
+
+    shapes = [s for s in args.shapes.split(",") if s]
+    unknown = [s for s in shapes if s not in SHAPES]
+    if unknown:
+        parser.error(f"unknown shape(s): {', '.join(unknown)} (choose from {', '.join(SHAPES)})")
+
+    report = run(shapes, args.scale, args.repeat)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1, sort_keys=True)
+        print(f"[bench] Report written to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"[bench] {len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+# src/bench_html.py
+# Compare the single-list, stack-based serializer with the old recursive to_html.
+# Usage: python3 src/bench_html.py [shape ...]
+import sys
+import timeit
+from corpus import SHAPES, documents
+from htmlnode import HTMLNode, LeafNode, ParentNode
+from markdown import markdown_to_html_node
+
+
+def recursive_to_html(node: HTMLNode) -> str:
+    # The original implementation: f-string tags per call and one joined string per level
+    if isinstance(node, LeafNode):
+        if node.tag is None:
+            return node.value
+        return f"<{node.tag}{node.props_to_html()}>{node.value}</{node.tag}>"
+    inner = "".join(recursive_to_html(child) for child in node.children)
+    return f"<{node.tag}{node.props_to_html()}>{inner}</{node.tag}>"
+
+
+def nested(depth: int) -> ParentNode:
+    node = LeafNode("b", "deep")
+    for _ in range(depth):
+        node = ParentNode("span", [node])
+    return node
+
+
+def best(fn, number: int = 5, repeat: int = 5) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def main() -> None:
+    shapes = sys.argv[1:] or ["small", "links", "code"]
+    print(f"{'shape':<8}{'nodes':>10}{'recursive ms':>15}{'to_html ms':>13}{'speedup':>9}")
+    for shape in shapes:
+        if shape not in SHAPES:
+            sys.exit(f"unknown shape {shape!r} (choose from {', '.join(SHAPES)})")
+        trees = [markdown_to_html_node(doc) for doc in documents(shape)]
+        assert all(recursive_to_html(t) == t.to_html() for t in trees)
+        count = sum(_count(t) for t in trees)
+        old = best(lambda: [recursive_to_html(t) for t in trees])
+        new = best(lambda: [t.to_html() for t in trees])
+        print(f"{shape:<8}{count:>10}{old * 1e3:>15.2f}{new * 1e3:>13.2f}{old / new:>8.2f}x")
+
+    depth = sys.getrecursionlimit() * 2
+    tree = nested(depth)
+    try:
+        recursive_to_html(tree)
+        old_result = "ok"
+    except RecursionError:
+        old_result = "RecursionError"
+    print(f"nesting depth {depth}: recursive -> {old_result}, to_html -> {len(tree.to_html())} chars")
+
+
+def _count(node: HTMLNode) -> int:
+    stack, total = [node], 0
+    while stack:
+        n = stack.pop()
+        total += 1
+        if n.children:
+            stack.extend(n.children)
+    return total
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# src/bench_inline.py
+# Compare the single-pass text_to_textnodes with the old five-stage split pipeline.
+# Usage: python3 src/bench_inline.py [links_per_paragraph ...]
+import sys
+import timeit
+from typing import List
+from textnode import TextNode, TextType
+from inline import split_nodes_delimiter, split_nodes_image, split_nodes_link, text_to_textnodes
+
+
+def split_pipeline(text: str) -> List[TextNode]:
+    # The original implementation: five passes, one new node list per pass
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    return nodes
+
+
+def link_dense_text(links: int) -> str:
+    # A paragraph made mostly of links, with some images and inline markup between them
+    parts = []
+    for i in range(links):
+        parts.append(f"see [page {i}](/blog/post-{i}) and **bold {i}**")
+        if i % 5 == 0:
+            parts.append(f"![figure {i}](/images/fig-{i}.png) with `code {i}` and _it_")
+    return " ".join(parts)
+
+
+def bench(links: int) -> None:
+    text = link_dense_text(links)
+    assert split_pipeline(text) == text_to_textnodes(text)
+    number = max(1, 2000 // links)
+    old = min(timeit.repeat(lambda: split_pipeline(text), number=number, repeat=5)) / number
+    new = min(timeit.repeat(lambda: text_to_textnodes(text), number=number, repeat=5)) / number
+    print(
+        f"links={links:>6} chars={len(text):>8}  "
+        f"pipeline={old * 1e3:9.3f} ms  single-pass={new * 1e3:9.3f} ms  speedup={old / new:5.1f}x"
+    )
+
+
+def main() -> None:
+    sizes = [int(a) for a in sys.argv[1:]] or [10, 100, 1000, 5000]
+    for links in sizes:
+        bench(links)
+
+
+if __name__ == "__main__":
+    main()
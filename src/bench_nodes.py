@@ -0,0 +1,55 @@
+# src/bench_nodes.py
+# Report memory per node for the slotted node classes versus plain __dict__ classes.
+# Usage: python3 src/bench_nodes.py [count]
+import sys
+import tracemalloc
+from htmlnode import LeafNode, ParentNode
+from textnode import TextNode, TextType
+
+
+class DictTextNode:
+    # TextNode as it was before __slots__
+    def __init__(self, text, text_type, url=None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+
+class DictLeafNode:
+    # LeafNode/ParentNode as they were before __slots__ (same four attributes)
+    def __init__(self, tag, value, children=None, props=None):
+        self.tag = tag
+        self.value = value
+        self.children = children
+        self.props = props
+
+
+def bytes_per_node(factory, count: int) -> float:
+    # Text values are shared so only the node objects themselves are measured
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nodes = [factory() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    list_overhead = sys.getsizeof(nodes)
+    del nodes
+    return (after - before - list_overhead) / count
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    children = [LeafNode(None, "x")]
+    cases = [
+        ("TextNode", lambda: DictTextNode("word", TextType.TEXT), lambda: TextNode("word", TextType.TEXT)),
+        ("LeafNode", lambda: DictLeafNode("b", "word"), lambda: LeafNode("b", "word")),
+        ("ParentNode", lambda: DictLeafNode("p", None, children), lambda: ParentNode("p", children)),
+    ]
+    print(f"{count} nodes each")
+    for name, before, after in cases:
+        old = bytes_per_node(before, count)
+        new = bytes_per_node(after, count)
+        print(f"{name:<10}  __dict__={old:6.1f} B/node  __slots__={new:6.1f} B/node  saved={1 - new / old:5.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,29 @@
 # src/blocks.py
 import re
 from enum import Enum
-from typing import List
+from typing import Any, Iterable, Iterator, List, Tuple
 
 # ---------- Lesson 1: block splitter ----------
 
+def iter_blocks(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Yield markdown blocks from an iterable of lines (a list, or an open text file)
+    as soon as each one is complete, holding at most one block in memory.
+    - A blank or whitespace-only line ends the current block.
+    - Each line is stripped; line endings (including \r\n) go with the whitespace.
+    """
+    current: List[str] = []
+    for line in lines:
+        ln = line.strip()
+        if ln:
+            current.append(ln)
+        elif current:
+            yield "\n".join(current)
+            current = []
+    if current:
+        yield "\n".join(current)
+
+
 def markdown_to_blocks(markdown: str) -> List[str]:
     # Split a Markdown document into logical blocks.
     # - Blocks are separated by one or more blank lines.
@@ -12,21 +31,7 @@ def markdown_to_blocks(markdown: str) -> List[str]:
     # - Remove empty results.
     if not markdown:
         return []
-
-    text = markdown.replace("\r\n", "\n").strip()
-    if not text:
-        return []
-
-    parts = re.split(r"\n\s*\n+", text)
-
-    blocks: List[str] = []
-    for part in parts:
-        lines = [ln.strip() for ln in part.split("\n")]
-        cleaned = "\n".join(ln for ln in lines if ln != "")
-        if cleaned:
-            blocks.append(cleaned)
-
-    return blocks
+    return list(iter_blocks(markdown.split("\n")))
 
 
 # ---------- Lesson 2: block types ----------
@@ -40,46 +45,82 @@ class BlockType(Enum):
     ORDERED_LIST = "ordered_list"
 
 
-def block_to_block_type(block: str) -> BlockType:
-    # Classify a stripped markdown block as one of the supported types.
-    # Rules:
-    #   - Heading: single line; 1–6 '#' then a space and text.
-    #   - Code: first line is exactly ``` and last line is exactly ```.
-    #   - Quote: every line starts with '>'.
-    #   - Unordered list: every line starts with '- ' (dash + space).
-    #   - Ordered list: each line 'N. ' where N starts at 1 and increments by 1.
-    #   - Otherwise: paragraph.
+# Precompiled line patterns (same rules as the original per-line re.match calls)
+_HEADING_RE = re.compile(r"(#{1,6})\s+(.+)")
+_QUOTE_PREFIX_RE = re.compile(r">\s?")
+_ORDERED_ITEM_RE = re.compile(r"(\d+)\.\s+(.+)")
+
+# What classify_block hands to the node builders for each type:
+#   PARAGRAPH       -> list of lines
+#   HEADING         -> (level, text)
+#   CODE            -> list of lines including both fences
+#   QUOTE           -> list of lines with the leading '>' (and one optional space) removed
+#   UNORDERED_LIST  -> list of item texts without "- "
+#   ORDERED_LIST    -> list of item texts without "N. "
+ParsedBlock = Tuple[BlockType, Any]
+
+
+def classify_block(block: str) -> ParsedBlock:
+    """
+    Classify a stripped markdown block and return its parsed pieces in one pass.
+    The first line decides which (mutually exclusive) candidate type to check, so each
+    line is matched against at most one precompiled pattern. See block_to_block_type for rules.
+    """
     if not block:
-        return BlockType.PARAGRAPH
+        return BlockType.PARAGRAPH, [""]
 
     lines = block.split("\n")
 
     # Code block: opening and closing fences must be exactly ```
     if len(lines) >= 2 and lines[0] == "```" and lines[-1] == "```":
-        return BlockType.CODE
+        return BlockType.CODE, lines
+
+    first = lines[0]
 
     # Heading: exactly one line, 1-6 '#' then a space and text
-    if len(lines) == 1 and re.match(r"^(#{1,6})\s+.+$", lines[0]) is not None:
-        return BlockType.HEADING
+    if len(lines) == 1 and first.startswith("#"):
+        m = _HEADING_RE.fullmatch(first)
+        if m is not None:
+            return BlockType.HEADING, (len(m.group(1)), m.group(2).strip())
 
     # Quote: every line begins with '>' (space optional)
-    if all(re.match(r"^>.*$", ln) is not None for ln in lines):
-        return BlockType.QUOTE
+    if first.startswith(">"):
+        quoted: List[str] = []
+        for ln in lines:
+            if not ln.startswith(">"):
+                return BlockType.PARAGRAPH, lines
+            quoted.append(ln[_QUOTE_PREFIX_RE.match(ln).end():])
+        return BlockType.QUOTE, quoted
 
     # Unordered list: every line starts with "- " (dash + space) at column 0
-    if all(re.match(r"^- .+$", ln) is not None for ln in lines):
-        return BlockType.UNORDERED_LIST
+    if first.startswith("- "):
+        items: List[str] = []
+        for ln in lines:
+            if len(ln) < 3 or not ln.startswith("- "):
+                return BlockType.PARAGRAPH, lines
+            items.append(ln[2:])
+        return BlockType.UNORDERED_LIST, items
 
     # Ordered list: each line 'N. ' with N starting at 1 and incrementing by 1
-    nums: List[int] = []
-    for ln in lines:
-        m = re.match(r"^(\d+)\.\s+.+$", ln)
-        if not m:
-            nums = []
-            break
-        nums.append(int(m.group(1)))
-
-    if nums and nums[0] == 1 and all(nums[i] == nums[i - 1] + 1 for i in range(1, len(nums))):
-        return BlockType.ORDERED_LIST
-
-    return BlockType.PARAGRAPH
+    if first[:1].isdigit():
+        items = []
+        for expected, ln in enumerate(lines, 1):
+            m = _ORDERED_ITEM_RE.fullmatch(ln)
+            if m is None or int(m.group(1)) != expected:
+                return BlockType.PARAGRAPH, lines
+            items.append(m.group(2))
+        return BlockType.ORDERED_LIST, items
+
+    return BlockType.PARAGRAPH, lines
+
+
+def block_to_block_type(block: str) -> BlockType:
+    # Classify a stripped markdown block as one of the supported types.
+    # Rules:
+    #   - Heading: single line; 1–6 '#' then a space and text.
+    #   - Code: first line is exactly ``` and last line is exactly ```.
+    #   - Quote: every line starts with '>'.
+    #   - Unordered list: every line starts with '- ' (dash + space).
+    #   - Ordered list: each line 'N. ' where N starts at 1 and increments by 1.
+    #   - Otherwise: paragraph.
+    return classify_block(block)[0]
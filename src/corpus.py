@@ -0,0 +1,131 @@
+# src/corpus.py
+# Synthetic content trees for benchmarks: deterministic for a given shape, size and seed.
+import os
+import random
+from typing import Dict, List
+
+WORDS = (
+    "elf hobbit ring shire river mountain road forest wizard king tower sword song "
+    "star night valley bridge gate stone lamp ship harbour dragon gold map journey"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _paragraph(rng: random.Random, links: int = 1) -> str:
+    # A few wrapped lines with inline markup and `links` links/images
+    parts = [_sentence(rng, 8), f"**{_sentence(rng, 2)}**", _sentence(rng, 6), f"_{_sentence(rng, 2)}_"]
+    for i in range(links):
+        if i % 4 == 3:
+            parts.append(f"![{_sentence(rng, 2)}](/images/{rng.choice(WORDS)}.png)")
+        else:
+            parts.append(f"[{_sentence(rng, 2)}](/blog/{rng.choice(WORDS)}-{rng.randrange(100)})")
+        parts.append(_sentence(rng, 3))
+    parts.append(f"`{rng.choice(WORDS)}()`")
+    text = " ".join(parts)
+    # Wrap roughly every 12 words like hand-written markdown
+    words = text.split(" ")
+    return "\n".join(" ".join(words[i:i + 12]) for i in range(0, len(words), 12))
+
+
+def _code(rng: random.Random, lines: int) -> str:
+    body = [f"    {rng.choice(WORDS)}_{i} = {rng.choice(WORDS)}({i}) _not_ **parsed**" for i in range(lines)]
+    return "\n".join(["```"] + body + ["```"])
+
+
+def _list(rng: random.Random, items: int, ordered: bool) -> str:
+    if ordered:
+        return "\n".join(f"{i}. {_sentence(rng, 5)} **{rng.choice(WORDS)}**" for i in range(1, items + 1))
+    return "\n".join(f"- {_sentence(rng, 5)} [{rng.choice(WORDS)}](/{rng.choice(WORDS)})" for _ in range(items))
+
+
+def _quote(rng: random.Random, lines: int) -> str:
+    return "\n".join(f"> {_sentence(rng, 7)}" for _ in range(lines))
+
+
+def make_document(rng: random.Random, blocks: int, links: int = 1, code_ratio: float = 0.1) -> str:
+    """
+    Build one markdown document of `blocks` blocks: a title, then a mix of headings,
+    paragraphs (each with `links` links), lists, quotes and code blocks (~code_ratio).
+    """
+    out = [f"# {_sentence(rng, 4).title()}"]
+    for i in range(blocks):
+        r = rng.random()
+        if r < code_ratio:
+            out.append(_code(rng, rng.randint(3, 12)))
+        elif i % 10 == 0:
+            out.append(f"{'#' * rng.randint(2, 4)} {_sentence(rng, 4)}")
+        elif r < code_ratio + 0.1:
+            out.append(_list(rng, rng.randint(3, 8), ordered=rng.random() < 0.5))
+        elif r < code_ratio + 0.15:
+            out.append(_quote(rng, rng.randint(1, 4)))
+        else:
+            out.append(_paragraph(rng, links))
+    return "\n\n".join(out) + "\n"
+
+
+# shape -> pages, blocks per page, links per paragraph, share of code blocks, directory depth
+SHAPES: Dict[str, Dict[str, float]] = {
+    "small": {"pages": 400, "blocks": 12, "links": 1, "code": 0.1, "depth": 2},
+    "huge": {"pages": 3, "blocks": 8000, "links": 1, "code": 0.1, "depth": 1},
+    "links": {"pages": 50, "blocks": 60, "links": 25, "code": 0.0, "depth": 2},
+    "code": {"pages": 50, "blocks": 60, "links": 1, "code": 0.7, "depth": 2},
+    "deep": {"pages": 200, "blocks": 10, "links": 2, "code": 0.1, "depth": 12},
+}
+
+
+def page_paths(count: int, depth: int) -> List[str]:
+    # Relative .md paths spread over a tree up to `depth` directories deep
+    paths = ["index.md"]
+    for i in range(1, count):
+        levels = 1 + i % depth
+        dirs = [f"s{(i >> (2 * lvl)) % 4}" for lvl in range(levels - 1)]
+        paths.append(os.path.join(*dirs, f"page-{i}", "index.md"))
+    return paths
+
+
+def generate_corpus(root: str, shape: str = "small", scale: float = 1.0, seed: int = 0) -> Dict[str, str]:
+    """
+    Write a synthetic site under root: content/, static/ and template.html.
+    `scale` multiplies the shape's page count (huge pages scale their block count instead).
+    Returns the paths of the three inputs.
+    """
+    spec = SHAPES[shape]
+    rng = random.Random(seed)
+    pages = max(1, int(spec["pages"] * (1 if shape == "huge" else scale)))
+    blocks = max(1, int(spec["blocks"] * (scale if shape == "huge" else 1)))
+
+    content = os.path.join(root, "content")
+    for rel in page_paths(pages, int(spec["depth"])):
+        path = os.path.join(content, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(make_document(rng, blocks, int(spec["links"]), spec["code"]))
+
+    static = os.path.join(root, "static")
+    os.makedirs(os.path.join(static, "images"), exist_ok=True)
+    with open(os.path.join(static, "index.css"), "w", encoding="utf-8") as f:
+        f.write("body { font-family: serif; }\n" * 50)
+    for i, word in enumerate(WORDS):
+        with open(os.path.join(static, "images", f"{word}.png"), "wb") as f:
+            f.write(rng.randbytes(4096 * (1 + i % 8)))
+
+    template = os.path.join(root, "template.html")
+    with open(template, "w", encoding="utf-8") as f:
+        f.write(
+            "<!doctype html>\n<html>\n  <head>\n    <title>{{ Title }}</title>\n"
+            '    <link href="/index.css" rel="stylesheet" />\n  </head>\n'
+            "  <body>\n    <article>{{ Content }}</article>\n  </body>\n</html>\n"
+        )
+    return {"content": content, "static": static, "template": template}
+
+
+def documents(shape: str, scale: float = 1.0, seed: int = 0, limit: int = 20) -> List[str]:
+    # In-memory documents of a shape, for timing the per-document stages
+    spec = SHAPES[shape]
+    rng = random.Random(seed)
+    count = min(limit, max(1, int(spec["pages"] * (1 if shape == "huge" else scale))))
+    blocks = max(1, int(spec["blocks"] * (scale if shape == "huge" else 1)))
+    return [make_document(rng, blocks, int(spec["links"]), spec["code"]) for _ in range(count)]
@@ -0,0 +1,141 @@
+# src/fragcache.py
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Bump when the stored record format changes
+CACHE_FORMAT = 2
+
+# Modules whose code determines the HTML rendered for a block
+_PARSER_MODULES = ("blocks", "inline", "extract", "markdown", "textnode", "htmlnode", "urls", "assets")
+
+
+def parser_version() -> str:
+    """
+    Stamp identifying the current parser: a hash of the parser modules' source files.
+    Editing any of them invalidates every cached fragment.
+    """
+    h = hashlib.sha256(f"format={CACHE_FORMAT}".encode())
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in _PARSER_MODULES:
+        with open(os.path.join(here, f"{name}.py"), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+class FragmentCache:
+    """
+    On-disk, content-addressed cache of the rendered HTML of single markdown blocks.
+
+    Entries are keyed by the sha256 of the block text plus a context string (the URL
+    resolver's key, since resolved links are part of the HTML) and live in one SQLite file
+    (safe to share between worker processes). Reads are recorded and new entries
+    buffered in memory until flush(), so each page costs one write transaction.
+    evict() trims the cache to max_bytes, dropping least recently used entries first.
+    The whole cache is cleared when parser_version() changes.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, version: Optional[str] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.version = version or parser_version()
+        self.hits = 0
+        self.misses = 0
+        self._db: Optional[sqlite3.Connection] = None
+        self._pending: Dict[bytes, str] = {}
+        self._used: List[bytes] = []
+
+    def __getstate__(self):
+        # Worker processes get a copy without the connection and open their own
+        state = self.__dict__.copy()
+        state["_db"] = None
+        return state
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is not None:
+            return self._db
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=60)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        with db:
+            db.execute("CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v TEXT)")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS fragments "
+                "(key BLOB PRIMARY KEY, html TEXT NOT NULL, size INTEGER NOT NULL, used INTEGER NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS fragments_used ON fragments (used)")
+            row = db.execute("SELECT v FROM meta WHERE k = 'version'").fetchone()
+            if row is None or row[0] != self.version:
+                # Parser changed: every stored fragment may render differently now
+                db.execute("DELETE FROM fragments")
+                db.execute("INSERT OR REPLACE INTO meta (k, v) VALUES ('version', ?)", (self.version,))
+        self._db = db
+        return db
+
+    @staticmethod
+    def key(block: str, context: str = "") -> bytes:
+        h = hashlib.sha256(context.encode("utf-8"))
+        h.update(b"\0")
+        h.update(block.encode("utf-8"))
+        return h.digest()
+
+    def get(self, block: str, context: str = "") -> Optional[str]:
+        key = self.key(block, context)
+        html = self._pending.get(key)
+        if html is None:
+            row = self._connect().execute("SELECT html FROM fragments WHERE key = ?", (key,)).fetchone()
+            html = row[0] if row is not None else None
+        if html is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._used.append(key)
+        return html
+
+    def put(self, block: str, html: str, context: str = "") -> None:
+        self._pending[self.key(block, context)] = html
+
+    def flush(self) -> None:
+        # Write buffered entries and bump the LRU stamp of everything read since the last flush
+        if not self._pending and not self._used:
+            return
+        now = time.time_ns()
+        db = self._connect()
+        with db:
+            db.executemany(
+                "INSERT OR REPLACE INTO fragments (key, html, size, used) VALUES (?, ?, ?, ?)",
+                [(k, html, len(html), now) for k, html in self._pending.items()],
+            )
+            db.executemany("UPDATE fragments SET used = ? WHERE key = ?", [(now, k) for k in self._used])
+        self._pending.clear()
+        self._used.clear()
+
+    def evict(self) -> Tuple[int, int]:
+        """
+        Drop least recently used fragments until the stored HTML fits in max_bytes
+        (sizes are counted in characters, close to bytes for mostly-ASCII HTML).
+        Returns (entries removed, bytes remaining).
+        """
+        self.flush()
+        db = self._connect()
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM fragments").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0, total
+        doomed = []
+        for key, size in db.execute("SELECT key, size FROM fragments ORDER BY used"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        with db:
+            db.executemany("DELETE FROM fragments WHERE key = ?", doomed)
+        return len(doomed), total
+
+    def close(self) -> None:
+        self.flush()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,140 @@
+# src/frontmatter.py
+# YAML-style front matter at the top of a markdown file:
+#
+#   ---
+#   title: Why Tom Bombadil Was a Mistake
+#   date: 2024-01-28
+#   tags: [tolkien, opinion]
+#   draft: false
+#   template: post.html
+#   ---
+#
+# Only the flat subset pages need is understood: "key: value" lines, [a, b] or
+# "- item" lists, quoted strings, true/false/yes/no and # comments. No yaml dependency.
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple, Union
+
+FENCE = "---"
+
+Value = Union[str, bool, List[str]]
+
+
+def _scalar(text: str) -> Value:
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "\"'":
+        return text[1:-1]
+    lowered = text.lower()
+    if lowered in ("true", "yes"):
+        return True
+    if lowered in ("false", "no"):
+        return False
+    return text
+
+
+def _item(text: str) -> str:
+    value = _scalar(text)
+    return value if isinstance(value, str) else str(value).lower()
+
+
+def parse_front_matter(lines: Iterable[str]) -> Dict[str, Value]:
+    """
+    Parse the lines between the two --- fences into a dict.
+    Keys are lowercased; a key with no value followed by "- item" lines is a list.
+    Raise ValueError on a line that is neither "key: value", a list item nor a comment.
+    """
+    meta: Dict[str, Value] = {}
+    current: Optional[str] = None
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if stripped.startswith("- ") and current is not None:
+            items = meta[current] if isinstance(meta[current], list) else []
+            items.append(_item(stripped[2:]))
+            meta[current] = items
+            continue
+        key, sep, value = line.partition(":")
+        if not sep or not key.strip():
+            raise ValueError(f"Bad front matter line: {line!r}")
+        current = key.strip().lower()
+        value = value.strip()
+        if value.startswith("[") and value.endswith("]"):
+            meta[current] = [_item(v) for v in value[1:-1].split(",") if v.strip()]
+        else:
+            meta[current] = _scalar(value)
+    return meta
+
+
+def read_front_matter(f: TextIO) -> Dict[str, Value]:
+    """
+    Read the front matter at the current position of an open text file, leaving the
+    file positioned at the first line of the markdown body. Without a leading ---
+    line the position is unchanged and {} is returned.
+    Uses readline() so tell()/seek() keep working on the file afterwards.
+    """
+    start = f.tell()
+    if f.readline().rstrip("\r\n") != FENCE:
+        f.seek(start)
+        return {}
+    lines = []
+    while True:
+        line = f.readline()
+        if not line:
+            raise ValueError("Front matter is not closed with ---")
+        if line.rstrip("\r\n") == FENCE:
+            return parse_front_matter(lines)
+        lines.append(line)
+
+
+def split_front_matter(markdown: str) -> Tuple[Dict[str, Value], str]:
+    # In-memory counterpart of read_front_matter: (metadata, markdown body)
+    if not markdown.startswith(FENCE):
+        return {}, markdown
+    lines = markdown.split("\n")
+    if lines[0].rstrip("\r") != FENCE:
+        return {}, markdown
+    for i in range(1, len(lines)):
+        if lines[i].rstrip("\r") == FENCE:
+            return parse_front_matter(lines[1:i]), "\n".join(lines[i + 1:])
+    raise ValueError("Front matter is not closed with ---")
+
+
+def first_heading(lines: Iterable[str]) -> Optional[str]:
+    # Text of the first level-1 heading ("# ..."), reading no further than that line
+    for line in lines:
+        if line.startswith("# "):
+            return line[2:].strip()
+    return None
+
+
+def read_header(path: str) -> Dict[str, object]:
+    """
+    Metadata of a markdown file from its header only: the front matter, plus the first
+    h1 as the title when the front matter has none. The body past that heading is not read.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        meta = page_meta(read_front_matter(f))
+        if meta["title"] is None:
+            meta["title"] = first_heading(f)
+    return meta
+
+
+def page_meta(meta: Dict[str, Value]) -> Dict[str, object]:
+    """
+    Normalize raw front matter into the fields the generator uses:
+    title (str or None), date (str or None), tags (list), draft (bool), template (str or None).
+    A comma-separated tags string is split into a list.
+    """
+    tags = meta.get("tags") or []
+    if isinstance(tags, str):
+        tags = [t.strip() for t in tags.split(",") if t.strip()]
+    title = meta.get("title")
+    date = meta.get("date")
+    template = meta.get("template")
+    return {
+        "title": str(title) if title not in (None, "") else None,
+        "date": str(date) if date not in (None, "") else None,
+        "tags": [str(t) for t in tags] if isinstance(tags, list) else [],
+        "draft": meta.get("draft") is True,
+        "template": str(template) if template not in (None, "") else None,
+    }
@@ -1,84 +1,308 @@
 # src/generate.py
+import io
 import os
-from markdown import markdown_to_html_node
+from collections import deque
+from multiprocessing.util import Finalize
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Callable, Deque, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+from markdown import iter_document_html
+from instrument import page as page_span, span, timed_stream
+from linkcheck import LinkCollector, LinkIndex, find_urls, target_path
+from assets import original_name
+from fragcache import FragmentCache
+from frontmatter import first_heading, page_meta, read_front_matter, split_front_matter
+from manifest import BuildManifest
+from output import OutputFile, write_if_changed
+from pageindex import PageIndex
+from siteindex import SiteIndex, TextCollector, page_url
+from template import CompiledTemplate, TemplateLoader, load_template
+from urls import URLResolver
 
 
-def extract_title(markdown: str) -> str:
+def extract_title(markdown: Union[str, Iterable[str]]) -> str:
     """
     Return the first level-1 heading text from the markdown (line starting with "# ").
-    Raise an Exception if none exists.
+    markdown may also be an iterable of lines (e.g. an open file); it is read only up
+    to the heading. Raise an Exception if none exists.
     """
-    for line in markdown.splitlines():
-        if line.startswith("# "):
-            return line[2:].strip()
-    raise Exception("No h1 header found in markdown")
+    title = first_heading(markdown.splitlines() if isinstance(markdown, str) else markdown)
+    if title is None:
+        raise Exception("No h1 header found in markdown")
+    return title
 
 
-def _apply_basepath(html: str, basepath: str) -> str:
-    """
-    Prefix root-relative href/src (starting with /) with the provided basepath.
-    Examples:
-      href="/x" -> href="{basepath}x"
-      src="/y"  -> src="{basepath}y"
-    External links like https://... are unaffected.
-    """
-    if not basepath.endswith("/"):
-        basepath = basepath + "/"
-    # Avoid double slashes when we join basepath + path
-    # We only replace attributes that literally start with "/"
-    html = html.replace('href="/', f'href="{basepath}')
-    html = html.replace('src="/', f'src="{basepath}')
-    return html
+# Pipelined serial builds: pages read ahead / waiting to be written, and the I/O threads serving them
+PIPELINE_DEPTH = 8
+PIPELINE_THREADS = 4
+# Larger sources are not read ahead into memory; they are streamed when their turn comes
+PIPELINE_MAX_BYTES = 8 * 1024 * 1024
+
+
+def _write_page(
+    out,
+    markdown: Union[str, Iterable[str]],
+    title: str,
+    template: CompiledTemplate,
+    cache: Optional[FragmentCache],
+    collector: Optional[TextCollector],
+    links: Optional[LinkCollector],
+) -> None:
+    # Parse, render and write block by block. Link and image URLs are resolved as their
+    # nodes are built, with the resolver the template's own URLs were resolved with
+    chunks = iter_document_html(markdown, cache, template.resolver)
+    if collector is not None:
+        collector.title = title
+        chunks = collector.wrap(chunks)
+    if links is not None:
+        chunks = links.wrap(chunks)
+    try:
+        template.write(out, Title=title, Content=chunks)
+    finally:
+        # Fragments rendered so far are valid even if a later block failed
+        if cache is not None:
+            cache.flush()
+
+
+def _build_page(
+    from_path: str,
+    template_path: str,
+    dest_path: str,
+    basepath: str = "/",
+    template: Optional[CompiledTemplate] = None,
+    cache: Optional[FragmentCache] = None,
+    collector: Optional[TextCollector] = None,
+    links: Optional[LinkCollector] = None,
+    title: Optional[str] = None,
+) -> bool:
+    # Read, render and write one page without any progress output
+    # (shared by generate_page and the worker processes of a parallel build).
+    # A TextCollector, if given, receives the title and the text of the page as it renders,
+    # and a LinkCollector the URLs it links to. title comes from the page index when known;
+    # otherwise it is the front matter title or the first h1.
+    # Returns True if the output file changed.
 
+    # Compile the template unless the caller already did (once per build)
+    if template is None:
+        with span("template"):
+            template = load_template(template_path, basepath)
 
-def generate_page(from_path: str, template_path: str, dest_path: str, basepath: str = "/") -> None:
+    # Read the markdown as a stream of lines so only the current block is ever in memory
+    with open(from_path, "r", encoding="utf-8") as src:
+        # Skip the front matter; the body starts at the current position
+        meta = read_front_matter(src)
+        if title is None:
+            title = page_meta(meta)["title"]
+        if title is None:
+            # Extract title (before anything is written, so a missing h1 leaves no output)
+            body = src.tell()
+            with span("extract_title"):
+                title = extract_title(src)
+            src.seek(body)
+
+        # OutputFile writes to a temp file and only replaces the page if it changed, so a
+        # block failing to parse never leaves a truncated page and unchanged pages keep
+        # their mtime.
+        output = OutputFile(dest_path)
+        with span("render_page"), output as out:
+            _write_page(timed_stream(out), src, title, template, cache, collector, links)
+    return bool(output.changed)
+
+
+def generate_page(
+    from_path: str,
+    template_path: str,
+    dest_path: str,
+    basepath: str = "/",
+    template: Optional[CompiledTemplate] = None,
+    cache: Optional[FragmentCache] = None,
+    collector: Optional[TextCollector] = None,
+    links: Optional[LinkCollector] = None,
+    title: Optional[str] = None,
+) -> bool:
     """
     Render a single markdown file using the HTML template into a destination .html file.
     basepath is used to prefix root-relative href/src attributes for GitHub Pages.
+    A precompiled template (which carries the URL resolver) may be passed to avoid
+    re-reading template_path, a FragmentCache to reuse the rendered HTML of blocks seen
+    before, a TextCollector to get the page's title and plain text for the site index,
+    and a LinkCollector to get the URLs it links to. A known title (from the page index)
+    saves looking it up.
+    An existing identical output is left untouched; returns True if dest_path changed.
     """
     print(f"[page] Generating {dest_path} from {from_path} using {template_path} (basepath={basepath})")
+    with page_span(dest_path):
+        changed = _build_page(
+            from_path, template_path, dest_path, basepath, template, cache, collector, links, title
+        )
+    if changed:
+        print(f"[done] Wrote {dest_path}")
+    else:
+        print(f"[same] Unchanged {dest_path}")
+    return changed
 
-    # Read markdown source
-    with open(from_path, "r", encoding="utf-8") as f:
-        md_text = f.read()
 
-    # Read template
-    with open(template_path, "r", encoding="utf-8") as f:
-        template = f.read()
+# Set in each worker process of a parallel build by _init_worker
+_worker_cache: Optional[FragmentCache] = None
 
-    # Convert markdown -> HTML
-    root_node = markdown_to_html_node(md_text)
-    content_html = root_node.to_html()
 
-    # Extract title
-    title = extract_title(md_text)
+def _init_worker(cache: Optional[FragmentCache]) -> None:
+    # One fragment cache (and SQLite connection) per worker, flushed and closed when it exits
+    global _worker_cache
+    _worker_cache = cache
+    if cache is not None:
+        Finalize(cache, cache.close, exitpriority=10)
 
-    # Fill template placeholders
-    html = template.replace("{{ Title }}", title).replace("{{ Content }}", content_html)
 
-    # Apply basepath rewrites for root-relative links
-    html = _apply_basepath(html, basepath)
+class _RenderJob(NamedTuple):
+    # One page for a process-pool worker
+    src: str
+    template_path: str
+    dest: str
+    basepath: str
+    template: CompiledTemplate
+    text: bool  # Return the page's TextCollector
+    links: bool  # Return the page's LinkCollector
+    title: Optional[str]  # From the page index (None to look it up)
 
-    # Ensure destination directory exists
-    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
 
-    # Write output
-    with open(dest_path, "w", encoding="utf-8") as f:
-        f.write(html)
+def _render_job(
+    job: _RenderJob,
+) -> Tuple[Optional[str], bool, int, int, Optional[TextCollector], Optional[LinkCollector]]:
+    # Process-pool entry point: render one page, returning an error message instead of raising,
+    # whether the output changed, the fragment cache hits/misses of this page and, if the job
+    # asks for them, the page's TextCollector and LinkCollector.
+    cache = _worker_cache
+    if cache is not None:
+        # Counted per page: the worker's cache lives across all the pages it renders
+        cache.hits = cache.misses = 0
+    collector = TextCollector() if job.text else None
+    links = LinkCollector() if job.links else None
+    error: Optional[str] = None
+    changed = False
+    try:
+        changed = _build_page(
+            job.src,
+            job.template_path,
+            job.dest,
+            job.basepath,
+            job.template,
+            cache=cache,
+            collector=collector,
+            links=links,
+            title=job.title,
+        )
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    if cache is None:
+        return error, changed, 0, 0, collector, links
+    return error, changed, cache.hits, cache.misses, collector, links
 
-    print(f"[done] Wrote {dest_path}")
 
+def _read_source(path: str) -> Optional[str]:
+    # Whole markdown source for the pipeline, or None if it is too large to hold in memory
+    if os.path.getsize(path) > PIPELINE_MAX_BYTES:
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
 
-def generate_pages_recursive(dir_path_content: str, template_path: str, dest_dir_path: str, basepath: str = "/") -> None:
-    """
-    Crawl every entry in dir_path_content. For each *.md file found, generate a corresponding
-    .html file in dest_dir_path with the same relative structure.
 
-    Examples:
-      content/index.md                -> docs/index.html
-      content/blog/tom/index.md       -> docs/blog/tom/index.html
-      content/notes/about.md          -> docs/notes/about.html
+def _render_text(
+    markdown: str,
+    template: CompiledTemplate,
+    cache: Optional[FragmentCache],
+    collector: Optional[TextCollector],
+    links: Optional[LinkCollector],
+    title: Optional[str] = None,
+) -> str:
+    # Render an in-memory source to the full page HTML
+    meta, body = split_front_matter(markdown)
+    if title is None:
+        title = page_meta(meta)["title"] or extract_title(body)
+    out = io.StringIO()
+    _write_page(out, body, title, template, cache, collector, links)
+    return out.getvalue()
+
+
+def _render_pipelined(
+    todo: List[Tuple[str, str]],
+    basepath: str,
+    layouts: Dict[str, Tuple[str, CompiledTemplate]],
+    cache: Optional[FragmentCache],
+    titles: Dict[str, Optional[str]],
+    text: bool,
+    link: bool,
+    finished: Callable[..., None],
+) -> None:
+    """
+    Render pages in this process while I/O threads read the next sources and write the
+    finished pages, so slow storage overlaps with rendering instead of adding to it.
+    At most PIPELINE_DEPTH reads and PIPELINE_DEPTH writes are in flight, which bounds
+    memory; pages complete (and `finished` is called) in todo order. layouts maps every
+    source to its layout's path and compiled template.
     """
+    total = len(todo)
+    pending = iter(todo)
+    reads: Deque[Tuple[str, str, Future]] = deque()
+    writes: Deque[Tuple[str, str, Optional[TextCollector], Optional[LinkCollector], Future]] = deque()
+    done = 0
+
+    def complete(src_md, dest_html, error, changed, collector, page_links) -> None:
+        nonlocal done
+        done += 1
+        if error is None:
+            verb = "Wrote" if changed else "Unchanged"
+            print(f"[done] ({done}/{total}) {verb} {dest_html}")
+        finished(src_md, dest_html, error, changed, collector, page_links)
+
+    def drain(limit: int) -> None:
+        # Wait for the oldest writes until at most `limit` are still in flight
+        while len(writes) > limit:
+            src_md, dest_html, collector, page_links, future = writes.popleft()
+            try:
+                changed = future.result()
+            except Exception as e:
+                complete(src_md, dest_html, f"{type(e).__name__}: {e}", False, None, None)
+            else:
+                complete(src_md, dest_html, None, changed, collector, page_links)
+
+    print(f"[pipe] Rendering {total} pages, reading and writing {PIPELINE_DEPTH} ahead (basepath={basepath})")
+    with ThreadPoolExecutor(PIPELINE_THREADS) as readers, ThreadPoolExecutor(PIPELINE_THREADS) as writers:
+        while True:
+            while len(reads) < PIPELINE_DEPTH:
+                job = next(pending, None)
+                if job is None:
+                    break
+                reads.append((job[0], job[1], readers.submit(_read_source, job[0])))
+            if not reads:
+                break
+            src_md, dest_html, read = reads.popleft()
+            collector = TextCollector() if text else None
+            page_links = LinkCollector() if link else None
+            title = titles.get(src_md)
+            template_path, template = layouts[src_md]
+            try:
+                markdown = read.result()
+                if markdown is None:
+                    # Too large to hold in memory: stream it here, after the pages before it
+                    drain(0)
+                    changed = _build_page(
+                        src_md, template_path, dest_html, basepath, template, cache, collector, page_links, title
+                    )
+                    complete(src_md, dest_html, None, changed, collector, page_links)
+                    continue
+                html = _render_text(markdown, template, cache, collector, page_links, title)
+            except Exception as e:
+                drain(0)
+                complete(src_md, dest_html, f"{type(e).__name__}: {e}", False, None, None)
+                continue
+            writes.append((src_md, dest_html, collector, page_links, writers.submit(write_if_changed, dest_html, html)))
+            drain(PIPELINE_DEPTH)
+        drain(0)
+
+
+def _collect_pages(dir_path_content: str, dest_dir_path: str) -> List[Tuple[str, str]]:
+    # Map every *.md under dir_path_content to its .html destination, in os.walk order
+    pages: List[Tuple[str, str]] = []
     for root, _dirs, files in os.walk(dir_path_content):
         for filename in files:
             if not filename.lower().endswith(".md"):
@@ -93,6 +317,254 @@ def generate_pages_recursive(dir_path_content: str, template_path: str, dest_dir
             # Map filename.md -> filename.html
             base = filename[:-3]  # strip ".md"
             dest_subdir = os.path.join(dest_dir_path, rel_dir) if rel_dir else dest_dir_path
-            dest_html = os.path.join(dest_subdir, f"{base}.html")
+            pages.append((src_md, os.path.join(dest_subdir, f"{base}.html")))
+    return pages
+
+
+def _asset_inputs(urls: Iterable[str], basepath: str, static_dir: str) -> List[str]:
+    # Files under static_dir that a page's root-relative URLs point at ("/images/x.png" -> static/images/x.png;
+    # a fingerprinted "/images/x.3f2a9c01de.png" maps to the same file)
+    assets = []
+    for url in urls:
+        rel = target_path(url, basepath)
+        if rel:
+            for candidate in (rel, original_name(rel)):
+                path = os.path.join(static_dir, *candidate.split("/"))
+                if os.path.isfile(path):
+                    assets.append(os.path.normpath(path))
+                    break
+    return assets
+
+
+def _page_layout(
+    src_md: str,
+    dir_path_content: str,
+    name: Optional[str],
+    loader: TemplateLoader,
+    layouts_dir: Optional[str],
+    default: str,
+    sections: Dict[str, Optional[str]],
+) -> str:
+    # Layout file of a page: the front matter `template` (relative to the loader's root),
+    # else with a layouts_dir the layout of the nearest enclosing section that has one
+    # (layouts/blog.html for content/blog/tom/index.md), else the default template.
+    # sections caches the lookup per content directory.
+    if name:
+        return loader.path(name)
+    if layouts_dir is None:
+        return default
+    rel_dir = os.path.relpath(os.path.dirname(src_md), dir_path_content)
+    found = sections.get(rel_dir, "")
+    if found == "":
+        found = None
+        parts = [] if rel_dir == "." else rel_dir.split(os.sep)
+        while parts and found is None:
+            candidate = os.path.join(layouts_dir, *parts) + ".html"
+            if os.path.isfile(candidate):
+                found = os.path.normpath(candidate)
+            parts.pop()
+        sections[rel_dir] = found
+    return found or default
+
+
+def generate_pages_recursive(
+    dir_path_content: str,
+    template_path: str,
+    dest_dir_path: str,
+    basepath: str = "/",
+    manifest: Optional[BuildManifest] = None,
+    jobs: int = 1,
+    cache: Optional[FragmentCache] = None,
+    site: Optional[SiteIndex] = None,
+    links: Optional[LinkIndex] = None,
+    pipeline: bool = False,
+    resolver: Optional[URLResolver] = None,
+    index: Optional[PageIndex] = None,
+    drafts: bool = False,
+    layouts_dir: Optional[str] = None,
+    static_dir: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    Crawl every entry in dir_path_content. For each *.md file found, generate a corresponding
+    .html file in dest_dir_path with the same relative structure.
+
+    Examples:
+      content/index.md                -> docs/index.html
+      content/blog/tom/index.md       -> docs/blog/tom/index.html
+      content/notes/about.md          -> docs/notes/about.html
+
+    URLs are resolved with basepath, or with `resolver` if given. Pages use their front
+    matter template, else <layouts_dir>/<section>.html, else template_path. With a
+    manifest only pages with a changed input are rebuilt; jobs > 1 and pipeline=True
+    render in processes or I/O threads; drafts are skipped unless drafts=True.
+    cache, site, links and index are updated as pages render. A failing page does not
+    stop the others; a RuntimeError is raised at the end.
+    Returns counts of rebuilt, skipped and removed pages, and of rebuilt pages whose
+    output actually changed ("written"; identical outputs are not rewritten).
+    """
+    stats = {"rebuilt": 0, "skipped": 0, "removed": 0, "written": 0}
+    loader = TemplateLoader(
+        layouts_dir if layouts_dir is not None else os.path.dirname(template_path), basepath, resolver
+    )
+    template_path = os.path.normpath(template_path)
+    with span("template"):
+        loader.compile(template_path)
+    if manifest is not None:
+        manifest.begin(basepath)
+
+    pages = _collect_pages(dir_path_content, dest_dir_path)
+
+    # Pre-scan: headers only, and only of sources changed since the index was saved
+    if index is None:
+        index = PageIndex()
+    with span("scan_headers"):
+        headers_read = index.scan(pages)
+    index.save()
+    skipped_drafts = set() if drafts else {src for src, _dest in pages if index.pages[src]["draft"]}
+    pages = [(src, dest) for src, dest in pages if src not in skipped_drafts]
+    print(
+        f"[scan] {len(index.pages)} page(s) indexed, {headers_read} header(s) read, "
+        f"{len(skipped_drafts)} draft(s) skipped"
+    )
+    titles = {src: index.pages[src]["title"] for src, _dest in pages}
+    failures: List[Tuple[str, str]] = []
+
+    def finished(
+        src_md: str,
+        dest_html: str,
+        error: Optional[str],
+        changed: bool,
+        collector: Optional[TextCollector],
+        page_links: Optional[LinkCollector],
+    ) -> None:
+        if error is not None:
+            failures.append((src_md, error))
+            print(f"[fail] {src_md}: {error}")
+            return
+        stats["rebuilt"] += 1
+        stats["written"] += changed
+        if manifest is not None:
+            layout_path, template = layouts[src_md]
+            inputs = loader.dependencies(layout_path)
+            if static_dir is not None:
+                inputs += _asset_inputs(page_links.urls, basepath, static_dir)
+            manifest.record(src_md, dest_html, template.digest, inputs)
+        if site is not None:
+            url = page_url(dest_html, dest_dir_path)
+            entry = index.pages[src_md]
+            site.record(src_md, url, entry["title"] or collector.title, collector.text(), entry["date"])
+        if links is not None:
+            rel = os.path.relpath(dest_html, dest_dir_path).replace(os.sep, "/")
+            links.record(src_md, rel, page_links.urls)
+
+    # Every page's layout, compiled once per layout file, and the pages whose inputs changed
+    layouts: Dict[str, Tuple[str, CompiledTemplate]] = {}
+    sections: Dict[str, Optional[str]] = {}
+    todo = []
+    reasons: Dict[str, str] = {}
+    with span("layouts"):
+        for src_md, dest_html in pages:
+            try:
+                name = index.pages[src_md]["template"]
+                path = _page_layout(src_md, dir_path_content, name, loader, layouts_dir, template_path, sections)
+                layouts[src_md] = (path, loader.compile(path))
+            except (OSError, ValueError) as e:
+                finished(src_md, dest_html, f"{type(e).__name__}: {e}", False, None, None)
+                continue
+            reason = "no manifest"
+            if manifest is not None:
+                reason = manifest.stale_reason(src_md, dest_html, layouts[src_md][1].digest)
+            if reason is None and site is not None and src_md not in site:
+                reason = "not in the site index"
+            if reason is None and links is not None and src_md not in links:
+                reason = "not in the link index"
+            if reason is None:
+                stats["skipped"] += 1
+            else:
+                reasons[src_md] = reason
+                todo.append((src_md, dest_html))
+    used = sorted({path for path, _t in layouts.values()} | {template_path})
+    print(f"[tmpl] {len(used)} layout(s) in use, built from {len(loader.graph)} template file(s)")
+    if manifest is not None and manifest.invalidated is not None:
+        print(f"[why ] all {len(todo)} page(s): {manifest.invalidated}")
+    elif manifest is not None:
+        for src_md, dest_html in todo:
+            print(f"[why ] {dest_html}: {reasons[src_md]}")
+
+    # URLs are collected for the link index and for the static files each page depends on
+    track = links is not None or (manifest is not None and static_dir is not None)
+
+    if jobs > 1 and len(todo) > 1:
+        print(f"[pool] Rendering {len(todo)} pages with {jobs} workers (basepath={basepath})")
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(cache,)) as pool:
+            futures = {}
+            for src_md, dest_html in todo:
+                job = _RenderJob(
+                    src_md,
+                    layouts[src_md][0],
+                    dest_html,
+                    basepath,
+                    layouts[src_md][1],
+                    text=site is not None,
+                    links=track,
+                    title=titles[src_md],
+                )
+                futures[pool.submit(_render_job, job)] = (src_md, dest_html)
+            for done, future in enumerate(as_completed(futures), 1):
+                src_md, dest_html = futures[future]
+                error, changed, hits, misses, collector, page_links = future.result()
+                if cache is not None:
+                    cache.hits += hits
+                    cache.misses += misses
+                if error is None:
+                    verb = "Wrote" if changed else "Unchanged"
+                    print(f"[done] ({done}/{len(todo)}) {verb} {dest_html}")
+                finished(src_md, dest_html, error, changed, collector, page_links)
+    elif pipeline and len(todo) > 1:
+        _render_pipelined(todo, basepath, layouts, cache, titles, site is not None, track, finished)
+    else:
+        for src_md, dest_html in todo:
+            collector = TextCollector() if site is not None else None
+            page_links = LinkCollector() if track else None
+            try:
+                changed = generate_page(
+                    src_md,
+                    layouts[src_md][0],
+                    dest_html,
+                    basepath=basepath,
+                    template=layouts[src_md][1],
+                    cache=cache,
+                    collector=collector,
+                    links=page_links,
+                    title=titles[src_md],
+                )
+            except Exception as e:
+                finished(src_md, dest_html, f"{type(e).__name__}: {e}", False, None, None)
+            else:
+                finished(src_md, dest_html, None, changed, collector, page_links)
+
+    if manifest is not None:
+        # Outputs whose markdown source disappeared since the last build
+        for src_md, dest_html in manifest.prune(src for src, _dest in pages):
+            if os.path.isfile(dest_html):
+                os.remove(dest_html)
+                reason = "is a draft" if src_md in skipped_drafts else "removed"
+                print(f"[rm  ] {dest_html} (source {src_md} {reason})")
+            stats["removed"] += 1
+        manifest.save()
+
+    if site is not None:
+        site.prune(src for src, _dest in pages)
+        site.save()
+
+    if links is not None:
+        # The layouts' own links (stylesheets, nav) are checked too, under their paths
+        for path in used:
+            statics = loader.compile(path).statics
+            links.record(path, None, [url for static in statics for url in find_urls(static)])
+        links.prune(used + [src for src, _dest in pages])
+        links.save()
 
-            generate_page(src_md, template_path, dest_html, basepath=basepath)
+    if failures:
+        raise RuntimeError(f"{len(failures)} page(s) failed to render: " + ", ".join(src for src, _e in failures))
+    return stats
@@ -1,4 +1,94 @@
+# "<p>" / "</p>" strings per tag, built once and reused for every node with that tag
+_OPEN_TAGS = {}
+_CLOSE_TAGS = {}
+
+
+def _tag_strings(tag):
+    # Open and close strings for a tag without attributes
+    open_tag = _OPEN_TAGS.get(tag)
+    if open_tag is None:
+        open_tag = _OPEN_TAGS[tag] = f"<{tag}>"
+        _CLOSE_TAGS[tag] = f"</{tag}>"
+    return open_tag, _CLOSE_TAGS[tag]
+
+
+def _props_html(props):
+    # Attribute string; most nodes carrying props have exactly one (an <a> href)
+    if len(props) == 1:
+        for k, v in props.items():
+            return f' {k}="{v}"'
+    return "".join([f' {k}="{v}"' for k, v in props.items()])
+
+
+def render_html(node):
+    """
+    Serialize a node tree into one string: every piece is appended to a single list and
+    joined once, and the tree is walked with an explicit stack of child iterators instead
+    of recursion, so nesting depth is not limited by the interpreter's recursion limit.
+    Nodes of other HTMLNode subclasses are rendered with their own to_html().
+    """
+    out = []
+    append = out.append
+    open_tags = _OPEN_TAGS
+    close_tags = _CLOSE_TAGS
+    # (children iterator, closing tag) of every ancestor of the current level
+    stack = []
+    children = iter((node,))
+    close = ""
+    while True:
+        for child in children:
+            cls = type(child)
+            if cls is LeafNode:
+                value = child.value
+                if value is None:
+                    raise ValueError("LeafNode must have a value to render HTML")
+                tag = child.tag
+                if tag is None:
+                    append(value)
+                    continue
+                if tag not in open_tags:
+                    _tag_strings(tag)
+                props = child.props
+                if not props:
+                    append(open_tags[tag])
+                elif len(props) == 1:
+                    # Inlined _props_html for the common single attribute (<a href>)
+                    for k, v in props.items():
+                        append(f'<{tag} {k}="{v}">')
+                else:
+                    append(f"<{tag}{_props_html(props)}>")
+                append(value)
+                append(close_tags[tag])
+            elif cls is ParentNode:
+                tag = child.tag
+                if tag is None:
+                    raise ValueError("ParentNode must have a tag")
+                if child.children is None:
+                    raise ValueError("ParentNode must have children")
+                if tag not in open_tags:
+                    _tag_strings(tag)
+                if child.props:
+                    append(f"<{tag}{_props_html(child.props)}>")
+                else:
+                    append(open_tags[tag])
+                # Descend: finish this parent's children before the rest of the current level
+                stack.append((children, close))
+                children = iter(child.children)
+                close = close_tags[tag]
+                break
+            else:
+                append(child.to_html())
+        else:
+            append(close)
+            if not stack:
+                return "".join(out)
+            children, close = stack.pop()
+
+
 class HTMLNode:
+    # No per-instance __dict__: large pages create hundreds of thousands of nodes
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
@@ -8,11 +98,20 @@ class HTMLNode:
     def to_html(self):
         raise NotImplementedError("to_html method not implemented")
 
+    def iter_html(self):
+        # Yield the rendered HTML in chunks; subclasses stream their children
+        yield self.to_html()
+
+    def write_html(self, stream):
+        # Write the rendered HTML to a text stream without building the whole string
+        for chunk in self.iter_html():
+            stream.write(chunk)
+
     def props_to_html(self):
         if not self.props:
             return ""
         # Build attributes in insertion order (default in modern Python)
-        return "".join(f' {k}="{v}"' for k, v in self.props.items())
+        return _props_html(self.props)
 
     def __repr__(self):
         return (
@@ -22,6 +121,8 @@ class HTMLNode:
 
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
         # Leaf nodes must have a value
         if value is None:
@@ -37,10 +138,15 @@ class LeafNode(HTMLNode):
         # If no tag, just return the text value
         if self.tag is None:
             return self.value
-        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+        open_tag, close_tag = _tag_strings(self.tag)
+        if self.props:
+            open_tag = f"<{self.tag}{_props_html(self.props)}>"
+        return open_tag + self.value + close_tag
 
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         # Parent nodes must have a tag and children
         if tag is None:
@@ -55,6 +161,21 @@ class ParentNode(HTMLNode):
         if self.children is None:
             raise ValueError("ParentNode must have children")
 
-        # Recursively render all children
-        inner = "".join(child.to_html() for child in self.children)
-        return f"<{self.tag}{self.props_to_html()}>{inner}</{self.tag}>"
+        # The whole subtree in one pass, without recursion
+        return render_html(self)
+
+    def iter_html(self):
+        if self.tag is None:
+            raise ValueError("ParentNode must have a tag")
+        if self.children is None:
+            raise ValueError("ParentNode must have children")
+
+        # Opening tag, each child's HTML in turn, closing tag: only one child's
+        # subtree is ever held as a string
+        open_tag, close_tag = _tag_strings(self.tag)
+        if self.props:
+            open_tag = f"<{self.tag}{self.props_to_html()}>"
+        yield open_tag
+        for child in self.children:
+            yield child.to_html()
+        yield close_tag
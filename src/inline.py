@@ -1,3 +1,4 @@
+import re
 from typing import List
 from textnode import TextNode, TextType
 from extract import extract_markdown_images, extract_markdown_links
@@ -117,19 +118,69 @@ def split_nodes_link(old_nodes: List[TextNode]) -> List[TextNode]:
     return new_nodes
 
 
+# Images and links in one alternation; same patterns as extract.py
+_IMAGE_OR_LINK_RE = re.compile(
+    r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"  # groups 1, 2: image alt, url
+    r"|(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"  # groups 3, 4: link label, url
+)
+
+# Delimiters in the order the split pipeline applied them
+_DELIMITERS = (
+    ("`", TextType.CODE),
+    ("**", TextType.BOLD),
+    ("_", TextType.ITALIC),
+)
+
+
+def _emit_delimited(text: str, level: int, out: List[TextNode]) -> None:
+    # Split text on the delimiter at `level`; plain pieces recurse into the next delimiter.
+    # Gives the same nodes (and errors) as running split_nodes_delimiter once per delimiter.
+    delimiter, text_type = _DELIMITERS[level]
+    parts = text.split(delimiter)
+    if len(parts) % 2 == 0:
+        raise ValueError(
+            f"Invalid markdown: unmatched delimiter {delimiter!r} in {text!r}"
+        )
+    last = level + 1 == len(_DELIMITERS)
+    for idx, segment in enumerate(parts):
+        if segment == "":
+            continue
+        if idx % 2 == 1:
+            out.append(TextNode(segment, text_type))
+        elif last:
+            out.append(TextNode(segment, TextType.TEXT))
+        else:
+            _emit_delimited(segment, level + 1, out)
+
+
 def text_to_textnodes(text: str) -> List[TextNode]:
     """
-    Convert a raw markdown string into a list of TextNodes by applying, in order:
+    Convert a raw markdown string into a list of TextNodes, equivalent to applying in order:
       1) images
       2) links
       3) code spans (`...`)
       4) bold (**...**)
       5) italics (_..._)
+
+    Done in one left-to-right scan: images and links are matched by a single regex,
+    and the text between them is split on the delimiters straight into the output list,
+    instead of rebuilding a node list after every stage.
     """
-    nodes: List[TextNode] = [TextNode(text, TextType.TEXT)]
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes: List[TextNode] = []
+    pos = 0
+    for m in _IMAGE_OR_LINK_RE.finditer(text):
+        if m.start() > pos:
+            _emit_delimited(text[pos:m.start()], 0, nodes)
+        if m.group(2) is not None:
+            nodes.append(TextNode(m.group(1), TextType.IMAGE, m.group(2)))
+        else:
+            nodes.append(TextNode(m.group(3), TextType.LINK, m.group(4)))
+        pos = m.end()
+    if pos < len(text) or not nodes:
+        _emit_delimited(text[pos:], 0, nodes)
     return nodes
+
+
+def markdown_urls(text: str) -> List[str]:
+    # URLs of the images and links in inline-markdown text, matched exactly as text_to_textnodes matches them
+    return [m.group(2) if m.group(2) is not None else m.group(4) for m in _IMAGE_OR_LINK_RE.finditer(text)]
@@ -0,0 +1,171 @@
+# src/instrument.py
+import json
+import sys
+import time
+from typing import Dict, List, Optional, TextIO, Tuple
+
+# (category, name, page, start_s, duration_s, net_allocated_blocks)
+Event = Tuple[str, str, Optional[str], float, float, int]
+
+
+class _NullSpan:
+    # Shared no-op context manager used while profiling is off
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullSpan()
+
+
+class Profiler:
+    """
+    Collects timed spans for a build.
+
+    Each span records wall time and the net change in allocated memory blocks
+    (sys.getallocatedblocks), which is cheap enough to take around every stage.
+    Stage spans nest (render_page contains text_to_textnodes, to_html and write), so
+    stage totals are inclusive.
+    """
+
+    def __init__(self):
+        self.events: List[Event] = []
+        self.page: Optional[str] = None
+        self.origin = time.perf_counter()
+
+    def stage_totals(self) -> Dict[str, Dict[str, float]]:
+        totals: Dict[str, Dict[str, float]] = {}
+        for cat, name, _page, _start, dur, blocks in self.events:
+            if cat != "stage":
+                continue
+            t = totals.setdefault(name, {"calls": 0, "seconds": 0.0, "blocks": 0})
+            t["calls"] += 1
+            t["seconds"] += dur
+            t["blocks"] += blocks
+        return totals
+
+    def page_totals(self) -> List[Tuple[str, float, int]]:
+        # (page, seconds, net allocated blocks), slowest first
+        pages = [(name, dur, blocks) for cat, name, _p, _s, dur, blocks in self.events if cat == "page"]
+        return sorted(pages, key=lambda p: p[1], reverse=True)
+
+    def report(self, top: int = 10) -> None:
+        print("[prof] Stages (inclusive):")
+        print(f"[prof]   {'stage':<24}{'calls':>9}{'total ms':>12}{'mean us':>11}{'net allocs':>12}")
+        stages = sorted(self.stage_totals().items(), key=lambda kv: kv[1]["seconds"], reverse=True)
+        for name, t in stages:
+            mean_us = t["seconds"] / t["calls"] * 1e6
+            print(
+                f"[prof]   {name:<24}{t['calls']:>9}{t['seconds'] * 1e3:>12.2f}"
+                f"{mean_us:>11.1f}{t['blocks']:>12}"
+            )
+        pages = self.page_totals()
+        print(f"[prof] Slowest pages ({min(top, len(pages))} of {len(pages)}):")
+        for name, dur, blocks in pages[:top]:
+            print(f"[prof]   {dur * 1e3:9.2f} ms {blocks:>9} net allocs  {name}")
+
+    def write_trace(self, path: str) -> None:
+        """
+        Write a Chrome trace (chrome://tracing, Perfetto) that also carries the
+        stage and page summaries under "stages"/"pages" for comparing builds.
+        """
+        trace = [
+            {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": (start - self.origin) * 1e6,
+                "dur": dur * 1e6,
+                "pid": 1,
+                "tid": 1,
+                "args": {"page": page, "net_blocks": blocks},
+            }
+            for cat, name, page, start, dur, blocks in self.events
+        ]
+        data = {
+            "traceEvents": trace,
+            "displayTimeUnit": "ms",
+            "stages": self.stage_totals(),
+            "pages": [{"page": n, "seconds": d, "net_blocks": b} for n, d, b in self.page_totals()],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+
+class _Span:
+    __slots__ = ("profiler", "cat", "name", "start", "blocks")
+
+    def __init__(self, profiler: Profiler, cat: str, name: str):
+        self.profiler = profiler
+        self.cat = cat
+        self.name = name
+
+    def __enter__(self):
+        if self.cat == "page":
+            self.profiler.page = self.name
+        self.blocks = sys.getallocatedblocks()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        prof = self.profiler
+        prof.events.append(
+            (self.cat, self.name, prof.page, self.start, end - self.start, sys.getallocatedblocks() - self.blocks)
+        )
+        if self.cat == "page":
+            prof.page = None
+        return False
+
+
+_profiler: Optional[Profiler] = None
+
+
+def enable() -> Profiler:
+    # Start collecting spans in this process
+    global _profiler
+    _profiler = Profiler()
+    return _profiler
+
+
+def disable() -> None:
+    global _profiler
+    _profiler = None
+
+
+def span(name: str):
+    # Time one pipeline stage; a shared no-op when profiling is off
+    if _profiler is None:
+        return _NULL
+    return _Span(_profiler, "stage", name)
+
+
+class _TimedStream:
+    # Text stream wrapper that times every write() as a "write" stage
+    __slots__ = ("stream", "profiler")
+
+    def __init__(self, stream: TextIO, profiler: Profiler):
+        self.stream = stream
+        self.profiler = profiler
+
+    def write(self, text: str) -> int:
+        with _Span(self.profiler, "stage", "write"):
+            return self.stream.write(text)
+
+
+def timed_stream(stream: TextIO) -> TextIO:
+    # Time the writes to stream (file I/O) apart from rendering; the stream itself when profiling is off
+    if _profiler is None:
+        return stream
+    return _TimedStream(stream, _profiler)
+
+
+def page(path: str):
+    # Time everything done for one output page
+    if _profiler is None:
+        return _NULL
+    return _Span(_profiler, "page", path)
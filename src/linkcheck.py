@@ -0,0 +1,128 @@
+# src/linkcheck.py
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import unquote
+from state import load_state, save_state
+
+LINK_INDEX_VERSION = 1
+
+# href/src attribute values in rendered HTML (links, images, and the template's assets)
+_URL_ATTR_RE = re.compile(r'(?:href|src)="([^"]*)"')
+
+
+def find_urls(html: str) -> List[str]:
+    return _URL_ATTR_RE.findall(html)
+
+
+class LinkCollector:
+    """
+    Pass-through for the HTML chunks of a page that records every href/src it contains,
+    so links are indexed in the same pass that renders the page. Cached blocks arrive as
+    HTML too, which is why the rendered chunks are scanned rather than the inline parser.
+
+        links = LinkCollector()
+        template.write(out, Content=links.wrap(chunks))
+        links.urls
+    """
+
+    def __init__(self):
+        self._urls: Set[str] = set()
+
+    def wrap(self, chunks: Iterable[str]) -> Iterator[str]:
+        # Each chunk is scanned as it passes, so only the URLs outlive it
+        add = self._urls.update
+        for chunk in chunks:
+            if "=" in chunk:
+                add(find_urls(chunk))
+            yield chunk
+
+    @property
+    def urls(self) -> List[str]:
+        return sorted(self._urls)
+
+
+def target_path(url: str, basepath: str) -> Optional[str]:
+    # Output-relative path a root-relative URL points at, or None for anything else
+    # (external, protocol-relative, relative and fragment-only links are not checked)
+    if not url.startswith("/") or url.startswith("//"):
+        return None
+    path = unquote(url.split("#", 1)[0].split("?", 1)[0])
+    # Rendered links carry the basepath; URLs recorded without it are accepted too
+    prefix = basepath if basepath.endswith("/") else basepath + "/"
+    if prefix != "/" and path.startswith(prefix):
+        return path[len(prefix):]
+    return path[1:]
+
+
+def resolves(rel: str, known: Set[str]) -> bool:
+    # "" -> index.html; "blog/tom" and "blog/tom/" -> blog/tom/index.html; "contact" -> contact.html
+    rel = rel.rstrip("/")
+    if not rel:
+        return "index.html" in known
+    return rel in known or f"{rel}/index.html" in known or f"{rel}.html" in known
+
+
+class LinkIndex:
+    """
+    Persistent map of every page (by markdown source) to the output it produces and the
+    URLs it links to, used to find broken internal links without crawling docs/.
+    An incremental build only re-records the pages it rebuilt.
+    """
+
+    def __init__(self, path: Optional[str] = None, data: Optional[dict] = None):
+        self.path = path
+        self.pages: Dict[str, dict] = (data or {}).get("pages", {})
+
+    @classmethod
+    def load(cls, path: str) -> "LinkIndex":
+        return cls(path, load_state(path, LINK_INDEX_VERSION))
+
+    def save(self) -> None:
+        save_state(self.path, LINK_INDEX_VERSION, {"pages": self.pages})
+
+    def __contains__(self, src: str) -> bool:
+        return src in self.pages
+
+    def record(self, src: str, output: Optional[str], urls: Iterable[str]) -> None:
+        # output is the page's path relative to the output dir (None for the template)
+        self.pages[src] = {"output": output, "urls": sorted(set(urls))}
+
+    def prune(self, seen: Iterable[str]) -> None:
+        keep = set(seen)
+        for src in [s for s in self.pages if s not in keep]:
+            del self.pages[src]
+
+    def outputs(self) -> Set[str]:
+        return {e["output"] for e in self.pages.values() if e["output"] is not None}
+
+    def check(self, known: Set[str], basepath: str = "/") -> Tuple[int, List[Tuple[str, str]]]:
+        """
+        Resolve every root-relative link against `known`, the output-relative paths that
+        exist after the build (pages and static files), honouring basepath.
+        Returns (links checked, sorted (source, url) pairs that do not resolve).
+        """
+        checked = 0
+        broken: List[Tuple[str, str]] = []
+        cache: Dict[str, bool] = {}
+        for src, entry in self.pages.items():
+            for url in entry["urls"]:
+                rel = target_path(url, basepath)
+                if rel is None:
+                    continue
+                checked += 1
+                ok = cache.get(rel)
+                if ok is None:
+                    ok = cache[rel] = resolves(rel, known)
+                if not ok:
+                    broken.append((src, url))
+        return checked, sorted(broken)
+
+
+def list_files(root: str) -> Set[str]:
+    # Paths of all files under root, relative to it and "/"-separated like URLs
+    files = set()
+    for dirpath, _dirs, names in os.walk(root):
+        for name in names:
+            files.add(os.path.relpath(os.path.join(dirpath, name), root).replace(os.sep, "/"))
+    return files
@@ -0,0 +1,230 @@
+# src/listing.py
+import hashlib
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from htmlnode import HTMLNode, LeafNode, ParentNode
+from linkcheck import LinkIndex, find_urls
+from markdown import Resolve
+from output import write_if_changed
+from pageindex import PageIndex
+from siteindex import page_url
+from state import load_state, save_state
+from sync import remove_empty_parents
+from template import CompiledTemplate
+
+LISTING_INDEX_VERSION = 1
+DEFAULT_PAGE_SIZE = 10
+PAGE_DIR = "page"  # Older posts of "blog" are listed at blog/page/<n>/
+TAGS_DIR = "tags"  # Posts tagged "middle earth" are listed at tags/middle-earth/
+ARCHIVE_DIR = "archive"  # Posts dated 2024 are listed at archive/2024/
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+def tag_slug(tag: str) -> str:
+    # URL path segment of a tag: "Middle Earth" -> "middle-earth"
+    return _SLUG_RE.sub("-", tag.lower()).strip("-") or "tag"
+
+
+def paginate(posts: List[Tuple[str, dict]], page_size: int) -> List[Tuple[int, List[Tuple[str, dict]]]]:
+    """
+    Split posts (newest first) into listing pages, returned newest page first as
+    (number, posts) pairs; number 0 is the section's front page.
+
+    Pages are numbered from the oldest post, and only the front page is ever partly
+    filled: page 1 always holds the page_size oldest posts, page 2 the next ones, and so
+    on. A new post therefore changes the front page alone (plus the numbered page it
+    pushes a full slice into), instead of shifting every page by one post.
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+    oldest_first = posts[::-1]
+    full = (len(posts) - 1) // page_size if posts else 0
+    pages = [(0, oldest_first[full * page_size:][::-1])]
+    for number in range(full, 0, -1):
+        pages.append((number, oldest_first[(number - 1) * page_size : number * page_size][::-1]))
+    return pages
+
+
+def _page_rel(section: str, number: int) -> str:
+    # Output path of a listing page relative to the output dir: "blog/index.html", "blog/page/3/index.html"
+    parts = [section] if section else []
+    if number:
+        parts += [PAGE_DIR, str(number)]
+    return "/".join(parts + ["index.html"])
+
+
+def _page_link(section: str, number: int) -> str:
+    # Root-relative URL of a listing page ("/blog/", "/blog/page/3/")
+    return "/" + _page_rel(section, number)[: -len("index.html")]
+
+
+def listing_html(
+    name: str,
+    section: str,
+    number: int,
+    posts: List[Tuple[str, dict]],
+    out_dir: str,
+    newer: Optional[int],
+    older: Optional[int],
+    resolve: Resolve = None,
+) -> Tuple[str, str]:
+    """
+    (title, content HTML) of one listing page; newer/older are the neighbouring page
+    numbers, if any. The nodes are built directly rather than written as markdown, so
+    titles and tags are never parsed as inline markup. Links go through resolve.
+    """
+    title = name if number == 0 else f"{name}, page {number}"
+
+    def link(text: str, url: str) -> LeafNode:
+        return LeafNode("a", text, {"href": resolve(url) if resolve else url})
+
+    children: List[HTMLNode] = [ParentNode("h1", [LeafNode(None, title)])]
+    items = []
+    for src, entry in posts:
+        label = entry["title"] or os.path.splitext(os.path.basename(src))[0]
+        item: List[HTMLNode] = [link(label, "/" + page_url(entry["dest"], out_dir))]
+        if entry["date"]:
+            item.append(LeafNode(None, f" ({entry['date']})"))
+        items.append(ParentNode("li", item))
+    children.append(ParentNode("ul", items) if items else ParentNode("p", [LeafNode(None, "No posts yet.")]))
+    nav: List[HTMLNode] = []
+    if newer is not None:
+        nav.append(link("< Newer posts", _page_link(section, newer)))
+    if older is not None:
+        if nav:
+            nav.append(LeafNode(None, " | "))
+        nav.append(link("Older posts >", _page_link(section, older)))
+    if nav:
+        children.append(ParentNode("p", nav))
+    return title, ParentNode("div", children).to_html()
+
+
+class ListingIndex:
+    """
+    Persistent record of every generated listing page (by output path): the section it
+    belongs to, a digest of its rendered inputs and the URLs it links to.
+    A listing page whose digest is unchanged is not rendered again.
+    """
+
+    def __init__(self, path: Optional[str] = None, data: Optional[dict] = None):
+        self.path = path
+        self.pages: Dict[str, dict] = (data or {}).get("pages", {})
+
+    @classmethod
+    def load(cls, path: str) -> "ListingIndex":
+        return cls(path, load_state(path, LISTING_INDEX_VERSION))
+
+    def save(self) -> None:
+        save_state(self.path, LISTING_INDEX_VERSION, {"pages": self.pages})
+
+    def __contains__(self, dest: str) -> bool:
+        return dest in self.pages
+
+    def record(self, dest: str, section: str, digest: str, urls: Iterable[str]) -> None:
+        self.pages[dest] = {"section": section, "digest": digest, "urls": sorted(set(urls))}
+
+    def prune(self, seen: Iterable[str]) -> List[str]:
+        # Drop listing pages not generated this time; returns their output paths
+        keep = set(seen)
+        gone = [d for d in self.pages if d not in keep]
+        for dest in gone:
+            del self.pages[dest]
+        return gone
+
+
+def _listings(
+    sections: Iterable[str], content_dir: str, index: PageIndex, tags: bool, archives: bool
+) -> Iterator[Tuple[str, str, List[Tuple[str, dict]]]]:
+    # (path under the output dir, name, posts newest first) of every listing to generate
+    published = index.published()
+    for section in sections:
+        section = section.strip("/").replace(os.sep, "/")
+        root = os.path.join(content_dir, *section.split("/")) if section else content_dir
+        prefix = os.path.join(root, "")
+        name = section.rsplit("/", 1)[-1].replace("-", " ").capitalize() if section else "Posts"
+        yield section, name, [(src, e) for src, e in published if src.startswith(prefix)]
+    if tags:
+        # Tags that differ only in case or punctuation share a slug, and so one listing
+        slugs: Dict[str, Set[str]] = {}
+        names: Dict[str, str] = {}
+        for tag, posts in sorted(index.by_tag().items()):
+            slugs.setdefault(tag_slug(tag), set()).update(src for src, _e in posts)
+            names.setdefault(tag_slug(tag), tag)
+        for slug in sorted(slugs):
+            yield f"{TAGS_DIR}/{slug}", f"Tagged {names[slug]}", [(s, e) for s, e in published if s in slugs[slug]]
+    if archives:
+        for year, posts in sorted(index.by_year().items(), reverse=True):
+            yield f"{ARCHIVE_DIR}/{year}", f"Posts from {year}", posts
+
+
+def generate_listings(
+    sections: Iterable[str],
+    content_dir: str,
+    dest_dir: str,
+    template: CompiledTemplate,
+    index: PageIndex,
+    state: ListingIndex,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    links: Optional[LinkIndex] = None,
+    force: bool = False,
+    tags: bool = False,
+    archives: bool = False,
+) -> Dict[str, int]:
+    """
+    Write paginated listing pages for each section (a directory under content_dir, e.g.
+    "blog") from the page index: every published page below it, newest first, page_size
+    per page, at <section>/ and <section>/page/<n>/ in dest_dir. With tags=True, every
+    tag gets the same at tags/<tag>/; with archives=True, every year at archive/<year>/.
+
+    Each page is built as HTML nodes and rendered through the site template; links go
+    through the template's URL resolver. Pages whose slice of posts (titles, dates, URLs,
+    neighbours) and template are unchanged are skipped unless force=True; pages no
+    longer needed are removed. A LinkIndex, if given, gets every listing page's links
+    (keyed by output path; the template's own links are recorded by the page build).
+    Returns counts of listing pages written, unchanged and removed.
+    """
+    stats = {"pages": 0, "written": 0, "unchanged": 0, "removed": 0}
+    outputs = {os.path.normpath(entry["dest"]): src for src, entry in index.pages.items()}
+    seen = []
+    for section, name, posts in _listings(sections, content_dir, index, tags, archives):
+        pages = paginate(posts, page_size)
+        # Newest page first, so page i's newer neighbour is pages[i - 1] and older one pages[i + 1]
+        for i, (number, slice_) in enumerate(pages):
+            dest = os.path.join(dest_dir, *_page_rel(section, number).split("/"))
+            if os.path.normpath(dest) in outputs:
+                raise ValueError(f"{outputs[os.path.normpath(dest)]} and the {section!r} listing both write {dest}")
+            newer = pages[i - 1][0] if i > 0 else None
+            older = pages[i + 1][0] if i + 1 < len(pages) else None
+            title, content = listing_html(name, section, number, slice_, dest_dir, newer, older, template.resolver)
+            digest = hashlib.sha256(f"{template.digest}\0{content}".encode("utf-8")).hexdigest()
+            seen.append(dest)
+            stats["pages"] += 1
+            entry = state.pages.get(dest)
+            if not force and entry is not None and entry["digest"] == digest and os.path.isfile(dest):
+                stats["unchanged"] += 1
+            else:
+                html = template.render(Title=title, Content=content)
+                if write_if_changed(dest, html):
+                    print(f"[list] Wrote {dest} ({len(slice_)} post(s))")
+                    stats["written"] += 1
+                else:
+                    stats["unchanged"] += 1
+                state.record(dest, section, digest, find_urls(content))
+            if links is not None:
+                rel = os.path.relpath(dest, dest_dir).replace(os.sep, "/")
+                links.record(dest, rel, state.pages[dest]["urls"])
+
+    for dest in state.prune(seen):
+        if os.path.isfile(dest):
+            os.remove(dest)
+            remove_empty_parents(dest, dest_dir)
+            print(f"[rm  ] {dest} (listing page no longer needed)")
+        if links is not None:
+            links.pages.pop(dest, None)
+        stats["removed"] += 1
+    state.save()
+    if links is not None:
+        links.save()
+    return stats
@@ -1,53 +1,356 @@
 # src/main.py
+import argparse
 import os
-import sys
 import shutil
+import time
+from typing import Dict, List, Optional, Tuple
+import instrument
+from assets import ASSET_MANIFEST_NAME, AssetState, FingerprintResolver, clear_fingerprints, fingerprint_static
+from fragcache import FragmentCache
 from generate import generate_pages_recursive
+from linkcheck import LinkIndex, list_files
+from listing import DEFAULT_PAGE_SIZE, ListingIndex, generate_listings
+from manifest import BuildManifest
+from pageindex import PageIndex
+from siteindex import FEED_NAME, SEARCH_INDEX_NAME, SITEMAP_NAME, SiteIndex
+from sync import sync_static
+from template import load_template
+from urls import BasepathResolver, ChainResolver, URLResolver
+from watch import serve, watch
 
+CONTENT_DIR = "content"
+STATIC_DIR = "static"
+TEMPLATE_PATH = "template.html"
+LAYOUTS_DIR = "layouts"  # Optional per-section layouts, parent layouts and partials
 OUT_DIR = "docs"  # GitHub Pages serves from /docs on the main branch by default
+STATE_DIR = ".build"  # Build state kept between runs (not published)
+MANIFEST_PATH = os.path.join(STATE_DIR, "manifest.json")
+STATIC_STATE_PATH = os.path.join(STATE_DIR, "static.json")
+FRAGMENT_CACHE_PATH = os.path.join(STATE_DIR, "fragments.sqlite")
+SITE_INDEX_PATH = os.path.join(STATE_DIR, "site.json")
+LINK_INDEX_PATH = os.path.join(STATE_DIR, "links.json")
+PAGE_INDEX_PATH = os.path.join(STATE_DIR, "pages.json")
+LISTING_INDEX_PATH = os.path.join(STATE_DIR, "listings.json")
+ASSET_STATE_PATH = os.path.join(STATE_DIR, "assets.json")
 
 
-def copy_dir_recursive(src: str, dst: str) -> None:
-    for entry in os.listdir(src):
-        s_path = os.path.join(src, entry)
-        d_path = os.path.join(dst, entry)
+def copy_static(
+    src: str, dst: str, jobs: Optional[int] = None, link: bool = True, fingerprint: bool = False
+) -> Dict[str, int]:
+    # Sync static assets into dst (only changed files are copied, stale ones removed), plus
+    # name.<hash>.ext copies of them with fingerprint=True
+    print(f"[copy] {src} -> {dst}")
+    stats = sync_static(src, dst, STATIC_STATE_PATH, jobs=jobs, link=link)
+    print(
+        f"[done] Static assets synced: {stats['copied']} copied, {stats['linked']} linked, "
+        f"{stats['unchanged']} unchanged, {stats['removed']} removed"
+    )
+    state = AssetState.load(ASSET_STATE_PATH)
+    if fingerprint:
+        hashed = fingerprint_static(src, dst, state, link=link)
+        print(
+            f"[done] Fingerprinted assets: {hashed['hashed']} hashed, {hashed['placed']} placed, "
+            f"{hashed['unchanged']} unchanged, {hashed['removed']} removed"
+        )
+        stats["copied"] += hashed["placed"]
+        stats["removed"] += hashed["removed"]
+    elif state.files:
+        stats["removed"] += clear_fingerprints(dst, state)
+    return stats
 
-        if os.path.isdir(s_path):
-            os.makedirs(d_path, exist_ok=True)
-            print(f"[dir ] {s_path} -> {d_path}")
-            copy_dir_recursive(s_path, d_path)
-        elif os.path.isfile(s_path):
-            shutil.copy2(s_path, d_path)
-            print(f"[file] {s_path} -> {d_path}")
-        else:
-            print(f"[skip] {s_path}")
 
+def url_resolver(args: argparse.Namespace) -> URLResolver:
+    # Basepath prefixing, after pointing static assets at their fingerprinted copies with --fingerprint
+    basepath = BasepathResolver(args.basepath)
+    if not args.fingerprint:
+        return basepath
+    return ChainResolver(FingerprintResolver(AssetState.load(ASSET_STATE_PATH).mapping()), basepath)
 
-def copy_static(src: str, dst: str) -> None:
-    if os.path.exists(dst):
-        print(f"[wipe] Removing existing '{dst}'")
-        shutil.rmtree(dst)
 
-    print(f"[mk  ] Creating '{dst}'")
-    os.makedirs(dst, exist_ok=True)
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the static site into docs/.")
+    parser.add_argument("basepath", nargs="?", default="/", help='URL prefix for root-relative links (default "/")')
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="re-render only pages whose source, template or basepath changed",
+    )
+    parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="wipe docs/ and the build state before building",
+    )
+    parser.add_argument(
+        "--drafts",
+        action="store_true",
+        help="also render pages marked draft: true in their front matter",
+    )
+    parser.add_argument(
+        "--listing",
+        action="append",
+        default=[],
+        metavar="DIR",
+        help="generate paginated listing pages for content/DIR (e.g. blog) from its pages' front matter; repeatable",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        metavar="N",
+        help=f"posts per listing page (default {DEFAULT_PAGE_SIZE})",
+    )
+    parser.add_argument(
+        "--tag-pages",
+        action="store_true",
+        help="generate a paginated listing of every front-matter tag at docs/tags/<tag>/",
+    )
+    parser.add_argument(
+        "--archive-pages",
+        action="store_true",
+        help="generate a paginated listing of each year's dated posts at docs/archive/<year>/",
+    )
+    parser.add_argument(
+        "--no-links",
+        action="store_true",
+        help="always copy static files instead of hardlinking them into docs/",
+    )
+    parser.add_argument(
+        "--fingerprint",
+        action="store_true",
+        help="also publish static files as name.<hash>.ext (listed in asset-manifest.json) and link pages to those",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        metavar="N",
+        help="render pages in N worker processes (default: number of CPUs; 1 = serial)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="do not reuse rendered blocks from the fragment cache in .build/",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=256,
+        metavar="MB",
+        help="size cap of the fragment cache; least recently used blocks are evicted (default 256)",
+    )
+    parser.add_argument(
+        "--site-url",
+        metavar="URL",
+        help="public site root (e.g. https://user.github.io); also writes sitemap.xml, feed.xml and search.json",
+    )
+    parser.add_argument(
+        "--fail-on-broken-links",
+        action="store_true",
+        help="exit with an error if any root-relative link or image points to nothing in docs/",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="serve docs/ and rebuild affected pages/assets whenever content/, static/, the template or layouts/ "
+        "change",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="time every pipeline stage and page (renders serially) and print the slowest",
+    )
+    parser.add_argument(
+        "--profile-out",
+        metavar="FILE",
+        help="with --profile, also write a Chrome trace JSON (plus stage/page summaries) to FILE",
+    )
+    parser.add_argument("--port", type=int, default=8888, help="port for --watch's HTTP server (default 8888)")
+    return parser.parse_args(argv)
 
-    print(f"[copy] {src} -> {dst}")
-    copy_dir_recursive(src, dst)
-    print("[done] Static assets copied.")
+
+def build(args: argparse.Namespace, static: bool = True, pages: bool = True) -> int:
+    # One build; static/pages let watch mode redo only the part that changed.
+    # Returns the number of files in OUT_DIR that were written or removed.
+    changed = 0
+    if static:
+        # 1) Sync static assets into OUT_DIR
+        synced = copy_static(STATIC_DIR, OUT_DIR, link=not args.no_links, fingerprint=args.fingerprint)
+        changed += synced["copied"] + synced["linked"] + synced["removed"]
+
+    if pages:
+        # A full build re-renders every page but still uses the manifest to drop stale outputs
+        manifest = BuildManifest.load(MANIFEST_PATH)
+        if not args.incremental:
+            manifest.invalidate("full build (without --incremental)")
+
+        cache = None
+        if not args.no_cache:
+            cache = FragmentCache(FRAGMENT_CACHE_PATH, max_bytes=args.cache_size * 1024 * 1024)
+
+        # Sitemap, feed and search index entries and the link index are collected while the pages render
+        site = SiteIndex.load(SITE_INDEX_PATH) if args.site_url else None
+        links = LinkIndex.load(LINK_INDEX_PATH)
+        # Front matter and titles of every page; only headers of changed sources are re-read
+        index = PageIndex.load(PAGE_INDEX_PATH)
+        layouts_dir = LAYOUTS_DIR if os.path.isdir(LAYOUTS_DIR) else None
+        resolver = url_resolver(args)
+
+        # 2) Generate ALL pages from content/ into OUT_DIR, with basepath
+        try:
+            stats = generate_pages_recursive(
+                CONTENT_DIR,
+                TEMPLATE_PATH,
+                OUT_DIR,
+                basepath=args.basepath,
+                manifest=manifest,
+                jobs=args.jobs,
+                cache=cache,
+                site=site,
+                links=links,
+                # Profiling times stages in this thread, so keep reads and writes in it too
+                pipeline=not (args.profile or args.profile_out),
+                index=index,
+                drafts=args.drafts,
+                layouts_dir=layouts_dir,
+                static_dir=STATIC_DIR,
+                resolver=resolver,
+            )
+        finally:
+            if cache is not None:
+                evicted, _size = cache.evict()
+                cache.close()
+        print(
+            f"[stat] pages: {stats['rebuilt']} rebuilt ({stats['written']} changed), "
+            f"{stats['skipped']} skipped, {stats['removed']} removed"
+        )
+        if cache is not None:
+            print(f"[stat] fragment cache: {cache.hits} hits, {cache.misses} misses, {evicted} evicted")
+        changed += stats["written"] + stats["removed"]
+
+        # 3) Listing pages of the configured sections (and tags and years), from the page index
+        listings = ListingIndex.load(LISTING_INDEX_PATH)
+        if args.listing or args.tag_pages or args.archive_pages or listings.pages:
+            listed = generate_listings(
+                args.listing,
+                CONTENT_DIR,
+                OUT_DIR,
+                load_template(TEMPLATE_PATH, args.basepath, resolver, root=layouts_dir),
+                index,
+                listings,
+                page_size=args.page_size,
+                links=links,
+                force=not args.incremental,
+                tags=args.tag_pages,
+                archives=args.archive_pages,
+            )
+            print(
+                f"[stat] listings: {listed['pages']} page(s), {listed['written']} written, "
+                f"{listed['unchanged']} unchanged, {listed['removed']} removed"
+            )
+            changed += listed["written"] + listed["removed"]
+
+        if site is not None:
+            # 4) sitemap.xml, feed.xml and search.json from the (updated) page entries
+            written = site.write(OUT_DIR, args.site_url, args.basepath)
+            print(f"[site] {len(site.pages)} page(s) indexed, {written} artifact(s) written")
+            changed += written
+
+    else:
+        links = LinkIndex.load(LINK_INDEX_PATH)
+
+    # 5) Internal links, from the index (docs/ is not crawled)
+    broken = check_links(args, links)
+
+    print(f"[stat] {changed} file(s) changed in {OUT_DIR}/")
+    if broken and args.fail_on_broken_links:
+        raise RuntimeError(f"{broken} broken link(s)")
+    return changed
 
 
-def main() -> None:
-    # Basepath from CLI arg (default "/")
-    basepath = sys.argv[1] if len(sys.argv) > 1 else "/"
+def check_links(args: argparse.Namespace, links: LinkIndex) -> int:
+    # Resolve every internal link of the site against the pages and static files; returns the broken count
+    known = links.outputs() | list_files(STATIC_DIR)
+    if args.site_url:
+        known |= {SITEMAP_NAME, FEED_NAME, SEARCH_INDEX_NAME}
+    if args.fingerprint:
+        known |= set(AssetState.load(ASSET_STATE_PATH).files) | {ASSET_MANIFEST_NAME}
+    checked, broken = links.check(known, args.basepath)
+    for src, url in broken:
+        print(f"[link] {src}: broken link {url}")
+    print(f"[stat] links: {checked} checked, {len(broken)} broken")
+    return len(broken)
+
+
+def rebuild_parts(args: argparse.Namespace, changed: List[str]) -> Tuple[bool, bool]:
+    # (static, pages) parts of the build that the changed paths affect
+    static = any(p.startswith(STATIC_DIR + os.sep) for p in changed)
+    pages = any(not p.startswith(STATIC_DIR + os.sep) for p in changed)
+    if static and args.fingerprint:
+        # Layouts link to assets too (stylesheets): their fingerprinted URLs change the layout
+        # digests, which the page build compares, so let it decide which pages are stale
+        pages = True
+    # Otherwise pages are only rebuilt for a static file when the build graph says one uses it
+    pages = pages or bool(BuildManifest.load(MANIFEST_PATH).dependents(changed))
+    return static, pages
+
+
+def watch_and_serve(args: argparse.Namespace) -> None:
+    # Serve OUT_DIR and rebuild incrementally on every change until Ctrl-C
+    args.incremental = True
+    server = serve(OUT_DIR, args.port)
+    print(f"[srv ] Serving {OUT_DIR}/ at http://localhost:{args.port}/ (Ctrl-C to stop)")
+
+    def on_change(changed) -> None:
+        started = time.perf_counter()
+        static, pages = rebuild_parts(args, changed)
+        print(f"[chg ] {', '.join(changed[:5])}{' ...' if len(changed) > 5 else ''}")
+        try:
+            build(args, static=static, pages=pages)
+        except Exception as e:
+            # Keep serving the last good output; the next save triggers another attempt
+            print(f"[fail] Rebuild failed: {e}")
+            return
+        print(f"[ok  ] Rebuilt in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    try:
+        watch([CONTENT_DIR, STATIC_DIR, TEMPLATE_PATH, LAYOUTS_DIR], on_change)
+    except KeyboardInterrupt:
+        print("[srv ] Stopped")
+    finally:
+        server.shutdown()
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    basepath = args.basepath
     print(f"[cfg ] basepath = {basepath}")
 
-    # 1) Copy static assets to OUT_DIR
-    copy_static("static", OUT_DIR)
+    if args.clean:
+        for path in (OUT_DIR, STATE_DIR):
+            if os.path.exists(path):
+                print(f"[wipe] Removing existing '{path}'")
+                shutil.rmtree(path)
+
+    profiler = None
+    if args.profile or args.profile_out:
+        # Spans are collected in this process, so pages are rendered serially
+        args.jobs = 1
+        profiler = instrument.enable()
 
-    # 2) Generate ALL pages from content/ into OUT_DIR, with basepath
-    generate_pages_recursive("content", "template.html", OUT_DIR, basepath=basepath)
+    build(args)
     print("[ok  ] Site generation complete")
 
+    if profiler is not None:
+        instrument.disable()
+        profiler.report()
+        if args.profile_out:
+            profiler.write_trace(args.profile_out)
+            print(f"[prof] Trace written to {args.profile_out}")
+
+    if args.watch:
+        watch_and_serve(args)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,174 @@
+# src/manifest.py
+import hashlib
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+from state import load_state, save_state
+
+MANIFEST_VERSION = 3
+
+
+def file_digest(path: str) -> str:
+    """
+    Return the sha256 hex digest of a file's contents (read in 1 MiB chunks).
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class BuildManifest:
+    """
+    Persistent build graph: every output, the inputs it was built from, and the state
+    of each input when it was last read.
+
+    For every markdown source it stores the output file it produced, the digest of the
+    layout it was rendered with and its inputs: the source itself, the layout files
+    (parents and partials) and the static assets it references. Inputs are stored once,
+    with size, mtime and content hash, however many pages share them, plus the basepath
+    of the last run. A page can be skipped when none of its inputs changed and its output
+    still exists; otherwise stale_reason() says why it has to be rebuilt.
+
+    Each input is checked at most once per build (stat first, hash only if the stat
+    changed), so an incremental build costs one stat per distinct input.
+    """
+
+    def __init__(self, path: Optional[str] = None, data: Optional[dict] = None):
+        self.path = path
+        data = data or {}
+        self.basepath = data.get("basepath")
+        self.pages: Dict[str, dict] = data.get("pages", {})
+        self.inputs: Dict[str, dict] = data.get("inputs", {})
+        self._digests: Dict[str, str] = {}
+        # Per build: input path -> why it changed ("" if it did not)
+        self._changes: Dict[str, str] = {}
+        self._invalidated: Optional[str] = None
+
+    @classmethod
+    def load(cls, path: str) -> "BuildManifest":
+        return cls(path, load_state(path, MANIFEST_VERSION))
+
+    def save(self) -> None:
+        save_state(self.path, MANIFEST_VERSION, {"basepath": self.basepath, "pages": self.pages, "inputs": self.inputs})
+
+    def begin(self, basepath: str) -> bool:
+        """
+        Start a build with the given site-wide inputs.
+        Returns True if they differ from the previous build, in which case every
+        page is considered stale (entries are kept so removed sources can still be pruned).
+        """
+        changed = self.basepath != basepath
+        if changed and self._invalidated is None:
+            self._invalidated = f"basepath changed from {self.basepath} to {basepath}"
+        self.basepath = basepath
+        self._changes.clear()
+        return changed
+
+    def invalidate(self, reason: str = "full rebuild") -> None:
+        # Treat every page as stale for this build (a full rebuild)
+        self._invalidated = reason
+
+    @property
+    def invalidated(self) -> Optional[str]:
+        # Why every page is stale in this build, or None for an incremental build
+        return self._invalidated
+
+    def _digest(self, src: str) -> str:
+        digest = self._digests.get(src)
+        if digest is None:
+            digest = file_digest(src)
+            self._digests[src] = digest
+        return digest
+
+    def _change(self, path: str) -> str:
+        # Why the input at path differs from when it was recorded, or "" if it does not
+        change = self._changes.get(path)
+        if change is not None:
+            return change
+        entry = self.inputs.get(path)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            change = f"{path} removed"
+        else:
+            if entry is None:
+                change = f"{path} is new"
+            elif entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+                change = ""
+            elif entry["hash"] != self._digest(path):
+                change = f"{path} changed"
+            else:
+                # Touched but identical: remember the new stat so the next check is cheap
+                entry["size"] = st.st_size
+                entry["mtime_ns"] = st.st_mtime_ns
+                change = ""
+        self._changes[path] = change
+        return change
+
+    def stale_reason(self, src: str, dest: str, template: Optional[str] = None) -> Optional[str]:
+        """
+        None if dest is up to date: it exists, was last rendered from src with the layout
+        whose digest is `template`, and none of its recorded inputs changed since.
+        Otherwise a short reason, e.g. "layouts/partials/nav.html changed".
+        """
+        if self._invalidated is not None:
+            return self._invalidated
+        entry = self.pages.get(src)
+        if entry is None:
+            return "new page"
+        if entry.get("dest") != dest:
+            return "output path changed"
+        for path in entry["inputs"]:
+            change = self._change(path)
+            if change:
+                return change
+        if entry.get("template") != template:
+            return "layout changed"
+        if not os.path.isfile(dest):
+            return "output missing"
+        return None
+
+    def is_fresh(self, src: str, dest: str, template: Optional[str] = None) -> bool:
+        """
+        True if src has not changed since it was last rendered to dest with the layout
+        whose digest is `template`, no other input of it changed, and dest exists.
+        """
+        return self.stale_reason(src, dest, template) is None
+
+    def record(self, src: str, dest: str, template: Optional[str] = None, inputs: Iterable[str] = ()) -> None:
+        """
+        Remember the inputs a freshly rendered page was built from: src itself plus
+        `inputs` (layout files, referenced static assets). Inputs that do not exist are
+        skipped.
+        """
+        paths = [src] + sorted(set(inputs) - {src})
+        recorded = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            self.inputs[path] = {"hash": self._digest(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+            self._changes[path] = ""
+            recorded.append(path)
+        self.pages[src] = {"dest": dest, "template": template, "inputs": recorded}
+
+    def dependents(self, paths: Iterable[str]) -> List[str]:
+        # Sources of the pages that read any of the given input files
+        wanted = {os.path.normpath(p) for p in paths}
+        return sorted(src for src, e in self.pages.items() if any(os.path.normpath(p) in wanted for p in e["inputs"]))
+
+    def prune(self, seen_sources) -> List[Tuple[str, str]]:
+        """
+        Drop entries whose source was not seen in this build, and inputs no page uses.
+        Returns the (src, dest) pairs removed so the caller can delete the outputs.
+        """
+        seen = set(seen_sources)
+        removed = [(src, e["dest"]) for src, e in self.pages.items() if src not in seen]
+        for src, _dest in removed:
+            del self.pages[src]
+        used = {path for e in self.pages.values() for path in e["inputs"]}
+        for path in [p for p in self.inputs if p not in used]:
+            del self.inputs[path]
+        return removed
@@ -1,86 +1,155 @@
 # src/markdown.py
-import re
-from typing import List
+from typing import Callable, Iterable, Iterator, List, Optional, Union
+from fragcache import FragmentCache
 from htmlnode import ParentNode, LeafNode, HTMLNode
-from blocks import markdown_to_blocks, block_to_block_type, BlockType
-from inline import text_to_textnodes
+from blocks import iter_blocks, classify_block, BlockType
+from inline import markdown_urls, text_to_textnodes
 from textnode import text_node_to_html_node
+from instrument import span
 
+# Blocks shorter than this are rendered directly instead of going through the fragment cache
+MIN_CACHED_BLOCK = 64
 
-def _text_to_children(text: str) -> List[HTMLNode]:
-    # Convert inline-markdown text into a list of HTMLNodes
-    tnodes = text_to_textnodes(text)
-    return [text_node_to_html_node(t) for t in tnodes]
+# Maps a link/image URL to the one written into the HTML (see urls.URLResolver)
+Resolve = Optional[Callable[[str], str]]
 
 
-def _paragraph_node(block: str) -> ParentNode:
+def _text_to_children(text: str, resolve: Resolve = None) -> List[HTMLNode]:
+    # Convert inline-markdown text into a list of HTMLNodes, resolving link/image URLs
+    with span("text_to_textnodes"):
+        tnodes = text_to_textnodes(text)
+    return [text_node_to_html_node(t, resolve) for t in tnodes]
+
+
+def _paragraph_node(lines: List[str], resolve: Resolve = None) -> ParentNode:
     # Join wrapped lines inside a paragraph with spaces
-    text = " ".join(block.split("\n"))
-    return ParentNode("p", _text_to_children(text))
+    text = " ".join(lines)
+    return ParentNode("p", _text_to_children(text, resolve))
 
 
-def _heading_node(block: str) -> ParentNode:
-    m = re.match(r"^(#{1,6})\s+(.*)$", block)
-    if not m:
-        # Fallback to paragraph if somehow malformed
-        return _paragraph_node(block)
-    level = len(m.group(1))
-    text = m.group(2).strip()
-    return ParentNode(f"h{level}", _text_to_children(text))
+def _heading_node(level: int, text: str, resolve: Resolve = None) -> ParentNode:
+    return ParentNode(f"h{level}", _text_to_children(text, resolve))
 
 
-def _quote_node(block: str) -> ParentNode:
-    # Strip leading '>' (and optional space) from each line, then join with spaces
-    lines = [re.sub(r"^>\s?", "", ln) for ln in block.split("\n")]
+def _quote_node(lines: List[str], resolve: Resolve = None) -> ParentNode:
+    # Quote lines arrive with the leading '>' (and optional space) stripped; join with spaces
     text = " ".join(lines)
-    return ParentNode("blockquote", _text_to_children(text))
+    return ParentNode("blockquote", _text_to_children(text, resolve))
 
 
-def _ul_node(block: str) -> ParentNode:
-    # Unordered list: each line begins with "- "
-    items: List[ParentNode] = []
-    for ln in block.split("\n"):
-        item_text = re.sub(r"^- ", "", ln, count=1)
-        items.append(ParentNode("li", _text_to_children(item_text)))
-    return ParentNode("ul", items)
+def _ul_node(items: List[str], resolve: Resolve = None) -> ParentNode:
+    # Unordered list: item texts arrive without the leading "- "
+    return ParentNode("ul", [ParentNode("li", _text_to_children(item, resolve)) for item in items])
 
 
-def _ol_node(block: str) -> ParentNode:
-    # Ordered list: each line begins with "<num>. "
-    items: List[ParentNode] = []
-    for ln in block.split("\n"):
-        item_text = re.sub(r"^\d+\.\s+", "", ln, count=1)
-        items.append(ParentNode("li", _text_to_children(item_text)))
-    return ParentNode("ol", items)
+def _ol_node(items: List[str], resolve: Resolve = None) -> ParentNode:
+    # Ordered list: item texts arrive without the leading "<num>. "
+    return ParentNode("ol", [ParentNode("li", _text_to_children(item, resolve)) for item in items])
 
 
-def _code_node(block: str) -> ParentNode:
+def _code_node(lines: List[str]) -> ParentNode:
     # Do NOT parse inline markdown inside code blocks
-    lines = block.split("\n")
     # Remove opening and closing ``` fences; preserve internal newlines plus a trailing newline
     content = "\n".join(lines[1:-1]) + "\n"
     code_leaf = LeafNode("code", content)
     return ParentNode("pre", [code_leaf])
 
 
-def markdown_to_html_node(markdown: str) -> ParentNode:
-    # Convert a full Markdown document into a single root <div> with child nodes
-    blocks = markdown_to_blocks(markdown)
-    children: List[HTMLNode] = []
-    for block in blocks:
-        btype = block_to_block_type(block)
-        if btype == BlockType.PARAGRAPH:
-            children.append(_paragraph_node(block))
-        elif btype == BlockType.HEADING:
-            children.append(_heading_node(block))
-        elif btype == BlockType.CODE:
-            children.append(_code_node(block))
-        elif btype == BlockType.QUOTE:
-            children.append(_quote_node(block))
-        elif btype == BlockType.UNORDERED_LIST:
-            children.append(_ul_node(block))
-        elif btype == BlockType.ORDERED_LIST:
-            children.append(_ol_node(block))
-        else:
-            children.append(_paragraph_node(block))
-    return ParentNode("div", children)
+def _block_node(block: str, resolve: Resolve = None) -> HTMLNode:
+    # Classify one block once and build its node from the already-parsed pieces
+    with span("classify_block"):
+        btype, parsed = classify_block(block)
+    if btype == BlockType.HEADING:
+        return _heading_node(*parsed, resolve)
+    if btype == BlockType.CODE:
+        return _code_node(parsed)
+    if btype == BlockType.QUOTE:
+        return _quote_node(parsed, resolve)
+    if btype == BlockType.UNORDERED_LIST:
+        return _ul_node(parsed, resolve)
+    if btype == BlockType.ORDERED_LIST:
+        return _ol_node(parsed, resolve)
+    return _paragraph_node(parsed, resolve)
+
+
+def block_urls(block: str) -> List[str]:
+    # Link and image URLs of one block, as its node builders will pass them to resolve
+    btype, parsed = classify_block(block)
+    if btype == BlockType.CODE:
+        return []
+    if btype == BlockType.HEADING:
+        texts = [parsed[1]]
+    elif btype in (BlockType.UNORDERED_LIST, BlockType.ORDERED_LIST):
+        texts = parsed
+    else:
+        texts = [" ".join(parsed)]
+    return [url for text in texts for url in markdown_urls(text)]
+
+
+def _iter_source_blocks(markdown: Union[str, Iterable[str]]) -> Iterator[str]:
+    # Blocks of a string or an iterable of lines, timed as the markdown_to_blocks stage
+    lines = markdown.split("\n") if isinstance(markdown, str) else markdown
+    blocks = iter_blocks(lines)
+    while True:
+        with span("markdown_to_blocks"):
+            block = next(blocks, None)
+        if block is None:
+            return
+        yield block
+
+
+def iter_block_nodes(markdown: Union[str, Iterable[str]], resolve: Resolve = None) -> Iterator[HTMLNode]:
+    """
+    Yield one HTMLNode per markdown block, lazily.
+    markdown may be a string or an iterable of lines such as an open file, in which case
+    only the current block is held in memory. Each block is classified once; the node
+    builders get its already-parsed pieces. Link and image URLs go through resolve.
+    """
+    for block in _iter_source_blocks(markdown):
+        yield _block_node(block, resolve)
+
+
+def _block_html(block: str, resolve: Resolve = None) -> str:
+    node = _block_node(block, resolve)
+    with span("to_html"):
+        return node.to_html()
+
+
+def iter_document_html(
+    markdown: Union[str, Iterable[str]],
+    cache: Optional[FragmentCache] = None,
+    resolve: Resolve = None,
+) -> Iterator[str]:
+    """
+    HTML chunks of the root <div> for a document, rendered block by block as it is read.
+    With a FragmentCache, each block's HTML is looked up by content and only blocks
+    not seen before are parsed and rendered (then stored). Blocks shorter than
+    MIN_CACHED_BLOCK characters are always rendered: that is cheaper than a lookup.
+    Link and image URLs go through resolve; cached HTML is kept apart per resolver key,
+    or per block context for a URLResolver (a plain callable without a `key` cannot be
+    told apart, so it bypasses the cache).
+    """
+    context = "" if resolve is None else getattr(resolve, "key", None)
+    if context is None:
+        cache = None
+    block_context = getattr(resolve, "context", None)
+    yield "<div>"
+    for block in _iter_source_blocks(markdown):
+        if cache is None or len(block) < MIN_CACHED_BLOCK:
+            yield _block_html(block, resolve)
+            continue
+        if block_context is not None:
+            context = block_context(block)
+        with span("fragment_cache"):
+            html = cache.get(block, context)
+        if html is None:
+            html = _block_html(block, resolve)
+            with span("fragment_cache"):
+                cache.put(block, html, context)
+        yield html
+    yield "</div>"
+
+
+def markdown_to_html_node(markdown: Union[str, Iterable[str]], resolve: Resolve = None) -> ParentNode:
+    # Convert a full Markdown document (string or iterable of lines) into a single root <div>
+    return ParentNode("div", list(iter_block_nodes(markdown, resolve)))
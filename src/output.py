@@ -0,0 +1,54 @@
+# src/output.py
+import filecmp
+import os
+from typing import Optional, TextIO
+
+
+class OutputFile:
+    """
+    Context manager for writing a build output atomically, and only when it changed.
+
+    Text goes to "<path>.tmp". On a clean exit the temp file is compared with the
+    existing output: if identical it is discarded (the old file, and its mtime, stay
+    untouched), otherwise it is renamed over path. On an exception the temp file is
+    removed and path is left as it was. `changed` tells which case happened.
+
+        output = OutputFile("docs/index.html")
+        with output as f:
+            f.write(html)
+        output.changed  # True if docs/index.html was (re)written
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tmp_path = path + ".tmp"
+        self.changed: Optional[bool] = None
+        self._file: Optional[TextIO] = None
+
+    def __enter__(self) -> TextIO:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.tmp_path, "w", encoding="utf-8")
+        return self._file
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self._file.close()
+        if exc_type is not None:
+            if os.path.exists(self.tmp_path):
+                os.remove(self.tmp_path)
+            return False
+        # Sizes are compared first, so contents are only read when they could match
+        if os.path.isfile(self.path) and filecmp.cmp(self.tmp_path, self.path, shallow=False):
+            os.remove(self.tmp_path)
+            self.changed = False
+        else:
+            os.replace(self.tmp_path, self.path)
+            self.changed = True
+        return False
+
+
+def write_if_changed(path: str, text: str) -> bool:
+    # Write a whole string through OutputFile; returns True if path changed
+    output = OutputFile(path)
+    with output as f:
+        f.write(text)
+    return bool(output.changed)
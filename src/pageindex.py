@@ -0,0 +1,84 @@
+# src/pageindex.py
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+from frontmatter import page_meta, read_header
+from state import load_state, save_state
+
+PAGE_INDEX_VERSION = 1
+
+
+class PageIndex:
+    """
+    Site-wide metadata of every markdown page (title, date, tags, draft, template and
+    its output path), built by reading only each file's header.
+
+    scan() re-reads the header of a source only when its size or mtime changed since
+    the index was saved, so an incremental build of a large site costs one stat per
+    page. Listing pages (tags, archives) and draft skipping work from this index
+    without parsing any document body.
+    """
+
+    def __init__(self, path: Optional[str] = None, data: Optional[dict] = None):
+        self.path = path
+        self.pages: Dict[str, dict] = (data or {}).get("pages", {})
+
+    @classmethod
+    def load(cls, path: str) -> "PageIndex":
+        return cls(path, load_state(path, PAGE_INDEX_VERSION))
+
+    def save(self) -> None:
+        save_state(self.path, PAGE_INDEX_VERSION, {"pages": self.pages})
+
+    def scan(self, pages: Iterable[Tuple[str, str]]) -> int:
+        """
+        Bring the index in line with the (source, output) pairs of this build: read the
+        headers of new or modified sources and drop entries of sources that are gone.
+        Returns the number of headers read. A header that fails to parse is indexed with
+        empty metadata; rendering the page then reports the error.
+        """
+        seen = set()
+        read = 0
+        for src, dest in pages:
+            seen.add(src)
+            st = os.stat(src)
+            entry = self.pages.get(src)
+            if (
+                entry is not None
+                and entry["dest"] == dest
+                and entry["size"] == st.st_size
+                and entry["mtime_ns"] == st.st_mtime_ns
+            ):
+                continue
+            try:
+                meta = read_header(src)
+            except ValueError:
+                meta = page_meta({})
+            meta.update(dest=dest, size=st.st_size, mtime_ns=st.st_mtime_ns)
+            self.pages[src] = meta
+            read += 1
+        for src in [s for s in self.pages if s not in seen]:
+            del self.pages[src]
+        return read
+
+    def published(self) -> List[Tuple[str, dict]]:
+        # (source, entry) of every non-draft page, newest first (undated pages last, by source)
+        entries = [(src, e) for src, e in self.pages.items() if not e["draft"]]
+        entries.sort(key=lambda item: item[0])
+        entries.sort(key=lambda item: item[1]["date"] or "", reverse=True)
+        return entries
+
+    def by_tag(self) -> Dict[str, List[Tuple[str, dict]]]:
+        # Published pages grouped by tag, each group newest first
+        tags: Dict[str, List[Tuple[str, dict]]] = {}
+        for src, entry in self.published():
+            for tag in entry["tags"]:
+                tags.setdefault(tag, []).append((src, entry))
+        return tags
+
+    def by_year(self) -> Dict[str, List[Tuple[str, dict]]]:
+        # Published dated pages grouped by the year of their date, for archives
+        years: Dict[str, List[Tuple[str, dict]]] = {}
+        for src, entry in self.published():
+            if entry["date"]:
+                years.setdefault(entry["date"][:4], []).append((src, entry))
+        return years
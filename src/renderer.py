@@ -0,0 +1,92 @@
+# src/renderer.py
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Union
+from frontmatter import first_heading, page_meta, split_front_matter
+from markdown import iter_document_html
+from template import CompiledTemplate
+from urls import BasepathResolver, URLResolver
+
+# Set in each worker process by _init_worker
+_worker: Optional["Renderer"] = None
+
+
+def _init_worker(renderer: "Renderer") -> None:
+    global _worker
+    _worker = renderer
+
+
+def _render_in_worker(markdown: str) -> str:
+    return _worker.render(markdown)
+
+
+class Renderer:
+    """
+    Reusable in-process renderer for markdown strings, with no file I/O per call.
+
+    Without a template, render() returns the document's root <div> HTML; with one it
+    returns the whole page, Title being the front matter title or the first h1 ("" if
+    there is neither). Front matter is never rendered. The template
+    is compiled once, and root-relative href/src are prefixed with basepath as in a build
+    (or mapped by `resolver`, a urls.URLResolver, if one is given).
+
+        with Renderer(template_text, basepath="/site/", jobs=4) as renderer:
+            pages = renderer.render_many(snippets)
+
+    With jobs > 1, render_many fans batches out to a process pool that is started on
+    first use and kept until close().
+    """
+
+    def __init__(
+        self,
+        template: Union[str, CompiledTemplate, None] = None,
+        basepath: str = "/",
+        jobs: int = 1,
+        resolver: Optional[URLResolver] = None,
+    ):
+        resolver = resolver if resolver is not None else BasepathResolver(basepath)
+        if isinstance(template, str):
+            template = CompiledTemplate(template, basepath, resolver)
+        elif template is not None and template.resolver.key != resolver.key:
+            raise ValueError(f"template was compiled for {template.resolver!r}, not {resolver!r}")
+        self.template = template
+        self.basepath = basepath
+        self.resolver = resolver
+        self.jobs = jobs
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __getstate__(self):
+        # Workers get the template and settings, never the parent's pool
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        return state
+
+    def __enter__(self) -> "Renderer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def render(self, markdown: str) -> str:
+        meta, body = split_front_matter(markdown)
+        html = "".join(iter_document_html(body, resolve=self.resolver))
+        if self.template is None:
+            return html
+        title = page_meta(meta)["title"] or first_heading(body.split("\n")) or ""
+        return self.template.render(Title=title, Content=html)
+
+    def render_many(self, documents: Iterable[str]) -> List[str]:
+        # Render every document; results are in input order
+        documents = list(documents)
+        if self.jobs <= 1 or len(documents) < 2:
+            return [self.render(doc) for doc in documents]
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker, initargs=(self,))
+        # A few batches per worker: small snippets are too cheap to ship one at a time
+        chunksize = max(1, len(documents) // (self.jobs * 4))
+        return list(self._pool.map(_render_in_worker, documents, chunksize=chunksize))
+
+    def close(self) -> None:
+        # Shut down the worker pool, if one was started
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -0,0 +1,49 @@
+# src/sitefixture.py
+# Temporary site shared by the build tests
+import os
+import tempfile
+import unittest
+from typing import Dict
+
+
+class SiteTestCase(unittest.TestCase):
+    """
+    Base class for tests that build a small site in a temporary directory laid out like
+    the real one: content/, template.html, the docs/ output dir and state under .build/.
+    Subclasses set TEMPLATE and PAGES (content-relative path -> markdown) and add the
+    paths and helpers of what they test in their own setUp.
+    """
+
+    TEMPLATE = "<title>{{ Title }}</title>{{ Content }}"
+    PAGES: Dict[str, str] = {}
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, "content")
+        self.out = os.path.join(self.root, "docs")
+        self.template = os.path.join(self.root, "template.html")
+        self.manifest_path = self._state_path("manifest.json")
+        os.makedirs(self.content)
+        self._write(self.template, self.TEMPLATE)
+        for rel, text in self.PAGES.items():
+            self._write_page(rel, text)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _state_path(self, name: str) -> str:
+        return os.path.join(self.root, ".build", name)
+
+    def _write(self, path: str, text: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def _write_page(self, rel: str, text: str) -> None:
+        self._write(os.path.join(self.content, *rel.split("/")), text)
+
+    def _read(self, rel: str) -> str:
+        # An output file, by its path relative to the output dir
+        with open(os.path.join(self.out, *rel.split("/")), encoding="utf-8") as f:
+            return f.read()
@@ -0,0 +1,181 @@
+# src/siteindex.py
+import json
+import os
+import re
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+from xml.sax.saxutils import escape
+from output import write_if_changed
+from state import load_state, save_state
+
+SITE_INDEX_VERSION = 1
+
+# Search text kept per page, and the start of it used as the feed item description
+SEARCH_TEXT_LIMIT = 4000
+SUMMARY_LIMIT = 280
+FEED_ITEMS = 20
+
+# Entry dates are stored as UTC timestamps in this format
+_STAMP = "%Y-%m-%dT%H:%M:%SZ"
+_DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%dT%H:%M:%S")
+
+SITEMAP_NAME = "sitemap.xml"
+FEED_NAME = "feed.xml"
+SEARCH_INDEX_NAME = "search.json"
+
+# Closing block tags become word breaks; every other tag is dropped
+_BLOCK_END_RE = re.compile(r"</(?:p|h[1-6]|li|blockquote|pre|div|ul|ol)>")
+_TAG_RE = re.compile(r"<[^>]*>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+class TextCollector:
+    """
+    Pass-through for the HTML chunks of a page that keeps their plain text for the
+    search index, so the page is indexed in the same pass that renders it.
+    At most SEARCH_TEXT_LIMIT characters are kept, however large the page.
+    The renderer also stores the page title extracted from the markdown in `title`.
+
+        collector = TextCollector()
+        template.write(out, Content=collector.wrap(chunks))
+        collector.text()
+    """
+
+    def __init__(self, limit: int = SEARCH_TEXT_LIMIT):
+        self.limit = limit
+        self.title = ""
+        self._parts: List[str] = []
+        self._size = 0
+
+    def wrap(self, chunks: Iterable[str]) -> Iterator[str]:
+        for chunk in chunks:
+            if self._size < self.limit:
+                text = _TAG_RE.sub("", _BLOCK_END_RE.sub(" ", chunk))
+                self._parts.append(text)
+                self._size += len(text)
+            yield chunk
+
+    def text(self) -> str:
+        return _SPACE_RE.sub(" ", "".join(self._parts)).strip()[: self.limit]
+
+
+def page_url(dest_path: str, out_dir: str) -> str:
+    # Site-relative URL of an output page: "blog/tom/index.html" -> "blog/tom/", "index.html" -> ""
+    rel = os.path.relpath(dest_path, out_dir).replace(os.sep, "/")
+    if rel == "index.html":
+        return ""
+    if rel.endswith("/index.html"):
+        return rel[: -len("index.html")]
+    return rel
+
+
+class SiteIndex:
+    """
+    Persistent per-page entries (url, title, date, text) behind sitemap.xml, the RSS
+    feed and the search index.
+
+    Entries are keyed by markdown source and filled while pages render, so an
+    incremental build only updates the pages it rebuilt. URLs are stored relative to
+    the site root; basepath and site URL are applied when the artifacts are written.
+    """
+
+    def __init__(self, path: Optional[str] = None, data: Optional[dict] = None):
+        self.path = path
+        self.pages: Dict[str, dict] = (data or {}).get("pages", {})
+
+    @classmethod
+    def load(cls, path: str) -> "SiteIndex":
+        return cls(path, load_state(path, SITE_INDEX_VERSION))
+
+    def save(self) -> None:
+        save_state(self.path, SITE_INDEX_VERSION, {"pages": self.pages})
+
+    def __contains__(self, src: str) -> bool:
+        return src in self.pages
+
+    def record(self, src: str, url: str, title: str, text: str, date: Optional[str] = None) -> None:
+        # date is the page's front matter date; pages without one (or with one that does
+        # not parse) use the source's mtime
+        stamp = _timestamp(date) if date else None
+        if stamp is None:
+            stamp = time.strftime(_STAMP, time.gmtime(os.stat(src).st_mtime))
+        self.pages[src] = {"url": url, "title": title, "date": stamp, "text": text}
+
+    def prune(self, seen: Iterable[str]) -> None:
+        keep = set(seen)
+        for src in [s for s in self.pages if s not in keep]:
+            del self.pages[src]
+
+    def _entries(self) -> List[dict]:
+        return sorted(self.pages.values(), key=lambda e: e["url"])
+
+    def sitemap(self, site_url: str, basepath: str = "/") -> str:
+        root = _absolute_root(site_url, basepath)
+        out = ['<?xml version="1.0" encoding="UTF-8"?>', '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+        for e in self._entries():
+            out.append(f"  <url><loc>{escape(root + e['url'])}</loc><lastmod>{e['date'][:10]}</lastmod></url>")
+        out.append("</urlset>")
+        return "\n".join(out) + "\n"
+
+    def feed(self, site_url: str, basepath: str = "/") -> str:
+        # RSS 2.0 feed of the FEED_ITEMS most recent pages; the home page's title names the channel
+        root = _absolute_root(site_url, basepath)
+        home = next((e for e in self.pages.values() if e["url"] == ""), None)
+        name = home["title"] if home else site_url
+        recent = sorted(self.pages.values(), key=lambda e: (e["date"], e["url"]), reverse=True)[:FEED_ITEMS]
+        out = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<rss version="2.0">',
+            "<channel>",
+            f"  <title>{escape(name)}</title>",
+            f"  <link>{escape(root)}</link>",
+            f"  <description>{escape(name)}</description>",
+        ]
+        for e in recent:
+            link = escape(root + e["url"])
+            pub = time.strftime("%a, %d %b %Y %H:%M:%S +0000", time.strptime(e["date"], _STAMP))
+            out += [
+                "  <item>",
+                f"    <title>{escape(e['title'])}</title>",
+                f"    <link>{link}</link>",
+                f"    <guid>{link}</guid>",
+                f"    <pubDate>{pub}</pubDate>",
+                f"    <description>{escape(e['text'][:SUMMARY_LIMIT])}</description>",
+                "  </item>",
+            ]
+        out += ["</channel>", "</rss>"]
+        return "\n".join(out) + "\n"
+
+    def search_index(self, basepath: str = "/") -> str:
+        # Compact JSON list for client-side search; URLs carry the basepath
+        prefix = basepath if basepath.endswith("/") else basepath + "/"
+        entries = [{"url": prefix + e["url"], "title": e["title"], "text": e["text"]} for e in self._entries()]
+        return json.dumps(entries, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+    def write(self, out_dir: str, site_url: str, basepath: str = "/") -> int:
+        """
+        Write sitemap.xml, feed.xml and search.json into out_dir.
+        Files whose content did not change are left untouched; returns how many were written.
+        """
+        artifacts = {
+            SITEMAP_NAME: self.sitemap(site_url, basepath),
+            FEED_NAME: self.feed(site_url, basepath),
+            SEARCH_INDEX_NAME: self.search_index(basepath),
+        }
+        return sum(write_if_changed(os.path.join(out_dir, name), text) for name, text in artifacts.items())
+
+
+def _timestamp(date: str) -> Optional[str]:
+    # "2024-01-28" or "2024-01-28 10:30" (taken as UTC) -> "2024-01-28T10:30:00Z"
+    date = date.strip().rstrip("Z")
+    for fmt in _DATE_FORMATS:
+        try:
+            return time.strftime(_STAMP, time.strptime(date, fmt))
+        except ValueError:
+            continue
+    return None
+
+
+def _absolute_root(site_url: str, basepath: str) -> str:
+    # "https://x.io" + "/repo" -> "https://x.io/repo/"
+    return site_url.rstrip("/") + "/" + basepath.strip("/") + ("/" if basepath.strip("/") else "")
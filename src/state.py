@@ -0,0 +1,32 @@
+# src/state.py
+# Versioned JSON files for the build state kept in .build/ between runs
+import json
+import os
+from typing import Optional
+
+
+def load_state(path: str, version: int) -> Optional[dict]:
+    """
+    Read a state file written by save_state with the same version.
+    A missing, unreadable or outdated file returns None: callers start empty, which
+    just means redoing the work that state would have saved.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != version:
+        return None
+    return data
+
+
+def save_state(path: Optional[str], version: int, data: dict) -> None:
+    # Write {"version": version, **data} atomically (temp file + rename); no-op without a path
+    if not path:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": version, **data}, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
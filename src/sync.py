@@ -0,0 +1,126 @@
+# src/sync.py
+import errno
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from state import load_state, save_state
+
+SYNC_STATE_VERSION = 1
+
+
+def _load_synced(state_path: Optional[str]) -> List[str]:
+    # Relative paths written by the previous sync (used to find stale files)
+    data = load_state(state_path, SYNC_STATE_VERSION) if state_path else None
+    return (data or {}).get("files", [])
+
+
+def _save_synced(state_path: Optional[str], files: List[str]) -> None:
+    save_state(state_path, SYNC_STATE_VERSION, {"files": sorted(files)})
+
+
+def is_current(s_path: str, d_path: str) -> bool:
+    # Same file (hardlink), or same size and mtime to the second, like rsync's quick check
+    try:
+        d_st = os.stat(d_path)
+    except FileNotFoundError:
+        return False
+    s_st = os.stat(s_path)
+    if (s_st.st_dev, s_st.st_ino) == (d_st.st_dev, d_st.st_ino):
+        return True
+    return s_st.st_size == d_st.st_size and int(s_st.st_mtime) == int(d_st.st_mtime)
+
+
+def remove_empty_parents(path: str, stop: str) -> None:
+    # Remove now-empty directories between path and stop (exclusive)
+    parent = os.path.dirname(path)
+    stop = os.path.abspath(stop)
+    while os.path.abspath(parent).startswith(stop + os.sep):
+        try:
+            os.rmdir(parent)
+        except OSError:
+            return
+        parent = os.path.dirname(parent)
+
+
+class Copier:
+    # Places one file, preferring a hardlink while src and dst share a filesystem
+    def __init__(self, link: bool):
+        self.link = link
+
+    def __call__(self, pair: Tuple[str, str]) -> str:
+        s_path, d_path = pair
+        # Never write through an existing file: it may be a hardlink to the source
+        if os.path.lexists(d_path):
+            os.remove(d_path)
+        if self.link:
+            try:
+                os.link(s_path, d_path)
+                return "linked"
+            except OSError as e:
+                if e.errno in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                    self.link = False  # different filesystem / no hardlinks: copy from now on
+                else:
+                    raise
+        shutil.copy2(s_path, d_path)
+        return "copied"
+
+
+def sync_static(
+    src: str,
+    dst: str,
+    state_path: Optional[str] = None,
+    jobs: Optional[int] = None,
+    link: bool = True,
+) -> Dict[str, int]:
+    """
+    Make dst contain the files of src, rsync style, without wiping dst first.
+
+    - Files whose size and mtime match (or that are already hardlinked) are left alone.
+    - Changed or new files are hardlinked when possible, otherwise copied with copy2,
+      on a thread pool of `jobs` workers.
+    - Files recorded in state_path by the previous sync that no longer exist in src are
+      removed. Other files in dst (generated pages) are never touched.
+    Returns counts of copied, linked, unchanged and removed files.
+    """
+    stats = {"copied": 0, "linked": 0, "unchanged": 0, "removed": 0}
+    os.makedirs(dst, exist_ok=True)
+
+    files: List[str] = []
+    todo: List[Tuple[str, str]] = []
+    for root, _dirs, names in os.walk(src):
+        rel_dir = os.path.relpath(root, src)
+        rel_dir = "" if rel_dir == "." else rel_dir
+        os.makedirs(os.path.join(dst, rel_dir), exist_ok=True)
+        for name in names:
+            rel = os.path.join(rel_dir, name)
+            s_path = os.path.join(src, rel)
+            if not os.path.isfile(s_path):
+                print(f"[skip] {s_path}")
+                continue
+            files.append(rel)
+            d_path = os.path.join(dst, rel)
+            if is_current(s_path, d_path):
+                stats["unchanged"] += 1
+            else:
+                todo.append((s_path, d_path))
+
+    copier = Copier(link)
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for (s_path, _d_path), how in zip(todo, pool.map(copier, todo)):
+            stats[how] += 1
+            print(f"[{'link' if how == 'linked' else 'file'}] {s_path}")
+
+    current = set(files)
+    for rel in _load_synced(state_path):
+        if rel in current:
+            continue
+        d_path = os.path.join(dst, rel)
+        if os.path.isfile(d_path):
+            os.remove(d_path)
+            remove_empty_parents(d_path, dst)
+            print(f"[rm  ] {d_path}")
+            stats["removed"] += 1
+
+    _save_synced(state_path, files)
+    return stats
@@ -0,0 +1,208 @@
+# src/template.py
+import hashlib
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Set, TextIO, Tuple, Union
+from urls import BasepathResolver, URLResolver, rewrite_urls
+
+# Placeholders look exactly like "{{ Title }}" (one space inside each brace pair)
+_SLOT_RE = re.compile(r"\{\{ (\w+) \}\}")
+
+
+class CompiledTemplate:
+    """
+    An HTML template split once into static segments and named slots.
+
+    The href/src URLs of the static segments are resolved once here (by default
+    against basepath), so rendering a page is a single join of len(slots) values
+    between them. `resolver` is the URL resolver pages rendered with this template use
+    for their own links, and `digest` covers the text, the resolver's key and the resolved
+    statics (so a resolver whose output changes under the same key, like asset
+    fingerprints, still changes the digest).
+    Slots without a value are left in the output as the literal placeholder, like the
+    old str.replace behaviour.
+    """
+
+    def __init__(self, text: str, basepath: str = "/", resolver: Optional[URLResolver] = None):
+        parts = _SLOT_RE.split(text)
+        self.basepath = basepath
+        self.resolver = resolver if resolver is not None else BasepathResolver(basepath)
+        self.statics: List[str] = [rewrite_urls(p, self.resolver) for p in parts[0::2]]
+        resolved = "\0".join(self.statics)
+        self.digest = hashlib.sha256(f"{self.resolver.key}\0{text}\0{resolved}".encode("utf-8")).hexdigest()
+        self.slots: List[str] = parts[1::2]
+
+    def render(self, **values: str) -> str:
+        out = [self.statics[0]]
+        for slot, static in zip(self.slots, self.statics[1:]):
+            value = values.get(slot)
+            out.append("{{ " + slot + " }}" if value is None else value)
+            out.append(static)
+        return "".join(out)
+
+    def write(self, stream: TextIO, **values: Union[str, Iterable[str]]) -> None:
+        """
+        Stream the rendered page to a text file object.
+        A value may be a string or an iterable of string chunks (e.g. HTMLNode.iter_html()),
+        so the full page never has to exist as one string.
+        """
+        stream.write(self.statics[0])
+        for slot, static in zip(self.slots, self.statics[1:]):
+            value = values.get(slot)
+            if value is None:
+                stream.write("{{ " + slot + " }}")
+            elif isinstance(value, str):
+                stream.write(value)
+            else:
+                for chunk in value:
+                    stream.write(chunk)
+            stream.write(static)
+
+
+# Layout directives: {% extends "base.html" %}, {% block name %}...{% endblock %}, {% include "nav.html" %}
+_DIRECTIVE_RE = re.compile(r'\{% *(extends|include|block|endblock)(?: +(?:"([^"]*)"|(\w+)))? *%\}')
+
+# Parsed layout: text, ("include", path) and ("block", name, children) nodes
+Node = Union[str, tuple]
+
+
+class TemplateLoader:
+    """
+    Loads layouts, resolving inheritance and partials, and compiles each one once.
+
+    A layout may start with {% extends "base.html" %}: it is then the parent layout with
+    the child's {% block name %}...{% endblock %} sections in place of the parent's blocks
+    of the same name (a parent's block content is the default). {% include "partial.html" %}
+    inserts another file. Names are relative to `root`. Everything is flattened into
+    plain text with {{ Slot }} placeholders before CompiledTemplate sees it, so rendering
+    a page costs the same as with a single template.
+
+    Files are read once per loader (one loader per build) and the loader records which
+    files every layout was built from: dependencies(path) lists them and dependents(path)
+    the layouts a file is part of. Since a layout's digest covers its flattened text,
+    editing a partial only changes the digests of the layouts that include it.
+    """
+
+    def __init__(self, root: str = ".", basepath: str = "/", resolver: Optional[URLResolver] = None):
+        self.root = root
+        self.basepath = basepath
+        self.resolver = resolver
+        self._parsed: Dict[str, List[Node]] = {}
+        self._extends: Dict[str, Optional[str]] = {}
+        self._compiled: Dict[str, CompiledTemplate] = {}
+        # Direct dependencies of every file loaded: its parent layout and the partials it includes
+        self.graph: Dict[str, Set[str]] = {}
+
+    def path(self, name: str) -> str:
+        return os.path.normpath(os.path.join(self.root, name))
+
+    def _parse(self, path: str) -> List[Node]:
+        nodes = self._parsed.get(path)
+        if nodes is not None:
+            return nodes
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        deps: Set[str] = set()
+        extends: Optional[str] = None
+        stack: List[Tuple[Optional[str], List[Node]]] = [(None, [])]
+        pos = 0
+        for m in _DIRECTIVE_RE.finditer(text):
+            stack[-1][1].append(text[pos : m.start()])
+            pos = m.end()
+            kind, arg = m.group(1), m.group(2) or m.group(3)
+            if kind == "endblock":
+                if len(stack) == 1:
+                    raise ValueError(f"{path}: endblock without block")
+                name, children = stack.pop()
+                stack[-1][1].append(("block", name, children))
+            elif not arg:
+                raise ValueError(f"{path}: {kind} needs a name")
+            elif kind == "block":
+                stack.append((arg, []))
+            elif kind == "include":
+                deps.add(self.path(arg))
+                stack[-1][1].append(("include", self.path(arg)))
+            elif extends is not None:
+                raise ValueError(f"{path}: more than one extends")
+            else:
+                extends = self.path(arg)
+                deps.add(extends)
+        if len(stack) > 1:
+            raise ValueError(f"{path}: block {stack[-1][0]!r} is not closed")
+        stack[0][1].append(text[pos:])
+        self._parsed[path] = stack[0][1]
+        self._extends[path] = extends
+        self.graph[path] = deps
+        return stack[0][1]
+
+    def _blocks(self, nodes: List[Node], into: Dict[str, List[Node]]) -> Dict[str, List[Node]]:
+        # Every block defined in nodes, nested ones included (the outermost definition wins)
+        for node in nodes:
+            if isinstance(node, tuple) and node[0] == "block":
+                into.setdefault(node[1], node[2])
+                self._blocks(node[2], into)
+        return into
+
+    def _render(self, nodes: List[Node], blocks: Dict[str, List[Node]], loading: Tuple[str, ...]) -> str:
+        out = []
+        for node in nodes:
+            if isinstance(node, str):
+                out.append(node)
+            elif node[0] == "include":
+                out.append(self.source(node[1], loading))
+            else:
+                out.append(self._render(blocks.get(node[1], node[2]), blocks, loading))
+        return "".join(out)
+
+    def source(self, path: str, loading: Tuple[str, ...] = ()) -> str:
+        """
+        The flattened text of a layout: parents applied and partials inserted.
+        Raises ValueError on a cycle of extends/includes.
+        """
+        path = os.path.normpath(path)
+        blocks: Dict[str, List[Node]] = {}
+        while True:
+            if path in loading:
+                raise ValueError("Template cycle: " + " -> ".join(loading + (path,)))
+            loading += (path,)
+            nodes = self._parse(path)
+            parent = self._extends[path]
+            if parent is None:
+                return self._render(nodes, blocks, loading)
+            # The child's blocks take precedence over the ones of layouts further up
+            blocks = {**self._blocks(nodes, {}), **blocks}
+            path = parent
+
+    def compile(self, path: str) -> CompiledTemplate:
+        # Compiled once per loader; later calls return the same object
+        path = os.path.normpath(path)
+        template = self._compiled.get(path)
+        if template is None:
+            template = self._compiled[path] = CompiledTemplate(self.source(path), self.basepath, self.resolver)
+        return template
+
+    def dependencies(self, path: str) -> List[str]:
+        # Every file the layout at path is built from, itself included
+        path = os.path.normpath(path)
+        seen = {path}
+        todo = [path]
+        while todo:
+            for dep in self.graph.get(todo.pop(), ()):
+                if dep not in seen:
+                    seen.add(dep)
+                    todo.append(dep)
+        return sorted(seen)
+
+    def dependents(self, path: str) -> List[str]:
+        # Compiled layouts that use the file at path (directly or through other files)
+        path = os.path.normpath(path)
+        return sorted(p for p in self._compiled if path in self.dependencies(p))
+
+
+def load_template(
+    path: str, basepath: str = "/", resolver: Optional[URLResolver] = None, root: Optional[str] = None
+) -> CompiledTemplate:
+    # Read and compile a template file (done once per build); extends/include names are
+    # relative to root, by default the template's own directory
+    loader = TemplateLoader(os.path.dirname(path) if root is None else root, basepath, resolver)
+    return loader.compile(path)
@@ -0,0 +1,205 @@
+# src/test_assets.py
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from assets import (
+    ASSET_MANIFEST_NAME,
+    AssetState,
+    FingerprintResolver,
+    clear_fingerprints,
+    fingerprint_name,
+    fingerprint_static,
+    original_name,
+)
+from fragcache import FragmentCache
+from generate import generate_pages_recursive
+import main
+from manifest import BuildManifest
+from sitefixture import SiteTestCase
+from urls import BasepathResolver, ChainResolver
+
+
+class TestNames(unittest.TestCase):
+    def test_fingerprint_and_original_names(self):
+        self.assertEqual(fingerprint_name("images/tom.png", "0123456789abcdef"), "images/tom.0123456789.png")
+        self.assertEqual(fingerprint_name("LICENSE", "0123456789abcdef"), "LICENSE.0123456789")
+        self.assertEqual(original_name("images/tom.0123456789.png"), "images/tom.png")
+        self.assertEqual(original_name("LICENSE.0123456789"), "LICENSE")
+        self.assertEqual(original_name("images/tom.png"), "images/tom.png")
+
+    def test_resolver_keeps_query_and_fragment(self):
+        resolve = FingerprintResolver({"images/tom.png": "images/tom.0123456789.png"})
+        self.assertEqual(resolve("/images/tom.png?v=1#x"), "/images/tom.0123456789.png?v=1#x")
+        self.assertEqual(resolve("/images/other.png"), "/images/other.png")
+        self.assertEqual(resolve("images/tom.png"), "images/tom.png")
+        self.assertEqual(resolve.context("[a](/x) and ![b](/images/tom.png)"), "fingerprint=/images/tom.0123456789.png")
+        self.assertEqual(resolve.context("no assets [a](/x)"), "fingerprint")
+
+
+class TestFingerprintStatic(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.src = os.path.join(root, "static")
+        self.dst = os.path.join(root, "docs")
+        self.state_path = os.path.join(root, ".build", "assets.json")
+        os.makedirs(os.path.join(self.src, "images"))
+        self._write(os.path.join(self.src, "index.css"), "body {}")
+        self._write(os.path.join(self.src, "images", "a.png"), "png")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, path, text):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def _run(self, link=True):
+        state = AssetState.load(self.state_path)
+        with redirect_stdout(StringIO()):
+            stats = fingerprint_static(self.src, self.dst, state, link=link)
+        return state, stats
+
+    def _mapping(self):
+        with open(os.path.join(self.dst, ASSET_MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_places_copies_and_manifest_and_caches_hashes(self):
+        state, stats = self._run()
+        self.assertEqual(stats, {"hashed": 2, "placed": 2, "unchanged": 0, "removed": 0})
+        mapping = self._mapping()
+        self.assertEqual(mapping, state.mapping())
+        with open(os.path.join(self.dst, *mapping["images/a.png"].split("/")), encoding="utf-8") as f:
+            self.assertEqual(f.read(), "png")
+        _state, stats = self._run()
+        self.assertEqual(stats, {"hashed": 0, "placed": 0, "unchanged": 2, "removed": 0})
+
+    def test_changed_asset_replaces_its_old_copy(self):
+        self._run()
+        old = self._mapping()["index.css"]
+        self._write(os.path.join(self.src, "index.css"), "body { color: red }")
+        _state, stats = self._run()
+        self.assertEqual(stats, {"hashed": 1, "placed": 1, "unchanged": 1, "removed": 1})
+        new = self._mapping()["index.css"]
+        self.assertNotEqual(new, old)
+        self.assertFalse(os.path.exists(os.path.join(self.dst, old)))
+        self.assertTrue(os.path.exists(os.path.join(self.dst, new)))
+
+    def test_existing_copy_is_replaced_not_written_through(self):
+        state, _stats = self._run(link=False)
+        placed = os.path.join(self.dst, *state.mapping()["index.css"].split("/"))
+        os.remove(placed)
+        os.link(os.path.join(self.src, "images", "a.png"), placed)  # stale hardlink in its place
+        self._run(link=False)
+        with open(os.path.join(self.src, "images", "a.png"), encoding="utf-8") as f:
+            self.assertEqual(f.read(), "png")
+        with open(placed, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "body {}")
+
+    def test_clear_removes_everything_placed(self):
+        state, _stats = self._run()
+        with redirect_stdout(StringIO()):
+            self.assertEqual(clear_fingerprints(self.dst, state), 3)
+        self.assertEqual(os.listdir(self.dst), [])
+
+
+class TestFingerprintedBuild(SiteTestCase):
+    TEMPLATE = '<link href="/index.css">{{ Content }}'
+    PAGES = {
+        # Long enough for the fragment cache to keep the block
+        "index.md": "# Home\n\nA picture: ![a picture of something](/a.png)",
+        "other.md": "# Other\n\nNo pictures here",
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.static = os.path.join(self.root, "static")
+        self.state_path = self._state_path("assets.json")
+        self._write(os.path.join(self.static, "index.css"), "body {}")
+        self._write(os.path.join(self.static, "a.png"), "png")
+        self.cache = FragmentCache(self._state_path("fragments.sqlite"))
+
+    def tearDown(self):
+        self.cache.close()
+        super().tearDown()
+
+    def _build(self):
+        state = AssetState.load(self.state_path)
+        with redirect_stdout(StringIO()):
+            fingerprint_static(self.static, self.out, state)
+            resolver = ChainResolver(FingerprintResolver(state.mapping()), BasepathResolver("/repo/"))
+            stats = generate_pages_recursive(
+                self.content,
+                self.template,
+                self.out,
+                "/repo/",
+                manifest=BuildManifest.load(self.manifest_path),
+                cache=self.cache,
+                resolver=resolver,
+                static_dir=self.static,
+            )
+        return state.mapping(), stats
+
+    def test_pages_and_template_link_to_fingerprints(self):
+        mapping, _stats = self._build()
+        html = self._read("index.html")
+        self.assertIn(f'<link href="/repo/{mapping["index.css"]}">', html)
+        self.assertIn(f'src="/repo/{mapping["a.png"]}"', html)
+
+    def test_changed_asset_rebuilds_only_pages_using_it(self):
+        self._build()
+        self._write(os.path.join(self.static, "a.png"), "png, version 2")
+        mapping, stats = self._build()
+        self.assertEqual((stats["rebuilt"], stats["skipped"]), (1, 1))
+        self.assertIn(f'src="/repo/{mapping["a.png"]}"', self._read("index.html"))
+        self._write(os.path.join(self.static, "index.css"), "body { margin: 0 }")
+        mapping, stats = self._build()
+        self.assertEqual(stats["rebuilt"], 2)
+        self.assertIn(mapping["index.css"], self._read("other.html"))
+
+    def test_cached_block_follows_asset_with_space_in_its_name(self):
+        self._write(os.path.join(self.static, "my pic.png"), "png")
+        # The image's alt text spans two lines, which the parser joins
+        self._write_page("spaced.md", "# Spaced\n\nA picture with a space in its name: ![my\npicture](/my pic.png)")
+        self._build()
+        self._write(os.path.join(self.static, "my pic.png"), "png, version 2")
+        mapping, _stats = self._build()
+        self.assertIn(f'src="/repo/{mapping["my pic.png"]}"', self._read("spaced.html"))
+        self.assertTrue(os.path.isfile(os.path.join(self.out, mapping["my pic.png"])))
+
+
+class TestWatchFingerprintRebuild(SiteTestCase):
+    # main's paths are relative to the working directory, so the test runs in the site's dir
+    TEMPLATE = '<link href="/index.css">{{ Content }}'
+    PAGES = {"index.md": "# Home\n\nNo assets here"}
+
+    def setUp(self):
+        super().setUp()
+        self._write(os.path.join(self.root, "static", "index.css"), "body {}")
+        self.cwd = os.getcwd()
+        os.chdir(self.root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        super().tearDown()
+
+    def test_template_asset_change_rebuilds_pages(self):
+        args = main.parse_args(["--fingerprint", "--incremental", "--jobs", "1"])
+        with redirect_stdout(StringIO()):
+            main.build(args)
+        css = os.path.join("static", "index.css")
+        with open(css, "a", encoding="utf-8") as f:
+            f.write(" p {}")
+        self.assertEqual(main.rebuild_parts(args, [css]), (True, True))
+        with redirect_stdout(StringIO()) as out:
+            main.build(args, *main.rebuild_parts(args, [css]))
+        self.assertIn("0 broken", out.getvalue())
+        html = self._read("index.html")
+        self.assertIn(AssetState.load(main.ASSET_STATE_PATH).mapping()["index.css"], html)
+
+
+if __name__ == "__main__":
+    unittest.main()
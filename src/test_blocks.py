@@ -1,6 +1,6 @@
 # src/test_block_types.py
 import unittest
-from blocks import block_to_block_type, BlockType
+from blocks import block_to_block_type, classify_block, iter_blocks, markdown_to_blocks, BlockType
 
 class TestBlockTypes(unittest.TestCase):
     # Headings
@@ -58,5 +58,32 @@ class TestBlockTypes(unittest.TestCase):
         self.assertEqual(block_to_block_type("Just some text"), BlockType.PARAGRAPH)
         self.assertEqual(block_to_block_type("line 1\nline 2"), BlockType.PARAGRAPH)
 
+    # Parsed pieces handed to the node builders
+    def test_classify_heading_returns_level_and_text(self):
+        self.assertEqual(classify_block("###   Three  "), (BlockType.HEADING, (3, "Three")))
+
+    def test_classify_quote_strips_marker_and_one_space(self):
+        self.assertEqual(classify_block(">one\n>  two"), (BlockType.QUOTE, ["one", " two"]))
+
+    def test_classify_lists_return_item_bodies(self):
+        self.assertEqual(classify_block("- a\n- b"), (BlockType.UNORDERED_LIST, ["a", "b"]))
+        self.assertEqual(classify_block("1. a\n2.  b"), (BlockType.ORDERED_LIST, ["a", "b"]))
+
+    def test_classify_fallback_returns_lines(self):
+        self.assertEqual(classify_block("1. a\n3. b"), (BlockType.PARAGRAPH, ["1. a", "3. b"]))
+        self.assertEqual(classify_block("- a\n-"), (BlockType.PARAGRAPH, ["- a", "-"]))
+
+    # Block splitting
+    def test_markdown_to_blocks_strips_and_splits_on_blank_lines(self):
+        md = "  # Title  \r\n\r\npara line 1\n  line 2\n \t \n\n\n- a\n- b\n"
+        self.assertEqual(markdown_to_blocks(md), ["# Title", "para line 1\nline 2", "- a\n- b"])
+        self.assertEqual(markdown_to_blocks("\n \n"), [])
+
+    def test_iter_blocks_yields_each_block_when_complete(self):
+        lines = iter(["one\n", "two\n", "\n", "three\n"])
+        blocks = iter_blocks(lines)
+        self.assertEqual(next(blocks), "one\ntwo")
+        self.assertEqual(list(lines), ["three\n"])
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,42 @@
+# src/test_corpus.py
+import os
+import random
+import tempfile
+import unittest
+from corpus import SHAPES, documents, generate_corpus, make_document
+from generate import extract_title
+from markdown import markdown_to_html_node
+
+
+class TestCorpus(unittest.TestCase):
+    def test_documents_are_deterministic(self):
+        self.assertEqual(documents("links", scale=0.1), documents("links", scale=0.1))
+
+    def test_every_shape_renders(self):
+        for shape in SHAPES:
+            for doc in documents(shape, scale=0.05, limit=3):
+                extract_title(doc)
+                markdown_to_html_node(doc).to_html()
+
+    def test_code_ratio_shapes_output(self):
+        doc = make_document(random.Random(1), blocks=50, code_ratio=1.0)
+        self.assertEqual(markdown_to_html_node(doc).to_html().count("<pre>"), 50)
+
+    def test_generate_corpus_tree(self):
+        with tempfile.TemporaryDirectory() as root:
+            paths = generate_corpus(root, "deep", scale=0.1)
+            md = [
+                os.path.join(r, f)
+                for r, _d, files in os.walk(paths["content"])
+                for f in files
+                if f.endswith(".md")
+            ]
+            self.assertEqual(len(md), 20)
+            depth = max(os.path.relpath(p, paths["content"]).count(os.sep) for p in md)
+            self.assertGreater(depth, 5)
+            self.assertTrue(os.path.isfile(paths["template"]))
+            self.assertTrue(os.listdir(os.path.join(paths["static"], "images")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+# src/test_fragcache.py
+import os
+import tempfile
+import unittest
+from fragcache import FragmentCache
+from markdown import iter_document_html, markdown_to_html_node
+
+
+class TestFragmentCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "fragments.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_entries_persist_after_flush(self):
+        cache = FragmentCache(self.path, version="v1")
+        self.assertIsNone(cache.get("block"))
+        cache.put("block", "<p>block</p>")
+        cache.close()
+        cache = FragmentCache(self.path, version="v1")
+        self.assertEqual(cache.get("block"), "<p>block</p>")
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+        cache.close()
+
+    def test_parser_version_change_clears_cache(self):
+        cache = FragmentCache(self.path, version="v1")
+        cache.put("block", "<p>block</p>")
+        cache.close()
+        cache = FragmentCache(self.path, version="v2")
+        self.assertIsNone(cache.get("block"))
+        cache.close()
+
+    def test_evict_drops_least_recently_used(self):
+        cache = FragmentCache(self.path, max_bytes=25, version="v1")
+        for name in ("a", "b", "c"):
+            cache.put(name, name * 10)
+            cache.flush()
+        cache.get("a")  # "a" is now the most recently used
+        cache.flush()
+        removed, remaining = cache.evict()
+        self.assertEqual((removed, remaining), (1, 20))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        cache.close()
+
+    def test_cached_document_html_matches_uncached(self):
+        md = (
+            "# A title that is long enough to go through the fragment cache lookup\n\n"
+            "A paragraph with a [link](/x) and **bold** text, repeated across pages.\n\n"
+            "- short"
+        )
+        expected = markdown_to_html_node(md).to_html()
+        cache = FragmentCache(self.path, version="v1")
+        self.assertEqual("".join(iter_document_html(md, cache)), expected)
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+        cache.flush()
+        self.assertEqual("".join(iter_document_html(md, cache)), expected)
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
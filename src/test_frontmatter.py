@@ -0,0 +1,69 @@
+# src/test_frontmatter.py
+import io
+import unittest
+from frontmatter import page_meta, parse_front_matter, read_front_matter, split_front_matter
+
+
+class TestParseFrontMatter(unittest.TestCase):
+    def test_scalars_lists_and_comments(self):
+        meta = parse_front_matter(
+            [
+                "Title: 'Why: a colon'\n",
+                "date: 2024-01-28\n",
+                "# a comment\n",
+                "tags: [tolkien, \"opinion\"]\n",
+                "draft: yes\n",
+                "authors:\n",
+                "  - Tom\n",
+                "  - Goldberry\n",
+            ]
+        )
+        self.assertEqual(
+            meta,
+            {
+                "title": "Why: a colon",
+                "date": "2024-01-28",
+                "tags": ["tolkien", "opinion"],
+                "draft": True,
+                "authors": ["Tom", "Goldberry"],
+            },
+        )
+
+    def test_bad_line_raises(self):
+        with self.assertRaises(ValueError):
+            parse_front_matter(["just words"])
+
+
+class TestReadFrontMatter(unittest.TestCase):
+    def test_leaves_file_at_body(self):
+        f = io.StringIO("---\ntitle: T\n---\n# Heading\n\nBody")
+        self.assertEqual(read_front_matter(f), {"title": "T"})
+        self.assertEqual(f.read(), "# Heading\n\nBody")
+
+    def test_no_front_matter_keeps_position(self):
+        f = io.StringIO("# Heading\n---\n")
+        self.assertEqual(read_front_matter(f), {})
+        self.assertEqual(f.tell(), 0)
+
+    def test_unclosed_raises(self):
+        with self.assertRaises(ValueError):
+            read_front_matter(io.StringIO("---\ntitle: T\n# Heading\n"))
+
+    def test_split_matches_read(self):
+        text = "---\ntags: a, b\n---\n# H\n"
+        meta, body = split_front_matter(text)
+        self.assertEqual(body, "# H\n")
+        self.assertEqual(meta, read_front_matter(io.StringIO(text)))
+        self.assertEqual(split_front_matter("# H\n---\n"), ({}, "# H\n---\n"))
+
+
+class TestPageMeta(unittest.TestCase):
+    def test_normalizes_fields(self):
+        self.assertEqual(
+            page_meta({"tags": "a, b", "draft": "maybe", "date": "2024-01-28"}),
+            {"title": None, "date": "2024-01-28", "tags": ["a", "b"], "draft": False, "template": None},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
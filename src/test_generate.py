@@ -15,6 +15,10 @@ class TestGenerate(unittest.TestCase):
         md = "## Subheading\nNo h1 here"
         with self.assertRaises(Exception):
             extract_title(md)
+    def test_extract_title_from_lines_stops_at_heading(self):
+        lines = iter(["intro\n", "# From File\n", "rest\n"])
+        self.assertEqual(extract_title(lines), "From File")
+        self.assertEqual(list(lines), ["rest\n"])
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,5 @@
+import io
+import sys
 import unittest
 
 from htmlnode import HTMLNode, LeafNode, ParentNode
@@ -62,5 +64,67 @@ class TestHTMLNode(unittest.TestCase):
         parent_node = ParentNode("p", [child1, child2, child3, child4])
         self.assertEqual(parent_node.to_html(), "<p><b>bold text</b>normal text<i>italic text</i>normal text</p>")
 
+    def test_iter_html_matches_to_html(self):
+        node = ParentNode(
+            "div",
+            [
+                ParentNode("p", [LeafNode("b", "bold"), LeafNode(None, " text")]),
+                LeafNode("a", "link", {"href": "/x"}),
+            ],
+        )
+        chunks = list(node.iter_html())
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), node.to_html())
+
+    def test_write_html_streams_to_file_object(self):
+        node = ParentNode("ul", [ParentNode("li", [LeafNode(None, "one")])])
+        buf = io.StringIO()
+        node.write_html(buf)
+        self.assertEqual(buf.getvalue(), "<ul><li>one</li></ul>")
+
+    def test_nodes_have_no_instance_dict(self):
+        leaf = LeafNode("b", "x")
+        parent = ParentNode("p", [leaf])
+        self.assertFalse(hasattr(leaf, "__dict__"))
+        self.assertFalse(hasattr(parent, "__dict__"))
+        self.assertEqual(
+            repr(leaf), "HTMLNode(tag=b, value=x, children=None, props=None)"
+        )
+
+    def test_to_html_handles_nesting_past_recursion_limit(self):
+        node = LeafNode("b", "deep")
+        for _ in range(sys.getrecursionlimit() * 2):
+            node = ParentNode("span", [node])
+        html = node.to_html()
+        self.assertTrue(html.startswith("<span><span>"))
+        self.assertTrue(html.endswith("</span></span>"))
+        self.assertIn("<b>deep</b>", html)
+
+    def test_to_html_props_and_siblings_after_nested_parent(self):
+        node = ParentNode(
+            "div",
+            [
+                ParentNode("p", [LeafNode("img", "", {"src": "/a.png", "alt": "a"})], {"class": "x"}),
+                LeafNode("a", "after", {"href": "/y"}),
+            ],
+        )
+        self.assertEqual(
+            node.to_html(),
+            '<div><p class="x"><img src="/a.png" alt="a"></img></p><a href="/y">after</a></div>',
+        )
+
+    def test_to_html_uses_subclass_to_html(self):
+        class Raw(HTMLNode):
+            def to_html(self):
+                return "<hr>"
+
+        self.assertEqual(ParentNode("div", [Raw(), LeafNode(None, "x")]).to_html(), "<div><hr>x</div>")
+
+    def test_to_html_validates_nested_nodes(self):
+        leaf = LeafNode("b", "x")
+        leaf.value = None
+        with self.assertRaises(ValueError):
+            ParentNode("div", [ParentNode("p", [leaf])]).to_html()
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,68 @@
+# src/test_instrument.py
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+import instrument
+from fragcache import FragmentCache
+from generate import generate_page
+from markdown import markdown_to_html_node
+
+
+class TestInstrument(unittest.TestCase):
+    def tearDown(self):
+        instrument.disable()
+
+    def test_disabled_spans_record_nothing(self):
+        self.assertIs(instrument.span("x"), instrument.span("y"))
+        with instrument.span("x"):
+            pass
+
+    def test_records_stages_per_page(self):
+        prof = instrument.enable()
+        with instrument.page("docs/a.html"):
+            markdown_to_html_node("# Title\n\nSome **bold** text\n\n- a\n- b")
+        totals = prof.stage_totals()
+        # One call per block pulled from the lazy splitter, plus the final empty one
+        self.assertEqual(totals["markdown_to_blocks"]["calls"], 4)
+        self.assertEqual(totals["classify_block"]["calls"], 3)
+        self.assertEqual(totals["text_to_textnodes"]["calls"], 4)
+        self.assertEqual([p[0] for p in prof.page_totals()], ["docs/a.html"])
+        self.assertTrue(all(e[2] == "docs/a.html" for e in prof.events))
+
+    def test_render_cache_and_write_are_separate_stages(self):
+        with tempfile.TemporaryDirectory() as root:
+            src = os.path.join(root, "a.md")
+            template = os.path.join(root, "template.html")
+            with open(src, "w", encoding="utf-8") as f:
+                f.write("# Title\n\n" + "A paragraph long enough to go through the fragment cache. " * 2)
+            with open(template, "w", encoding="utf-8") as f:
+                f.write("<title>{{ Title }}</title>{{ Content }}")
+            cache = FragmentCache(os.path.join(root, "fragments.sqlite"))
+            prof = instrument.enable()
+            with redirect_stdout(StringIO()):
+                generate_page(src, template, os.path.join(root, "a.html"), cache=cache)
+            cache.close()
+        totals = prof.stage_totals()
+        for stage in ("render_page", "to_html", "fragment_cache", "write"):
+            self.assertIn(stage, totals)
+        self.assertEqual(totals["fragment_cache"]["calls"], 2)  # one miss, then the store
+
+    def test_write_trace(self):
+        prof = instrument.enable()
+        with instrument.page("p"), instrument.span("stage"):
+            pass
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "trace.json")
+            prof.write_trace(path)
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        self.assertEqual({e["name"] for e in data["traceEvents"]}, {"p", "stage"})
+        self.assertEqual(data["stages"]["stage"]["calls"], 1)
+        self.assertEqual(data["pages"][0]["page"], "p")
+
+
+if __name__ == "__main__":
+    unittest.main()
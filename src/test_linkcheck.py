@@ -0,0 +1,68 @@
+# src/test_linkcheck.py
+import os
+import unittest
+from generate import generate_pages_recursive
+from linkcheck import LinkCollector, LinkIndex, resolves
+from manifest import BuildManifest
+from sitefixture import SiteTestCase
+
+
+class TestLinkCollector(unittest.TestCase):
+    def test_collects_hrefs_and_srcs(self):
+        links = LinkCollector()
+        chunks = ["<p>", '<a href="/a">a</a>', '<img src="/b.png" alt="b"></img>', '<a href="/a">again</a>', "</p>"]
+        self.assertEqual(list(links.wrap(chunks)), chunks)
+        self.assertEqual(links.urls, ["/a", "/b.png"])
+
+
+class TestResolve(unittest.TestCase):
+    def test_directory_and_html_forms(self):
+        known = {"index.html", "blog/tom/index.html", "contact.html", "images/x.png"}
+        for rel in ("", "blog/tom", "blog/tom/", "contact", "images/x.png"):
+            self.assertTrue(resolves(rel, known), rel)
+        self.assertFalse(resolves("blog", known))
+        self.assertFalse(resolves("images/y.png", known))
+
+    def test_check_honours_basepath_and_skips_external(self):
+        index = LinkIndex()
+        index.record("a.md", "index.html", ["/", "/repo/x.css", "/x.css#top", "https://e.org/", "#top", "rel.html"])
+        index.record("b.md", "b.html", ["/missing", "/repo/gone.png"])
+        checked, broken = index.check({"index.html", "b.html", "x.css"}, "/repo/")
+        self.assertEqual(checked, 5)
+        self.assertEqual(broken, [("b.md", "/missing"), ("b.md", "/repo/gone.png")])
+
+
+class TestLinkIndexBuild(SiteTestCase):
+    TEMPLATE = '<link href="/style.css">{{ Title }}{{ Content }}'
+    PAGES = {
+        "index.md": "# Home\n\n[post](/blog/post) and [gone](/gone)",
+        "blog/post.md": "# Post\n\n![pic](/images/pic.png) [home](/)",
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.links_path = self._state_path("links.json")
+
+    def _check(self, jobs=1):
+        manifest = BuildManifest.load(self.manifest_path)
+        links = LinkIndex.load(self.links_path)
+        generate_pages_recursive(
+            self.content, self.template, self.out, "/repo/", manifest=manifest, jobs=jobs, links=links
+        )
+        return links.check(links.outputs() | {"images/pic.png"}, "/repo/")
+
+    def test_reports_broken_links_including_template(self):
+        checked, broken = self._check()
+        self.assertEqual(checked, 5)
+        index_md = os.path.join(self.content, "index.md")
+        self.assertEqual(broken, [(index_md, "/repo/gone"), (self.template, "/repo/style.css")])
+
+    def test_incremental_and_parallel_builds_keep_links(self):
+        self.assertEqual(self._check(jobs=2), self._check(jobs=1))
+        self._write_page("index.md", "# Home\n\n[post](/blog/post)")
+        _checked, broken = self._check()
+        self.assertEqual(broken, [(self.template, "/repo/style.css")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+# src/test_listing.py
+import os
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from generate import generate_pages_recursive
+from linkcheck import LinkIndex
+from listing import ListingIndex, generate_listings, paginate
+from pageindex import PageIndex
+from sitefixture import SiteTestCase
+from template import load_template
+
+
+class TestPaginate(unittest.TestCase):
+    def test_numbered_pages_are_full_and_stable(self):
+        posts = [(f"p{i}", {}) for i in range(7, 0, -1)]  # newest first
+        self.assertEqual(
+            [(n, [src for src, _e in s]) for n, s in paginate(posts, 3)],
+            [(0, ["p7"]), (2, ["p6", "p5", "p4"]), (1, ["p3", "p2", "p1"])],
+        )
+        # One more post only touches the front page
+        grown = paginate([("p8", {})] + posts, 3)
+        self.assertEqual(grown[1:], paginate(posts, 3)[1:])
+        self.assertEqual(paginate([], 3), [(0, [])])
+
+
+class TestListingBuild(SiteTestCase):
+    PAGES = {"index.md": "# Home\n"}
+
+    def setUp(self):
+        super().setUp()
+        self.state_path = self._state_path("listings.json")
+        for day in range(1, 6):
+            self._post(day)
+
+    def _post(self, day, title=None):
+        self._write_page(f"blog/post{day}/index.md", f"---\ndate: 2024-01-0{day}\n---\n# {title or f'Post {day}'}\n")
+
+    def _build(self, page_size=2, **kwargs):
+        index = PageIndex()
+        links = LinkIndex()
+        template = load_template(self.template, "/repo/")
+        with redirect_stdout(StringIO()):
+            generate_pages_recursive(self.content, self.template, self.out, "/repo/", index=index, links=links)
+            stats = generate_listings(
+                ["blog"],
+                self.content,
+                self.out,
+                template,
+                index,
+                ListingIndex.load(self.state_path),
+                page_size=page_size,
+                links=links,
+                **kwargs,
+            )
+        return stats, links
+
+    def test_pages_and_navigation(self):
+        stats, links = self._build()
+        self.assertEqual(stats, {"pages": 3, "written": 3, "unchanged": 0, "removed": 0})
+        front = self._read("blog/index.html")
+        self.assertIn('<a href="/repo/blog/post5/">Post 5</a> (2024-01-05)', front)
+        self.assertIn('<a href="/repo/blog/page/2/">Older posts ></a>', front)
+        self.assertIn("<title>Blog, page 1</title>", self._read("blog/page/1/index.html"))
+        self.assertIn("Post 2", self._read("blog/page/1/index.html"))
+        self.assertEqual(links.check(links.outputs(), "/repo/"), (9, []))
+
+    def test_only_changed_slices_are_rewritten(self):
+        self._build()
+        self._post(6)
+        stats, _links = self._build()
+        self.assertEqual(stats, {"pages": 3, "written": 1, "unchanged": 2, "removed": 0})
+        self._post(1, title="Post one, renamed")
+        stats, _links = self._build()
+        self.assertEqual(stats["written"], 1)
+        self.assertIn("Post one, renamed", self._read("blog/page/1/index.html"))
+
+    def test_removes_pages_no_longer_needed(self):
+        self._build()
+        stats, _links = self._build(page_size=10)
+        self.assertEqual(stats["removed"], 2)
+        self.assertFalse(os.path.exists(os.path.join(self.out, "blog", "page", "1", "index.html")))
+
+    def test_tag_and_archive_pages(self):
+        self._write_page("blog/post2/index.md", "---\ndate: 2024-01-02\ntags: [Middle Earth, tolkien]\n---\n# Post 2\n")
+        self._write_page("blog/post4/index.md", "---\ndate: 2024-01-04\ntags: [middle-earth]\n---\n# Post 4\n")
+        self._write_page("notes/old.md", "---\ndate: 2023-05-01\ntags: [tolkien, c_sharp]\n---\n# Old\n")
+        stats, links = self._build(page_size=10, tags=True, archives=True)
+        # blog, tags/c-sharp, tags/middle-earth, tags/tolkien, archive/2024, archive/2023
+        self.assertEqual(stats["pages"], 6)
+        self.assertIn("<h1>Tagged c_sharp</h1>", self._read("tags/c-sharp/index.html"))
+        tagged = self._read("tags/middle-earth/index.html")
+        self.assertIn("<title>Tagged Middle Earth</title>", tagged)
+        self.assertLess(tagged.index("Post 4"), tagged.index("Post 2"))
+        self.assertIn("Old", self._read("tags/tolkien/index.html"))
+        self.assertIn("Post 5", self._read("archive/2024/index.html"))
+        archived = self._read("archive/2023/index.html")
+        self.assertIn('<li><a href="/repo/notes/old.html">Old</a> (2023-05-01)</li></ul>', archived)
+        self.assertEqual(links.check(links.outputs(), "/repo/")[1], [])
+        stats, _links = self._build(page_size=10)
+        self.assertEqual(stats["removed"], 5)
+        self.assertFalse(os.path.exists(os.path.join(self.out, "tags")))
+
+    def test_titles_are_not_parsed_as_markdown(self):
+        self._write_page("blog/post6/index.md", "---\ndate: 2024-01-06\ntitle: Using my_var\n---\n# Using vars\n")
+        self._write_page("blog/post7/index.md", "---\ndate: 2024-01-07\ntitle: A [draft] note\n---\n# Note\n")
+        self._write_page("blog/post8/index.md", "---\ndate: 2024-01-08\ntitle: **Bold** `code`\n---\n# Code\n")
+        _stats, links = self._build(page_size=10)
+        front = self._read("blog/index.html")
+        self.assertIn('<a href="/repo/blog/post6/">Using my_var</a> (2024-01-06)', front)
+        self.assertIn('<a href="/repo/blog/post7/">A [draft] note</a>', front)
+        self.assertIn('<a href="/repo/blog/post8/">**Bold** `code`</a>', front)
+        self.assertEqual(links.check(links.outputs(), "/repo/")[1], [])
+
+    def test_conflicting_index_page_raises(self):
+        self._write_page("blog/index.md", "# Blog by hand\n")
+        with self.assertRaises(ValueError):
+            self._build()
+
+
+if __name__ == "__main__":
+    unittest.main()
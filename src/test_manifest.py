@@ -0,0 +1,121 @@
+# src/test_manifest.py
+import os
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from manifest import BuildManifest
+from generate import generate_pages_recursive
+from sitefixture import SiteTestCase
+
+
+class TestIncrementalBuild(SiteTestCase):
+    PAGES = {"index.md": "# Home\n\nHello", "blog/post.md": "# Post\n\nBody"}
+
+    def _build(self, basepath="/"):
+        manifest = BuildManifest.load(self.manifest_path)
+        return generate_pages_recursive(self.content, self.template, self.out, basepath, manifest=manifest)
+
+    def test_second_build_skips_everything(self):
+        self.assertEqual(self._build(), {"rebuilt": 2, "skipped": 0, "removed": 0, "written": 2})
+        self.assertEqual(self._build(), {"rebuilt": 0, "skipped": 2, "removed": 0, "written": 0})
+
+    def test_only_changed_page_is_rebuilt(self):
+        self._build()
+        self._write(os.path.join(self.content, "index.md"), "# Home\n\nChanged")
+        self.assertEqual(self._build(), {"rebuilt": 1, "skipped": 1, "removed": 0, "written": 1})
+        self.assertIn("Changed", self._read("index.html"))
+
+    def test_touched_but_identical_source_is_skipped(self):
+        self._build()
+        path = os.path.join(self.content, "index.md")
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self.assertEqual(self._build(), {"rebuilt": 0, "skipped": 2, "removed": 0, "written": 0})
+
+    def test_template_or_basepath_change_rebuilds_all(self):
+        self._build()
+        self.assertEqual(self._build(basepath="/site/")["rebuilt"], 2)
+        self._write(self.template, "<h1>{{ Title }}</h1>{{ Content }}")
+        self.assertEqual(self._build(basepath="/site/")["rebuilt"], 2)
+
+    def test_partial_change_rebuilds_only_its_pages(self):
+        layouts = os.path.join(self.root, "layouts")
+        os.makedirs(layouts)
+        self._write(self.template, '<title>{{ Title }}</title>{% include "nav.html" %}{{ Content }}')
+        self._write(os.path.join(layouts, "nav.html"), "<nav>v1</nav>")
+        self._write(os.path.join(layouts, "blog.html"), "{% include \"footer.html\" %}{{ Content }}")
+        self._write(os.path.join(layouts, "footer.html"), "<footer>v1</footer>")
+
+        def build():
+            manifest = BuildManifest.load(self.manifest_path)
+            return generate_pages_recursive(
+                self.content, self.template, self.out, manifest=manifest, layouts_dir=layouts
+            )
+
+        self.assertEqual(build()["rebuilt"], 2)
+        self._write(os.path.join(layouts, "footer.html"), "<footer>v2</footer>")
+        self.assertEqual(build(), {"rebuilt": 1, "skipped": 1, "removed": 0, "written": 1})
+        self.assertIn("<footer>v2</footer>", self._read("blog/post.html"))
+        self._write(os.path.join(layouts, "nav.html"), "<nav>v2</nav>")
+        self.assertEqual(build(), {"rebuilt": 1, "skipped": 1, "removed": 0, "written": 1})
+
+    def test_front_matter_picks_layout(self):
+        self._write(os.path.join(self.root, "bare.html"), "{{ Content }}")
+        self._write(os.path.join(self.content, "index.md"), "---\ntemplate: bare.html\n---\n# Home\n")
+        self._build()
+        self.assertEqual(self._read("index.html"), "<div><h1>Home</h1></div>")
+
+    def test_referenced_static_file_is_an_input(self):
+        static = os.path.join(self.root, "static")
+        os.makedirs(os.path.join(static, "images"))
+        image = os.path.join(static, "images", "a.png")
+        self._write(image, "v1")
+        self._write(os.path.join(self.content, "blog", "post.md"), "# Post\n\n![a](/images/a.png) [home](/)")
+
+        def build():
+            manifest = BuildManifest.load(self.manifest_path)
+            with redirect_stdout(StringIO()) as out:
+                stats = generate_pages_recursive(
+                    self.content, self.template, self.out, manifest=manifest, static_dir=static
+                )
+            return stats, manifest, out.getvalue()
+
+        build()
+        _stats, manifest, _out = build()
+        post = os.path.join(self.content, "blog", "post.md")
+        self.assertEqual(manifest.dependents([image]), [post])
+        self._write(image, "version 2")
+        stats, _manifest, out = build()
+        self.assertEqual((stats["rebuilt"], stats["skipped"]), (1, 1))
+        self.assertIn(f"[why ] {os.path.join(self.out, 'blog', 'post.html')}: {image} changed", out)
+
+    def test_stale_reasons(self):
+        self._build()
+        manifest = BuildManifest.load(self.manifest_path)
+        manifest.begin("/")
+        src = os.path.join(self.content, "index.md")
+        dest = os.path.join(self.out, "index.html")
+        digest = manifest.pages[src]["template"]
+        self.assertIsNone(manifest.stale_reason(src, dest, digest))
+        self.assertEqual(manifest.stale_reason(src, dest, "other"), "layout changed")
+        self.assertEqual(manifest.stale_reason(src, dest + ".x", digest), "output path changed")
+        self.assertEqual(manifest.stale_reason(src + ".new", dest, digest), "new page")
+        os.remove(dest)
+        self.assertEqual(manifest.stale_reason(src, dest, digest), "output missing")
+        manifest.invalidate("full build")
+        self.assertEqual(manifest.stale_reason(src, dest, digest), "full build")
+
+    def test_removed_source_deletes_output(self):
+        self._build()
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        self.assertEqual(self._build(), {"rebuilt": 0, "skipped": 1, "removed": 1, "written": 0})
+        self.assertFalse(os.path.exists(os.path.join(self.out, "blog", "post.html")))
+
+    def test_missing_output_is_rebuilt(self):
+        self._build()
+        os.remove(os.path.join(self.out, "index.html"))
+        self.assertEqual(self._build()["rebuilt"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 # src/test_markdown_to_html_node.py
+import io
 import unittest
-from markdown import markdown_to_html_node
+from markdown import iter_document_html, markdown_to_html_node
 
 class TestMarkdownToHTMLNode(unittest.TestCase):
     def test_paragraphs(self):
@@ -36,5 +37,19 @@ class TestMarkdownToHTMLNode(unittest.TestCase):
             "</code></pre></div>",
         )
 
+    def test_file_of_lines_matches_string(self):
+        md = "# Title\r\n\r\n- a\n- b\n   \n> quote\n>more\n\n```\ncode\n```\n"
+        expected = markdown_to_html_node(md).to_html()
+        self.assertEqual(markdown_to_html_node(io.StringIO(md)).to_html(), expected)
+        self.assertEqual("".join(iter_document_html(io.StringIO(md))), expected)
+
+    def test_iter_document_html_is_lazy(self):
+        # Nothing past the first block is read until its chunks are requested
+        lines = iter(["para one\n", "\n", "para **two\n"])
+        chunks = iter_document_html(lines)
+        self.assertEqual(next(chunks), "<div>")
+        self.assertEqual(next(chunks), "<p>para one</p>")
+        self.assertEqual(next(lines), "para **two\n")
+
 if __name__ == "__main__":
     unittest.main()
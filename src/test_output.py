@@ -0,0 +1,43 @@
+# src/test_output.py
+import os
+import tempfile
+import unittest
+from output import OutputFile, write_if_changed
+
+
+class TestOutputFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "sub", "page.html")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_identical_content_is_not_rewritten(self):
+        self.assertTrue(write_if_changed(self.path, "<p>x</p>"))
+        os.utime(self.path, ns=(1, 10**9))
+        self.assertFalse(write_if_changed(self.path, "<p>x</p>"))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 10**9)
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["page.html"])
+
+    def test_changed_content_replaces_file(self):
+        write_if_changed(self.path, "<p>x</p>")
+        self.assertTrue(write_if_changed(self.path, "<p>y</p>"))
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "<p>y</p>")
+
+    def test_failure_keeps_previous_output(self):
+        write_if_changed(self.path, "old")
+        output = OutputFile(self.path)
+        with self.assertRaises(RuntimeError):
+            with output as f:
+                f.write("partial")
+                raise RuntimeError("boom")
+        self.assertIsNone(output.changed)
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "old")
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+
+if __name__ == "__main__":
+    unittest.main()
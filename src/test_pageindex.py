@@ -0,0 +1,82 @@
+# src/test_pageindex.py
+import os
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from generate import generate_pages_recursive
+from manifest import BuildManifest
+from pageindex import PageIndex
+from sitefixture import SiteTestCase
+
+
+class TestPageIndexBuild(SiteTestCase):
+    PAGES = {
+        "index.md": "# Home\n\nWelcome",
+        "blog/tom.md": "---\ntitle: Tom, Revisited\ndate: 2024-01-28\ntags: [tolkien, opinion]\n---\n# Tom\n\nText",
+        "blog/old.md": "---\ndate: 2023-05-01\ntags: [tolkien]\n---\n# Old\n",
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.index_path = self._state_path("pages.json")
+
+    def _build(self, **kwargs):
+        index = PageIndex.load(self.index_path)
+        with redirect_stdout(StringIO()) as out:
+            stats = generate_pages_recursive(
+                self.content,
+                self.template,
+                self.out,
+                manifest=BuildManifest.load(self.manifest_path),
+                index=index,
+                **kwargs,
+            )
+        return index, stats, out.getvalue()
+
+    def test_front_matter_title_and_body(self):
+        self._build()
+        html = self._read("blog/tom.html")
+        self.assertTrue(html.startswith("<title>Tom, Revisited</title>"))
+        self.assertNotIn("tolkien", html)
+        self.assertIn("<h1>Tom</h1>", html)
+
+    def test_only_changed_headers_are_read(self):
+        _index, _stats, out = self._build()
+        self.assertIn("3 header(s) read", out)
+        _index, _stats, out = self._build()
+        self.assertIn("0 header(s) read", out)
+        self._write_page("index.md", "# Home again\n")
+        index, _stats, out = self._build()
+        self.assertIn("1 header(s) read", out)
+        self.assertEqual(index.pages[os.path.join(self.content, "index.md")]["title"], "Home again")
+
+    def test_groupings(self):
+        index, _stats, _out = self._build()
+        tom = os.path.join(self.content, "blog", "tom.md")
+        old = os.path.join(self.content, "blog", "old.md")
+        self.assertEqual([src for src, _e in index.published()][:2], [tom, old])
+        self.assertEqual([src for src, _e in index.by_tag()["tolkien"]], [tom, old])
+        self.assertEqual(sorted(index.by_year()), ["2023", "2024"])
+
+    def test_drafts_are_skipped_and_removed(self):
+        self._build()
+        self._write_page("blog/old.md", "---\ndraft: true\n---\n# Old\n")
+        index, stats, out = self._build()
+        self.assertIn("1 draft(s) skipped", out)
+        self.assertEqual(stats["removed"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.out, "blog", "old.html")))
+        self.assertNotIn(os.path.join(self.content, "blog", "old.md"), [src for src, _e in index.published()])
+        self._build(drafts=True)
+        self.assertTrue(os.path.exists(os.path.join(self.out, "blog", "old.html")))
+
+    def test_pipelined_and_parallel_builds_use_front_matter(self):
+        self._build(pipeline=True)
+        pipelined = self._read("blog/tom.html")
+        os.remove(self.manifest_path)
+        self._build(jobs=2)
+        self.assertEqual(self._read("blog/tom.html"), pipelined)
+        self.assertTrue(pipelined.startswith("<title>Tom, Revisited</title>"))
+
+
+if __name__ == "__main__":
+    unittest.main()
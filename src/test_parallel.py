@@ -0,0 +1,118 @@
+# src/test_parallel.py
+import os
+import tempfile
+import unittest
+from unittest import mock
+import generate
+from fragcache import FragmentCache
+from generate import generate_pages_recursive
+
+
+class _LoggingCache(FragmentCache):
+    # Appends "open <pid>" / "close <pid>" to a log file as connections come and go
+    log = ""
+
+    def _note(self, event):
+        with open(self.log, "a", encoding="utf-8") as f:
+            f.write(f"{event} {os.getpid()}\n")
+
+    def _connect(self):
+        if self._db is None:
+            self._note("open")
+        return super()._connect()
+
+    def close(self):
+        if self._db is not None:
+            self._note("close")
+        super().close()
+
+
+class TestParallelBuild(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.content = os.path.join(root, "content")
+        self.template = os.path.join(root, "template.html")
+        with open(self.template, "w", encoding="utf-8") as f:
+            f.write('<title>{{ Title }}</title><link href="/x.css">{{ Content }}')
+        for i in range(6):
+            d = os.path.join(self.content, f"post{i}")
+            os.makedirs(d)
+            with open(os.path.join(d, "index.md"), "w", encoding="utf-8") as f:
+                f.write(f"# Post {i}\n\nSee [home](/) and **bold** {i}\n\n- a\n- b")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _read_tree(self, root):
+        out = {}
+        for dirpath, _dirs, files in os.walk(root):
+            for name in files:
+                path = os.path.join(dirpath, name)
+                with open(path, "rb") as f:
+                    out[os.path.relpath(path, root)] = f.read()
+        return out
+
+    def test_parallel_output_matches_serial(self):
+        serial = os.path.join(self.tmp.name, "serial")
+        parallel = os.path.join(self.tmp.name, "parallel")
+        generate_pages_recursive(self.content, self.template, serial, "/site/", jobs=1)
+        stats = generate_pages_recursive(self.content, self.template, parallel, "/site/", jobs=3)
+        self.assertEqual(stats["rebuilt"], 6)
+        self.assertEqual(self._read_tree(serial), self._read_tree(parallel))
+
+    def test_failing_page_is_reported_and_others_render(self):
+        with open(os.path.join(self.content, "post0", "index.md"), "w", encoding="utf-8") as f:
+            f.write("no title here")
+        out = os.path.join(self.tmp.name, "out")
+        with self.assertRaises(RuntimeError) as ctx:
+            generate_pages_recursive(self.content, self.template, out, jobs=2)
+        self.assertIn("post0", str(ctx.exception))
+        self.assertEqual(len(self._read_tree(out)), 5)
+
+    def test_workers_open_one_cache_connection_each(self):
+        cache = _LoggingCache(os.path.join(self.tmp.name, "fragments.sqlite"))
+        cache.log = os.path.join(self.tmp.name, "cache.log")
+        for i in range(6):
+            with open(os.path.join(self.content, f"post{i}", "index.md"), "a", encoding="utf-8") as f:
+                f.write("\n\nA paragraph long enough for its HTML to be kept in the fragment cache.")
+        out = os.path.join(self.tmp.name, "out")
+        self.assertEqual(generate_pages_recursive(self.content, self.template, out, jobs=2, cache=cache)["rebuilt"], 6)
+        with open(cache.log, encoding="utf-8") as f:
+            events = [line.split() for line in f]
+        opened = sorted(pid for event, pid in events if event == "open")
+        closed = sorted(pid for event, pid in events if event == "close")
+        # Six pages, two workers: each worker connects once and closes its connection on exit
+        self.assertLessEqual(len(opened), 2)
+        self.assertEqual(opened, closed)
+
+    def test_pipelined_output_matches_serial(self):
+        serial = os.path.join(self.tmp.name, "serial")
+        piped = os.path.join(self.tmp.name, "piped")
+        generate_pages_recursive(self.content, self.template, serial, "/site/")
+        stats = generate_pages_recursive(self.content, self.template, piped, "/site/", pipeline=True)
+        self.assertEqual((stats["rebuilt"], stats["written"]), (6, 6))
+        self.assertEqual(self._read_tree(serial), self._read_tree(piped))
+        stats = generate_pages_recursive(self.content, self.template, piped, "/site/", pipeline=True)
+        self.assertEqual(stats["written"], 0)
+
+    def test_large_sources_are_streamed(self):
+        serial = os.path.join(self.tmp.name, "serial")
+        piped = os.path.join(self.tmp.name, "piped")
+        generate_pages_recursive(self.content, self.template, serial, "/site/")
+        with mock.patch.object(generate, "PIPELINE_MAX_BYTES", 0):
+            generate_pages_recursive(self.content, self.template, piped, "/site/", pipeline=True)
+        self.assertEqual(self._read_tree(serial), self._read_tree(piped))
+
+    def test_failing_page_is_reported_in_pipeline(self):
+        with open(os.path.join(self.content, "post3", "index.md"), "w", encoding="utf-8") as f:
+            f.write("no title here")
+        out = os.path.join(self.tmp.name, "out")
+        with self.assertRaises(RuntimeError) as ctx:
+            generate_pages_recursive(self.content, self.template, out, pipeline=True)
+        self.assertIn("post3", str(ctx.exception))
+        self.assertEqual(len(self._read_tree(out)), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
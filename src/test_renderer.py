@@ -0,0 +1,45 @@
+# src/test_renderer.py
+import unittest
+from markdown import markdown_to_html_node
+from renderer import Renderer
+from template import CompiledTemplate
+
+
+class TestRenderer(unittest.TestCase):
+    def test_render_matches_markdown_to_html_node(self):
+        md = "# Title\n\nSome **bold** and [a link](https://x.y)\n\n- one\n- two"
+        self.assertEqual(Renderer().render(md), markdown_to_html_node(md).to_html())
+
+    def test_render_with_template_and_basepath(self):
+        renderer = Renderer('<title>{{ Title }}</title><link href="/a.css">{{ Content }}', basepath="/site/")
+        html = renderer.render("# Hi\n\n[home](/index.html)")
+        self.assertEqual(
+            html,
+            '<title>Hi</title><link href="/site/a.css">'
+            '<div><h1>Hi</h1><p><a href="/site/index.html">home</a></p></div>',
+        )
+
+    def test_missing_h1_gives_empty_title(self):
+        self.assertEqual(Renderer("<title>{{ Title }}</title>").render("just text"), "<title></title>")
+
+    def test_front_matter_sets_title_and_is_not_rendered(self):
+        renderer = Renderer("<title>{{ Title }}</title>{{ Content }}")
+        html = renderer.render("---\ntitle: Meta\ntags: [x]\n---\n# Heading")
+        self.assertEqual(html, "<title>Meta</title><div><h1>Heading</h1></div>")
+
+    def test_template_basepath_mismatch_raises(self):
+        with self.assertRaises(ValueError):
+            Renderer(CompiledTemplate("{{ Content }}", "/a/"), basepath="/b/")
+
+    def test_render_many_keeps_order(self):
+        docs = [f"# Doc {i}\n\nBody _{i}_" for i in range(20)]
+        expected = [Renderer().render(d) for d in docs]
+        self.assertEqual(Renderer().render_many(iter(docs)), expected)
+        with Renderer(jobs=2) as renderer:
+            self.assertEqual(renderer.render_many(docs), expected)
+            # The pool is reused between calls
+            self.assertEqual(renderer.render_many(docs[:5]), expected[:5])
+
+
+if __name__ == "__main__":
+    unittest.main()
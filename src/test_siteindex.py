@@ -0,0 +1,88 @@
+# src/test_siteindex.py
+import json
+import os
+import unittest
+from generate import generate_pages_recursive
+from manifest import BuildManifest
+from siteindex import SiteIndex, TextCollector, page_url
+from sitefixture import SiteTestCase
+
+
+class TestTextCollector(unittest.TestCase):
+    def test_passes_chunks_through_and_keeps_text(self):
+        collector = TextCollector()
+        chunks = ["<div>", "<h1>Title</h1>", "<p>Some <b>bold</b> text</p>", "</div>"]
+        self.assertEqual(list(collector.wrap(chunks)), chunks)
+        self.assertEqual(collector.text(), "Title Some bold text")
+
+    def test_text_is_capped(self):
+        collector = TextCollector(limit=10)
+        list(collector.wrap(["<p>" + "word " * 100 + "</p>"] * 50))
+        self.assertEqual(len(collector.text()), 10)
+
+
+class TestPageUrl(unittest.TestCase):
+    def test_index_pages_map_to_directories(self):
+        self.assertEqual(page_url(os.path.join("docs", "index.html"), "docs"), "")
+        self.assertEqual(page_url(os.path.join("docs", "blog", "tom", "index.html"), "docs"), "blog/tom/")
+        self.assertEqual(page_url(os.path.join("docs", "notes", "about.html"), "docs"), "notes/about.html")
+
+
+class TestSiteArtifacts(SiteTestCase):
+    PAGES = {"index.md": "# Home & more\n\nHello", "blog/post.md": "# Post\n\nBody [link](/)"}
+
+    def setUp(self):
+        super().setUp()
+        self.site_path = self._state_path("site.json")
+
+    def _build(self):
+        manifest = BuildManifest.load(self.manifest_path)
+        site = SiteIndex.load(self.site_path)
+        stats = generate_pages_recursive(self.content, self.template, self.out, "/repo/", manifest=manifest, site=site)
+        written = site.write(self.out, "https://example.org", "/repo/")
+        return stats, written
+
+    def _search(self):
+        return json.loads(self._read("search.json"))
+
+    def test_artifacts_are_written(self):
+        _stats, written = self._build()
+        self.assertEqual(written, 3)
+        self.assertEqual(
+            self._search(),
+            [
+                {"url": "/repo/", "title": "Home & more", "text": "Home & more Hello"},
+                {"url": "/repo/blog/post.html", "title": "Post", "text": "Post Body link"},
+            ],
+        )
+        with open(os.path.join(self.out, "sitemap.xml"), encoding="utf-8") as f:
+            sitemap = f.read()
+        self.assertIn("<loc>https://example.org/repo/blog/post.html</loc>", sitemap)
+        with open(os.path.join(self.out, "feed.xml"), encoding="utf-8") as f:
+            feed = f.read()
+        self.assertIn("<title>Home &amp; more</title>", feed)
+
+    def test_incremental_build_updates_only_changed_entries(self):
+        self._build()
+        stats, written = self._build()
+        self.assertEqual((stats["rebuilt"], written), (0, 0))
+
+        self._write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nNew body")
+        stats, written = self._build()
+        self.assertEqual(stats["rebuilt"], 1)
+        self.assertEqual(self._search()[1]["text"], "Post New body")
+
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        self._build()
+        self.assertEqual([e["url"] for e in self._search()], ["/repo/"])
+
+    def test_pages_missing_from_index_are_rendered(self):
+        manifest = BuildManifest.load(self.manifest_path)
+        generate_pages_recursive(self.content, self.template, self.out, "/repo/", manifest=manifest)
+        stats, _written = self._build()
+        self.assertEqual(stats["rebuilt"], 2)
+        self.assertEqual(len(self._search()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+# src/test_state.py
+import os
+import tempfile
+import unittest
+from state import load_state, save_state
+
+
+class TestState(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, ".build", "state.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        save_state(self.path, 2, {"pages": {"a.md": 1}})
+        self.assertEqual(load_state(self.path, 2), {"version": 2, "pages": {"a.md": 1}})
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_missing_outdated_or_corrupt_state_loads_as_none(self):
+        self.assertIsNone(load_state(self.path, 1))
+        save_state(self.path, 1, {"pages": {}})
+        self.assertIsNone(load_state(self.path, 2))
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("{not json")
+        self.assertIsNone(load_state(self.path, 1))
+
+    def test_save_without_path_is_a_no_op(self):
+        save_state(None, 1, {"pages": {}})
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
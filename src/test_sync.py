@@ -0,0 +1,74 @@
+# src/test_sync.py
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from sync import sync_static
+
+
+class TestSyncStatic(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.src = os.path.join(root, "static")
+        self.dst = os.path.join(root, "docs")
+        self.state = os.path.join(root, ".build", "static.json")
+        os.makedirs(os.path.join(self.src, "images"))
+        self._write(os.path.join(self.src, "index.css"), "body {}")
+        self._write(os.path.join(self.src, "images", "a.png"), "png")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, path, text):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def _read(self, path):
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def _sync(self, link):
+        with redirect_stdout(StringIO()):
+            return sync_static(self.src, self.dst, self.state, link=link)
+
+    def test_copies_then_skips_unchanged(self):
+        stats = self._sync(link=False)
+        self.assertEqual(stats["copied"], 2)
+        self.assertEqual(self._read(os.path.join(self.dst, "images", "a.png")), "png")
+        stats = self._sync(link=False)
+        self.assertEqual(stats, {"copied": 0, "linked": 0, "unchanged": 2, "removed": 0})
+
+    def test_changed_file_is_recopied(self):
+        self._sync(link=False)
+        self._write(os.path.join(self.src, "index.css"), "body { color: red }")
+        stats = self._sync(link=False)
+        self.assertEqual(stats["copied"], 1)
+        self.assertEqual(self._read(os.path.join(self.dst, "index.css")), "body { color: red }")
+
+    def test_hardlinks_and_never_writes_through_them(self):
+        stats = self._sync(link=True)
+        self.assertEqual(stats["linked"], 2)
+        src_css = os.path.join(self.src, "index.css")
+        dst_css = os.path.join(self.dst, "index.css")
+        self.assertTrue(os.path.samefile(src_css, dst_css))
+        # Replace the source file (new inode); the link must be replaced, not written into
+        os.remove(src_css)
+        self._write(src_css, "new")
+        self._sync(link=False)
+        self.assertEqual(self._read(dst_css), "new")
+        self.assertFalse(os.path.samefile(src_css, dst_css))
+
+    def test_removes_stale_synced_files_only(self):
+        self._sync(link=False)
+        self._write(os.path.join(self.dst, "page.html"), "generated")
+        os.remove(os.path.join(self.src, "images", "a.png"))
+        stats = self._sync(link=False)
+        self.assertEqual(stats["removed"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.dst, "images", "a.png")))
+        self.assertTrue(os.path.exists(os.path.join(self.dst, "page.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+# src/test_template.py
+import io
+import os
+import tempfile
+import unittest
+from template import CompiledTemplate, TemplateLoader
+from urls import HostResolver
+
+
+class TestCompiledTemplate(unittest.TestCase):
+    def test_splits_statics_and_slots(self):
+        tpl = CompiledTemplate("<title>{{ Title }}</title><main>{{ Content }}</main>")
+        self.assertEqual(tpl.slots, ["Title", "Content"])
+        self.assertEqual(tpl.statics, ["<title>", "</title><main>", "</main>"])
+
+    def test_render_fills_slots(self):
+        tpl = CompiledTemplate("<title>{{ Title }}</title>{{ Content }}")
+        self.assertEqual(tpl.render(Title="Hi", Content="<p>x</p>"), "<title>Hi</title><p>x</p>")
+
+    def test_basepath_applied_to_static_parts_only(self):
+        tpl = CompiledTemplate('<link href="/index.css">{{ Content }}', basepath="/site/")
+        html = tpl.render(Content='<a href="/x">x</a>')
+        self.assertEqual(html, '<link href="/site/index.css"><a href="/x">x</a>')
+
+    def test_unknown_slot_is_left_as_placeholder(self):
+        tpl = CompiledTemplate("{{ Title }} {{ Date }}")
+        self.assertEqual(tpl.render(Title="T"), "T {{ Date }}")
+
+    def test_basepath_gets_trailing_slash(self):
+        tpl = CompiledTemplate('<a href="/a">a</a><img src="/b.png"><a href="https://x.y/">x</a>', basepath="/repo")
+        self.assertEqual(
+            tpl.render(),
+            '<a href="/repo/a">a</a><img src="/repo/b.png"><a href="https://x.y/">x</a>',
+        )
+
+    def test_resolver_rewrites_statics_and_changes_digest(self):
+        text = '<link href="/a.css">{{ Content }}'
+        tpl = CompiledTemplate(text, resolver=HostResolver("https://cdn.x/"))
+        self.assertEqual(tpl.render(Content=""), '<link href="https://cdn.x/a.css">')
+        self.assertNotEqual(tpl.digest, CompiledTemplate(text).digest)
+
+    def test_write_streams_string_and_chunk_values(self):
+        tpl = CompiledTemplate("<title>{{ Title }}</title>{{ Content }}{{ Nav }}")
+        buf = io.StringIO()
+        tpl.write(buf, Title="T", Content=iter(["<p>", "x", "</p>"]))
+        self.assertEqual(buf.getvalue(), "<title>T</title><p>x</p>{{ Nav }}")
+
+
+class TestTemplateLoader(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        os.makedirs(os.path.join(self.root, "partials"))
+        self._write(
+            "base.html",
+            '<title>{% block title %}{{ Title }}{% endblock %}</title>{% include "partials/nav.html" %}'
+            "{% block body %}<main>{{ Content }}</main>{% endblock %}",
+        )
+        self._write(os.path.join("partials", "nav.html"), '<nav><a href="/">Home</a></nav>')
+        self._write(
+            "post.html", '{% extends "base.html" %}\n{% block body %}<article>{{ Content }}</article>{% endblock %}'
+        )
+        self._write("draft.html", '{% extends "post.html" %}{% block title %}Draft: {{ Title }}{% endblock %}')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, name, text):
+        with open(os.path.join(self.root, name), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def test_blocks_override_parents_and_partials_are_included(self):
+        loader = TemplateLoader(self.root, basepath="/site/")
+        draft = loader.compile(loader.path("draft.html"))
+        self.assertEqual(
+            draft.render(Title="T", Content="c"),
+            '<title>Draft: T</title><nav><a href="/site/">Home</a></nav><article>c</article>',
+        )
+        self.assertEqual(
+            loader.compile(loader.path("base.html")).render(Title="T", Content="c"),
+            '<title>T</title><nav><a href="/site/">Home</a></nav><main>c</main>',
+        )
+
+    def test_compiled_once_and_dependencies_tracked(self):
+        loader = TemplateLoader(self.root)
+        post = loader.path("post.html")
+        self.assertIs(loader.compile(post), loader.compile(post))
+        nav = loader.path(os.path.join("partials", "nav.html"))
+        self.assertEqual(loader.dependencies(post), sorted([post, loader.path("base.html"), nav]))
+        loader.compile(loader.path("draft.html"))
+        self.assertEqual(loader.dependents(nav), sorted(loader.path(n) for n in ("draft.html", "post.html")))
+
+    def test_cycles_and_unclosed_blocks_raise(self):
+        self._write("a.html", '{% extends "b.html" %}')
+        self._write("b.html", '{% include "a.html" %}')
+        self._write("open.html", "{% block body %}x")
+        loader = TemplateLoader(self.root)
+        for name in ("a.html", "open.html"):
+            with self.assertRaises(ValueError):
+                loader.compile(loader.path(name))
+
+
+if __name__ == "__main__":
+    unittest.main()
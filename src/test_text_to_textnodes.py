@@ -42,6 +42,33 @@ class TestTextToTextNodes(unittest.TestCase):
         ]
         self.assertEqual(out, expected)
 
+    def test_markup_inside_links_and_code_is_literal(self):
+        out = text_to_textnodes("[**not bold**](u) `_x_` **a_b_c**")
+        expected = [
+            TextNode("**not bold**", TextType.LINK, "u"),
+            TextNode(" ", TextType.TEXT),
+            TextNode("_x_", TextType.CODE),
+            TextNode(" ", TextType.TEXT),
+            TextNode("a_b_c", TextType.BOLD),
+        ]
+        self.assertEqual(out, expected)
+
+    def test_adjacent_images_and_links(self):
+        out = text_to_textnodes("![a](1)![b](2)[c](3)")
+        expected = [
+            TextNode("a", TextType.IMAGE, "1"),
+            TextNode("b", TextType.IMAGE, "2"),
+            TextNode("c", TextType.LINK, "3"),
+        ]
+        self.assertEqual(out, expected)
+
+    def test_empty_text(self):
+        self.assertEqual(text_to_textnodes(""), [])
+
+    def test_unmatched_delimiter_raises(self):
+        with self.assertRaises(ValueError):
+            text_to_textnodes("a **b [l](u) c")
+
 
 if __name__ == "__main__":
     unittest.main()
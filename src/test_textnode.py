@@ -31,6 +31,10 @@ class TestTextNode(unittest.TestCase):
         node = TextNode("This is some text", TextType.TEXT)
         node2 = TextNode("This is some text", TextType.TEXT, None)
         self.assertEqual(node, node2)
+    def test_slots_no_instance_dict(self):
+        node = TextNode("x", TextType.LINK, "u")
+        self.assertFalse(hasattr(node, "__dict__"))
+        self.assertEqual(repr(node), "TextNode(x, link, u)")
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,56 @@
+# src/test_urls.py
+import unittest
+from markdown import iter_document_html, markdown_to_html_node
+from textnode import TextNode, TextType, text_node_to_html_node
+from urls import BasepathResolver, ChainResolver, HostResolver, URLResolver, rewrite_urls
+
+
+class TestResolvers(unittest.TestCase):
+    def test_basepath_only_touches_root_relative_urls(self):
+        resolve = BasepathResolver("/repo")
+        self.assertEqual(resolve("/a/b"), "/repo/a/b")
+        self.assertEqual(resolve("/"), "/repo/")
+        for url in ("https://x.y/", "//cdn.x/a.png", "rel.html", "#top"):
+            self.assertEqual(resolve(url), url)
+        self.assertEqual(BasepathResolver("/")("/a"), "/a")
+
+    def test_chain_applies_in_order_and_combines_keys(self):
+        resolve = ChainResolver(BasepathResolver("/repo/"), HostResolver("https://cdn.x"))
+        self.assertEqual(resolve("/img.png"), "https://cdn.x/repo/img.png")
+        self.assertEqual(resolve.key, "basepath=/repo/|host=https://cdn.x")
+        self.assertEqual(URLResolver()("/a"), "/a")
+
+    def test_rewrite_urls(self):
+        html = '<a href="/a">/b</a><img src="/c.png" alt="/d">'
+        self.assertEqual(
+            rewrite_urls(html, BasepathResolver("/r/")),
+            '<a href="/r/a">/b</a><img src="/r/c.png" alt="/d">',
+        )
+
+
+class TestNodeLevelResolution(unittest.TestCase):
+    def test_text_node_urls_are_resolved(self):
+        resolve = BasepathResolver("/r/")
+        link = text_node_to_html_node(TextNode("x", TextType.LINK, "/a"), resolve)
+        image = text_node_to_html_node(TextNode("y", TextType.IMAGE, "/b.png"), resolve)
+        self.assertEqual(link.props, {"href": "/r/a"})
+        self.assertEqual(image.props, {"src": "/r/b.png", "alt": "y"})
+
+    def test_code_blocks_are_not_rewritten(self):
+        md = '[home](/)\n\n```\n<a href="/x">literal</a>\n```'
+        html = markdown_to_html_node(md, BasepathResolver("/r/")).to_html()
+        self.assertIn('<a href="/r/">home</a>', html)
+        self.assertIn('<a href="/x">literal</a>', html)
+
+    def test_plain_callable_resolver_bypasses_cache(self):
+        class Cache:
+            def get(self, block, context=""):
+                raise AssertionError("cache used")
+
+        md = "[a link in a paragraph long enough to be cached](/target/page) " * 3
+        html = "".join(iter_document_html(md, Cache(), lambda url: url.upper()))
+        self.assertIn('href="/TARGET/PAGE"', html)
+
+
+if __name__ == "__main__":
+    unittest.main()
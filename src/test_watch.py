@@ -0,0 +1,37 @@
+# src/test_watch.py
+import os
+import tempfile
+import unittest
+from watch import changed_paths, snapshot
+
+
+class TestWatchSnapshots(unittest.TestCase):
+    def test_detects_added_modified_and_removed_files(self):
+        with tempfile.TemporaryDirectory() as root:
+            a = os.path.join(root, "a.md")
+            b = os.path.join(root, "sub", "b.md")
+            os.makedirs(os.path.dirname(b))
+            for path in (a, b):
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write("x")
+            single = os.path.join(root, "template.html")
+            with open(single, "w", encoding="utf-8") as f:
+                f.write("t")
+
+            before = snapshot([os.path.join(root, "sub"), a, single, os.path.join(root, "missing")])
+            self.assertEqual(set(before), {a, b, single})
+
+            with open(a, "w", encoding="utf-8") as f:
+                f.write("changed")
+            os.remove(b)
+            c = os.path.join(root, "sub", "c.md")
+            with open(c, "w", encoding="utf-8") as f:
+                f.write("new")
+
+            after = snapshot([os.path.join(root, "sub"), a, single])
+            self.assertEqual(changed_paths(before, after), sorted([a, b, c]))
+            self.assertEqual(changed_paths(after, after), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
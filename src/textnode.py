@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Callable, Optional
 from htmlnode import LeafNode
 
 
@@ -12,6 +13,9 @@ class TextType(Enum):
 
 
 class TextNode:
+    # Slots instead of a per-instance __dict__ (one node per inline span)
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url=None):
         self.text = text
         self.text_type = text_type
@@ -28,7 +32,7 @@ class TextNode:
         return f"TextNode({self.text}, {self.text_type.value}, {self.url})"
 
 
-def text_node_to_html_node(text_node: "TextNode") -> LeafNode:
+def text_node_to_html_node(text_node: "TextNode", resolve: Optional[Callable[[str], str]] = None) -> LeafNode:
     """
     Convert a TextNode to a LeafNode based on the TextType.
 
@@ -38,6 +42,9 @@ def text_node_to_html_node(text_node: "TextNode") -> LeafNode:
     - CODE   -> LeafNode("code", text)
     - LINK   -> LeafNode("a", text, {"href": url})            (url required)
     - IMAGE  -> LeafNode("img", "", {"src": url, "alt": text}) (url required)
+
+    resolve, if given (e.g. a urls.URLResolver), maps the link/image URL to the one
+    written into href/src.
     """
     ttype = text_node.text_type
     text = text_node.text
@@ -54,10 +61,10 @@ def text_node_to_html_node(text_node: "TextNode") -> LeafNode:
     if ttype == TextType.LINK:
         if not url:
             raise ValueError("LINK TextNode requires a url for href")
-        return LeafNode("a", text, {"href": url})
+        return LeafNode("a", text, {"href": resolve(url) if resolve else url})
     if ttype == TextType.IMAGE:
         if not url:
             raise ValueError("IMAGE TextNode requires a url for src")
-        return LeafNode("img", "", {"src": url, "alt": text})
+        return LeafNode("img", "", {"src": resolve(url) if resolve else url, "alt": text})
 
     raise ValueError(f"Unsupported TextType: {ttype}")
@@ -0,0 +1,81 @@
+# src/urls.py
+import re
+from typing import Callable
+
+# href/src attribute values in an HTML fragment
+_URL_ATTR_RE = re.compile(r'((?:href|src)=")([^"]*)(")')
+
+
+def is_root_relative(url: str) -> bool:
+    # "/x" is; "//cdn.host/x", "https://..." and "x.html" are not
+    return url.startswith("/") and not url.startswith("//")
+
+
+class URLResolver:
+    """
+    Maps the URL of a link or image, as written in the markdown or template, to the URL
+    put in the output HTML. Resolvers are applied once, when nodes are created, so pages
+    need no text rewriting after rendering.
+
+    `key` identifies what a resolver does: rendered HTML cached under one key is never
+    reused under another. Subclasses must include every setting that affects the result.
+    The base class leaves URLs unchanged.
+    """
+
+    key = "identity"
+
+    def __call__(self, url: str) -> str:
+        return url
+
+    def context(self, block: str) -> str:
+        # Cache context of one markdown block: the key, unless the result also depends on
+        # something the key does not cover (see assets.FingerprintResolver)
+        return self.key
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.key})"
+
+
+class BasepathResolver(URLResolver):
+    # Prefix root-relative URLs with the site's basepath: "/x" -> "/repo/x"
+
+    def __init__(self, basepath: str = "/"):
+        self.prefix = basepath if basepath.endswith("/") else basepath + "/"
+        self.key = f"basepath={self.prefix}"
+
+    def __call__(self, url: str) -> str:
+        if self.prefix == "/" or not is_root_relative(url):
+            return url
+        return self.prefix + url[1:]
+
+
+class HostResolver(URLResolver):
+    # Serve root-relative URLs from another host, e.g. a CDN: "/x.png" -> "https://cdn.example.com/x.png"
+
+    def __init__(self, host: str):
+        self.host = host.rstrip("/")
+        self.key = f"host={self.host}"
+
+    def __call__(self, url: str) -> str:
+        return self.host + url if is_root_relative(url) else url
+
+
+class ChainResolver(URLResolver):
+    # Apply several resolvers in order (e.g. fingerprint, then basepath, then CDN host)
+
+    def __init__(self, *resolvers: URLResolver):
+        self.resolvers = resolvers
+        self.key = "|".join(r.key for r in resolvers)
+
+    def __call__(self, url: str) -> str:
+        for resolve in self.resolvers:
+            url = resolve(url)
+        return url
+
+    def context(self, block: str) -> str:
+        return "|".join(r.context(block) for r in self.resolvers)
+
+
+def rewrite_urls(html: str, resolve: Callable[[str], str]) -> str:
+    # Run every href/src value of an HTML fragment through resolve (used for template text)
+    return _URL_ATTR_RE.sub(lambda m: m.group(1) + resolve(m.group(2)) + m.group(3), html)
@@ -0,0 +1,63 @@
+# src/watch.py
+import functools
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Tuple
+
+Snapshot = Dict[str, Tuple[int, int]]
+
+
+def snapshot(paths: Iterable[str]) -> Snapshot:
+    """
+    Return {file path: (mtime_ns, size)} for every file under the given paths.
+    A path may be a directory (walked recursively) or a single file; missing paths are ignored.
+    """
+    snap: Snapshot = {}
+    for path in paths:
+        if os.path.isfile(path):
+            st = os.stat(path)
+            snap[path] = (st.st_mtime_ns, st.st_size)
+            continue
+        for root, _dirs, files in os.walk(path):
+            for name in files:
+                p = os.path.join(root, name)
+                try:
+                    st = os.stat(p)
+                except FileNotFoundError:
+                    continue  # removed while walking
+                snap[p] = (st.st_mtime_ns, st.st_size)
+    return snap
+
+
+def changed_paths(old: Snapshot, new: Snapshot) -> List[str]:
+    # Paths added, removed or modified between two snapshots
+    changed = [p for p, sig in new.items() if old.get(p) != sig]
+    changed.extend(p for p in old if p not in new)
+    return sorted(changed)
+
+
+def watch(paths: List[str], on_change: Callable[[List[str]], None], interval: float = 0.25) -> None:
+    """
+    Poll paths every `interval` seconds and call on_change(changed_paths) after each edit.
+    Polling is used because the standard library has no inotify binding; a stat walk of the
+    content tree is cheap next to a rebuild. Runs until interrupted.
+    """
+    last = snapshot(paths)
+    while True:
+        time.sleep(interval)
+        current = snapshot(paths)
+        changed = changed_paths(last, current)
+        if changed:
+            last = current
+            on_change(changed)
+
+
+def serve(directory: str, port: int) -> ThreadingHTTPServer:
+    # Serve directory over HTTP from a daemon thread so rebuilds can run in the foreground
+    handler = functools.partial(SimpleHTTPRequestHandler, directory=directory)
+    server = ThreadingHTTPServer(("", port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server